@@ -0,0 +1,130 @@
+'''
+Blit throughput of the surface formats the game draws every frame
+
+Compares the old and the new way of preparing each surface, on the same
+pixels, blitting onto a 1280x720 display surface (SDL dummy driver):
+- the battle background: convert_alpha() vs convert_img (opaque -> convert())
+- a colour-keyed UI button scaled to 100x100: convert_alpha() vs
+  convert_img (colour key + RLEACCEL)
+- a screen of map.tmx: the baked map on an SRCALPHA surface vs the opaque
+  surface Map now bakes
+- the full-screen dim layer: a new SRCALPHA surface filled every frame vs
+  ResourceManager.get_overlay
+Results are microseconds per blit and blits per second.
+
+Usage:
+- python -m benchmarks.blit
+- python -m benchmarks.blit --iterations 2000 --out blit.json
+'''
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Any, Callable
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame as pg
+
+SCREEN_SIZE = (1280, 720)
+DIM_RGBA = (0, 0, 0, 150)
+
+
+def time_blits(draw: Callable[[], None], iterations: int) -> dict[str, float]:
+    for _ in range(min(50, iterations)):
+        draw()  # Warm up (RLE encoding happens on the first blit)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        draw()
+    per_blit = (time.perf_counter() - start) / iterations
+    return {"us_per_blit": round(per_blit * 1e6, 2), "blits_per_s": round(1 / per_blit)}
+
+
+def compare(before: Callable[[], None], after: Callable[[], None], iterations: int) -> dict[str, Any]:
+    b = time_blits(before, iterations)
+    a = time_blits(after, iterations)
+    return {"before": b, "after": a, "speedup": round(b["us_per_blit"] / a["us_per_blit"], 2)}
+
+
+def bench(iterations: int) -> dict[str, Any]:
+    from src.core.services import resource_manager
+    from src.maps.map import Map
+    from src.utils import Position
+    from src.utils.loader import ASSETS_DIR, convert_img
+
+    screen = pg.display.set_mode(SCREEN_SIZE)
+
+    def image(path: str, size: tuple[int, int]) -> tuple[pg.Surface, pg.Surface]:
+        raw = pg.image.load(str(ASSETS_DIR / "images" / path))
+        return pg.transform.scale(raw.convert_alpha(), size), pg.transform.scale(convert_img(raw), size)
+
+    results: dict[str, Any] = {}
+
+    old, new = image("backgrounds/background1.png", SCREEN_SIZE)
+    results["background"] = compare(
+        lambda: screen.blit(old, (0, 0)), lambda: screen.blit(new, (0, 0)), iterations)
+
+    old, new = image("UI/button_play.png", (100, 100))
+    results["colorkey_button"] = compare(
+        lambda: screen.blit(old, (0, 0)), lambda: screen.blit(new, (0, 0)), iterations * 10)
+
+    game_map = Map("map.tmx", [], Position(0, 0))
+    baked = game_map._surface
+    alpha_map = pg.Surface(baked.get_size(), pg.SRCALPHA)
+    alpha_map.blit(baked, (0, 0))
+    view = pg.Rect((0, 0), SCREEN_SIZE)
+    results["map_view"] = compare(
+        lambda: screen.blit(alpha_map, (0, 0), view), lambda: screen.blit(baked, (0, 0), view), iterations)
+    results["map_view"]["opaque"] = not baked.get_flags() & pg.SRCALPHA
+
+    def dim_per_frame() -> None:
+        dim = pg.Surface(SCREEN_SIZE, pg.SRCALPHA)
+        dim.fill(DIM_RGBA)
+        screen.blit(dim, (0, 0))
+    results["dim_overlay"] = compare(
+        dim_per_frame, lambda: screen.blit(resource_manager.get_overlay(SCREEN_SIZE, DIM_RGBA), (0, 0)), iterations)
+    return results
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Blit throughput before and after surface format normalisation")
+    parser.add_argument("--iterations", type=int, default=500, help="blits per case (x10 for small sprites)")
+    parser.add_argument("--out", default="-", help="report path, '-' for stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    results = bench(args.iterations)
+    for name, row in results.items():
+        print(f"{name:<16} {row['before']['us_per_blit']:>9} us -> {row['after']['us_per_blit']:>9} us  "
+              f"x{row['speedup']}", file=sys.stderr)
+    report = {
+        "tool": "benchmarks.blit",
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "pygame": pg.version.ver,
+            "sdl": ".".join(map(str, pg.get_sdl_version())),
+            "video_driver": pg.display.get_driver(),
+        },
+        "iterations": args.iterations,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+        print(f"[Blit] Report written to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+'''
+Wire size versus CPU for players_update at several player counts
+
+Builds synthetic snapshots and compares plain float JSON, quantised JSON
+(server/protocol.py) and several compression options, including what the
+old default permessage-deflate (one deflate stream per connection with
+context takeover) would have cost. Encode times are per message; the
+per-connection deflate stream has to be paid once per client, the others
+once per tick.
+
+Usage:
+- python -m benchmarks.compression
+- python -m benchmarks.compression --players 10 100 1000 --out compression.json
+'''
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+import zlib
+from typing import Any, Callable
+
+from server.protocol import COMPRESS_THRESHOLD, to_wire
+
+MAPS = ["map.tmx", "gym.tmx", "secret_garden.tmx", "shop.tmx"]
+DIRECTIONS = ["UP", "DOWN", "LEFT", "RIGHT"]
+TILE_SIZE = 64
+MAP_TILES = 60
+MONSTER = {
+    "name": "Mega Pikachu", "hp": 420, "max_hp": 420, "level": 30,
+    "sprite_path": "menu_sprites/menusprite2.png", "element": "Normal",
+    "attack": 110, "defense": 35, "exp": 0, "next_evo_level": 0,
+    "next_evo_sprite": "menu_sprites/menusprite2.png",
+}
+
+
+def make_snapshot(rng: random.Random, n_players: int, version: int) -> dict:
+    players = {}
+    limit = float((MAP_TILES - 1) * TILE_SIZE)
+    for pid in range(n_players):
+        moving = rng.random() < 0.5
+        players[pid] = {
+            "id": pid,
+            "x": rng.uniform(0, limit),
+            "y": rng.uniform(0, limit),
+            "vx": rng.choice((-256.0, 0.0, 256.0)) if moving else 0.0,
+            "vy": 0.0,
+            "map": rng.choice(MAPS),
+            "direction": rng.choice(DIRECTIONS),
+            "pokemon": MONSTER if rng.random() < 0.3 else None,
+        }
+    return {"type": "players_update", "players": players, "version": version, "timestamp": time.time()}
+
+
+def deflate_stream() -> Callable[[bytes], bytes]:
+    """permessage-deflate as websockets negotiates it by default: raw deflate, context kept across messages"""
+    comp = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+
+    def compress(data: bytes) -> bytes:
+        out = comp.compress(data) + comp.flush(zlib.Z_SYNC_FLUSH)
+        return out[:-4]  # The trailing 00 00 ff ff is implied by the extension
+    return compress
+
+
+def variants() -> dict[str, Callable[[dict], bytes]]:
+    def plain(message: dict) -> bytes:
+        return json.dumps(message).encode()
+
+    def quantised(message: dict) -> bytes:
+        return json.dumps(to_wire(message)).encode()
+
+    def quantised_zlib(level: int) -> Callable[[dict], bytes]:
+        return lambda message: zlib.compress(quantised(message), level)
+
+    stream = deflate_stream()
+    return {
+        "float_json": plain,
+        "quantised_json": quantised,
+        "quantised_zlib1": quantised_zlib(1),
+        "quantised_zlib6": quantised_zlib(6),
+        "quantised_zlib9": quantised_zlib(9),
+        "float_permessage_deflate": lambda message: stream(plain(message)),
+    }
+
+
+def bench(n_players: int, ticks: int, seed: int) -> dict[str, Any]:
+    rng = random.Random(seed)
+    snapshots = [make_snapshot(rng, n_players, v) for v in range(ticks)]
+    result: dict[str, Any] = {}
+    for name, encode in variants().items():
+        start = time.perf_counter()
+        sizes = [len(encode(s)) for s in snapshots]
+        elapsed = time.perf_counter() - start
+        result[name] = {
+            "bytes": round(sum(sizes) / len(sizes)),
+            "encode_us": round(elapsed / ticks * 1e6, 1),
+        }
+    plain = result["float_json"]["bytes"]
+    for row in result.values():
+        row["ratio"] = round(row["bytes"] / plain, 3)
+    result["policy"] = "quantised_zlib1" if result["quantised_json"]["bytes"] >= COMPRESS_THRESHOLD else "quantised_json"
+    return result
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare players_update encodings")
+    parser.add_argument("--players", type=int, nargs="+", default=[1, 10, 50, 100, 500])
+    parser.add_argument("--ticks", type=int, default=200, help="snapshots encoded per variant")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default="-", help="report path, '-' for stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    report = {
+        "threshold_bytes": COMPRESS_THRESHOLD,
+        "results": {str(n): bench(n, args.ticks, args.seed) for n in args.players},
+    }
+    for n, rows in report["results"].items():
+        print(f"{n:>5} players  policy={rows['policy']}", file=sys.stderr)
+        for name, row in rows.items():
+            if name != "policy":
+                print(f"    {name:<26} {row['bytes']:>8} B  {row['encode_us']:>9} us  x{row['ratio']}", file=sys.stderr)
+    text = json.dumps(report, indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+        print(f"[Compression] Report written to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
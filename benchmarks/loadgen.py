@@ -0,0 +1,422 @@
+'''
+Synthetic load generator for server.py
+
+Spawns many bot clients that speak the real protocol (random-walk
+`player_update` across maps and periodic `chat_send`) and writes a
+machine-readable JSON report, so server changes can be compared run by run.
+
+Usage:
+- python server.py
+- python -m benchmarks.loadgen --clients 1000 --duration 30 --out report.json
+'''
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+
+from websockets.asyncio.client import connect
+
+from server.protocol import decode_frame, quantise
+
+MAPS = ["map.tmx", "gym.tmx", "secret_garden.tmx", "shop.tmx"]
+DIRECTIONS = {"UP": (0, -1), "DOWN": (0, 1), "LEFT": (-1, 0), "RIGHT": (1, 0)}
+TILE_SIZE = 64
+MAP_TILES = 60              # Random walks are clamped to MAP_TILES x MAP_TILES
+WALK_SPEED = 4.0 * TILE_SIZE
+DROP_TIMEOUT = 2.0          # An update/chat not echoed back within this window is dropped
+
+
+@dataclass
+class Stats:
+    """Counters shared by every bot of a run (the harness is single threaded)."""
+    connected: int = 0
+    connect_failures: int = 0
+    disconnects: int = 0
+    sent_msgs: int = 0
+    sent_bytes: int = 0
+    recv_msgs: int = 0
+    recv_bytes: int = 0
+    updates_sent: int = 0
+    updates_coalesced: int = 0
+    updates_dropped: int = 0
+    chats_sent: int = 0
+    chats_dropped: int = 0
+    update_latencies: list[float] = field(default_factory=list)
+    chat_latencies: list[float] = field(default_factory=list)
+    tick_timestamps: list[float] = field(default_factory=list)
+
+
+class Bot:
+    """One fake player. Only `measure` bots decode inbound frames."""
+
+    def __init__(self, index: int, args: argparse.Namespace, stats: Stats, *, measure: bool, observer: bool):
+        self.index = index
+        self.args = args
+        self.stats = stats
+        self.measure = measure
+        self.observer = observer
+        self.rng = random.Random(args.seed * 100003 + index)
+
+        self.player_id = -1
+        self.map = self.rng.choice(MAPS)
+        self.x = float(self.rng.randrange(MAP_TILES) * TILE_SIZE)
+        self.y = float(self.rng.randrange(MAP_TILES) * TILE_SIZE)
+        self.direction = self.rng.choice(list(DIRECTIONS))
+        # (x, y, map) -> send time, in send order
+        self._pending_updates: dict[tuple[float, float, str], float] = {}
+        # chat text -> send time
+        self._pending_chats: dict[str, float] = {}
+        self._chat_seq = 0
+
+    async def run(self, start_at: float, stop_at: float) -> None:
+        await asyncio.sleep(max(0.0, start_at - time.monotonic()))
+        try:
+            websocket = await connect(self.args.url, max_size=None, open_timeout=30, ping_interval=None)
+        except Exception:
+            self.stats.connect_failures += 1
+            return
+
+        self.stats.connected += 1
+        receiver = asyncio.create_task(self._receiver(websocket))
+        try:
+            await self._sender(websocket, stop_at)
+        except Exception:
+            self.stats.disconnects += 1
+        finally:
+            receiver.cancel()
+            try:
+                await receiver
+            except (asyncio.CancelledError, Exception):
+                pass
+            await websocket.close()
+            self._expire(time.monotonic(), final=True)
+
+    # ------------------------------
+    # Outbound
+    # ------------------------------
+    async def _send(self, websocket: Any, message: dict) -> None:
+        payload = json.dumps(message)
+        await websocket.send(payload)
+        self.stats.sent_msgs += 1
+        self.stats.sent_bytes += len(payload)
+
+    async def _sender(self, websocket: Any, stop_at: float) -> None:
+        interval = 1.0 / self.args.rate
+        next_chat = time.monotonic() + self.rng.expovariate(1.0 / self.args.chat_interval) if self.args.chat_interval > 0 else float("inf")
+
+        while self.player_id < 0:
+            if time.monotonic() >= stop_at:
+                return
+            await asyncio.sleep(0.01)
+
+        # Spread bots over the send interval so they don't fire in lockstep
+        await asyncio.sleep(self.rng.random() * interval)
+        while True:
+            now = time.monotonic()
+            if now >= stop_at:
+                return
+
+            self._walk(interval)
+            await self._send(websocket, {
+                "type": "player_update",
+                "x": self.x,
+                "y": self.y,
+                "map": self.map,
+                "direction": self.direction,
+                "pokemon": None,
+            })
+            self.stats.updates_sent += 1
+            if self.measure:
+                # Keyed the way the server echoes it back: fixed-point positions
+                self._pending_updates[(quantise(self.x), quantise(self.y), self.map)] = now
+
+            if now >= next_chat:
+                self._chat_seq += 1
+                text = f"bot{self.index}-{self._chat_seq}"
+                await self._send(websocket, {"type": "chat_send", "text": text})
+                self.stats.chats_sent += 1
+                if self.measure:
+                    self._pending_chats[text] = now
+                next_chat = now + self.rng.expovariate(1.0 / self.args.chat_interval)
+
+            if self.measure:
+                self._expire(now)
+            await asyncio.sleep(max(0.0, now + interval - time.monotonic()))
+
+    def _walk(self, dt: float) -> None:
+        if self.rng.random() < self.args.map_switch * dt:
+            self.map = self.rng.choice(MAPS)
+        if self.rng.random() < 0.1:
+            self.direction = self.rng.choice(list(DIRECTIONS))
+        dx, dy = DIRECTIONS[self.direction]
+        limit = float((MAP_TILES - 1) * TILE_SIZE)
+        self.x = min(limit, max(0.0, self.x + dx * WALK_SPEED * dt))
+        self.y = min(limit, max(0.0, self.y + dy * WALK_SPEED * dt))
+
+    def _expire(self, now: float, *, final: bool = False) -> None:
+        deadline = now - DROP_TIMEOUT
+        for key, sent in list(self._pending_updates.items()):
+            if sent > deadline:
+                break
+            del self._pending_updates[key]
+            self.stats.updates_dropped += 1
+        for text, sent in list(self._pending_chats.items()):
+            if sent <= deadline:
+                del self._pending_chats[text]
+                self.stats.chats_dropped += 1
+        if final:
+            # Whatever is still in flight when the run stops is neither seen nor dropped
+            self._pending_updates.clear()
+            self._pending_chats.clear()
+
+    # ------------------------------
+    # Inbound
+    # ------------------------------
+    async def _receiver(self, websocket: Any) -> None:
+        async for message in websocket:
+            self.stats.recv_msgs += 1
+            self.stats.recv_bytes += len(message)
+            if self.player_id >= 0 and not self.measure:
+                continue
+
+            data = decode_frame(message)
+            msg_type = data.get("type")
+            if msg_type == "registered":
+                self.player_id = int(data.get("id", -1))
+            elif msg_type == "players_update":
+                self._on_players(data)
+                self._on_chat(data.get("chat", []))
+            elif msg_type == "chat_update":
+                self._on_chat(data.get("messages", []))
+
+    def _on_players(self, data: dict) -> None:
+        now = time.monotonic()
+        if self.observer:
+            self.stats.tick_timestamps.append(float(data.get("timestamp", 0.0)))
+
+        me = data.get("players", {}).get(str(self.player_id))
+        if not me or not self._pending_updates:
+            return
+        if "scale" in data:
+            key = (int(me.get("x", 0)), int(me.get("y", 0)), str(me.get("map", "")))
+        else:
+            key = (quantise(float(me.get("x", 0))), quantise(float(me.get("y", 0))), str(me.get("map", "")))
+        sent = self._pending_updates.get(key)
+        if sent is None:
+            return
+        self.stats.update_latencies.append(now - sent)
+        # Anything sent before the echoed update was superseded within one tick
+        for k in list(self._pending_updates):
+            del self._pending_updates[k]
+            if k == key:
+                break
+            self.stats.updates_coalesced += 1
+
+    def _on_chat(self, messages: list[dict]) -> None:
+        now = time.monotonic()
+        for m in messages:
+            if m.get("from") != self.player_id:
+                continue
+            sent = self._pending_chats.pop(str(m.get("text", "")), None)
+            if sent is not None:
+                self.stats.chat_latencies.append(now - sent)
+
+
+# ------------------------------
+# Report
+# ------------------------------
+def summarize(samples: list[float], scale: float = 1000.0) -> dict[str, float | int]:
+    """Percentiles (nearest rank) of `samples`, scaled to milliseconds by default."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    n = len(ordered)
+
+    def pct(p: float) -> float:
+        return round(ordered[min(n - 1, max(0, math.ceil(p / 100.0 * n) - 1))] * scale, 3)
+
+    return {
+        "count": n,
+        "mean": round(sum(ordered) / n * scale, 3),
+        "p50": pct(50),
+        "p90": pct(90),
+        "p99": pct(99),
+        "max": round(ordered[-1] * scale, 3),
+    }
+
+
+def scrape_tick_histogram(url: str) -> dict[str, float] | None:
+    """Read `server_tick_seconds` from the server's /metrics page, if it has one."""
+    try:
+        with urllib.request.urlopen(url, timeout=5) as resp:
+            text = resp.read().decode()
+    except Exception:
+        return None
+    samples: dict[str, float] = {}
+    for line in text.splitlines():
+        if line.startswith("server_tick_seconds"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def tick_duration_report(before: dict[str, float] | None, after: dict[str, float] | None) -> dict[str, Any]:
+    """Server-side tick duration over the run, from the difference of two scrapes."""
+    if not after:
+        return {"available": False}
+    before = before or {}
+    delta = {k: v - before.get(k, 0.0) for k, v in after.items()}
+    count = delta.get("server_tick_seconds_count", 0.0)
+    total = delta.get("server_tick_seconds_sum", 0.0)
+    buckets = {
+        k[len('server_tick_seconds_bucket{le="'):-2]: int(v)
+        for k, v in delta.items() if k.startswith("server_tick_seconds_bucket")
+    }
+    return {
+        "available": True,
+        "count": int(count),
+        "mean_ms": round(total / count * 1000.0, 3) if count else 0.0,
+        "buckets_le_s": buckets,
+    }
+
+
+def build_report(args: argparse.Namespace, stats: Stats, elapsed: float, server_tick: dict[str, Any]) -> dict[str, Any]:
+    ticks = stats.tick_timestamps
+    intervals = [b - a for a, b in zip(ticks, ticks[1:]) if b > a]
+    tick = summarize(intervals)
+    if intervals:
+        median = sorted(intervals)[len(intervals) // 2]
+        tick["slipped"] = sum(1 for i in intervals if i > median * 1.5)
+
+    updates_measured = len(stats.update_latencies) + stats.updates_coalesced + stats.updates_dropped
+    return {
+        "tool": "benchmarks.loadgen",
+        "started_at": time.time() - elapsed,
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "url": args.url,
+            "clients": args.clients,
+            "duration_s": args.duration,
+            "ramp_s": args.ramp,
+            "update_rate_hz": args.rate,
+            "chat_interval_s": args.chat_interval,
+            "measure_fraction": args.measure,
+            "seed": args.seed,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "clients": {
+            "connected": stats.connected,
+            "connect_failures": stats.connect_failures,
+            "disconnects": stats.disconnects,
+        },
+        "update_latency_ms": summarize(stats.update_latencies),
+        "chat_latency_ms": summarize(stats.chat_latencies),
+        # Gaps between consecutive server `players_update` timestamps, i.e. the
+        # effective tick period including the time spent encoding and sending
+        "tick_interval_ms": tick,
+        # Time the server itself spent per tick, scraped from /metrics
+        "server_tick_duration": server_tick,
+        "throughput": {
+            "sent_msgs_per_s": round(stats.sent_msgs / elapsed, 1),
+            "sent_bytes_per_s": round(stats.sent_bytes / elapsed, 1),
+            "recv_msgs_per_s": round(stats.recv_msgs / elapsed, 1),
+            "recv_bytes_per_s": round(stats.recv_bytes / elapsed, 1),
+        },
+        "dropped": {
+            "updates": stats.updates_dropped,
+            "updates_coalesced": stats.updates_coalesced,
+            "update_drop_rate": round(stats.updates_dropped / updates_measured, 5) if updates_measured else 0.0,
+            "chats": stats.chats_dropped,
+            "chats_sent": stats.chats_sent,
+            "updates_sent": stats.updates_sent,
+        },
+    }
+
+
+def raise_fd_limit(wanted: int) -> None:
+    """Thousands of sockets need more than the usual 1024 descriptors."""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+    if soft < target:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    stats = Stats()
+    n_measure = max(1, int(args.clients * args.measure))
+    bots = [
+        Bot(i, args, stats, measure=i < n_measure, observer=i == 0)
+        for i in range(args.clients)
+    ]
+
+    metrics_url = args.metrics_url or default_metrics_url(args.url)
+    before = await asyncio.to_thread(scrape_tick_histogram, metrics_url)
+
+    start = time.monotonic()
+    stop_at = start + args.ramp + args.duration
+    await asyncio.gather(*(
+        bot.run(start + args.ramp * i / max(1, args.clients), stop_at)
+        for i, bot in enumerate(bots)
+    ))
+    elapsed = time.monotonic() - start
+
+    after = await asyncio.to_thread(scrape_tick_histogram, metrics_url)
+    return build_report(args, stats, elapsed, tick_duration_report(before, after))
+
+
+def default_metrics_url(ws_url: str) -> str:
+    parts = urlsplit(ws_url)
+    scheme = "https" if parts.scheme == "wss" else "http"
+    return f"{scheme}://{parts.netloc}/metrics"
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test server.py with bot clients")
+    parser.add_argument("--url", default="ws://localhost:8989")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of steady state after ramp-up")
+    parser.add_argument("--ramp", type=float, default=5.0, help="seconds to spread connections over")
+    parser.add_argument("--rate", type=float, default=10.0, help="player_update messages per second per bot")
+    parser.add_argument("--chat-interval", type=float, default=20.0, help="mean seconds between chats per bot (0 = off)")
+    parser.add_argument("--map-switch", type=float, default=0.02, help="per-second chance a bot changes map")
+    parser.add_argument("--measure", type=float, default=0.1, help="fraction of bots that decode frames for latency")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--metrics-url", default="", help="server /metrics page (default: derived from --url)")
+    parser.add_argument("--out", default="-", help="report path, '-' for stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    raise_fd_limit(args.clients + 256)
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+        print(f"[LoadGen] Report written to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+'''
+Offline replay of traffic recorded with `python server.py --record`
+
+Feeds a recorded session through the same World logic and frame encoding
+that server.py uses, without sockets: inbound frames are parsed and
+handled, replies and players_update broadcasts are encoded, and the bytes
+that would have been sent are counted (a broadcast is encoded once and
+counted once per connected client). Ticks run every 1/TICK_RATE seconds of
+recorded time.
+
+With --speed 0 (the default) events are replayed back to back, which
+measures the server-side CPU cost of a real trace; --speed 1 replays in
+real time. Every connection registers as a new player, since resume tokens
+in the recording belong to the server that recorded it.
+
+Usage:
+- python server.py --record trace.jsonl.gz   (then play, or run benchmarks.loadgen)
+- python -m benchmarks.replay trace.jsonl.gz --out replay.json
+'''
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Any
+
+from benchmarks.loadgen import summarize
+from server.chatStore import ChatStore
+from server.playerHandler import PlayerHandler
+from server.protocol import encode_message
+from server.recorder import CONNECT, DISCONNECT, MESSAGE, read_recording
+from server.world import TICK_RATE, World
+
+
+class Replay:
+    """Drives a fresh World the way server.py does, counting instead of sending"""
+    # recorded connection id -> player id
+    _players: dict[int, int]
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        # In-memory chat and no cleaner thread: nothing touches the disk or times out
+        # Both run on recorded time, so extrapolated positions match the live server's
+        clock = lambda: self.now
+        self.world = World(PlayerHandler(clock=clock), ChatStore(), clock=clock)
+        self._players = {}
+        self.messages_in = 0
+        self.invalid_in = 0
+        self.messages_out = 0
+        self.bytes_out = 0
+        self.ticks = 0
+        self.handle_seconds: list[float] = []
+        self.tick_seconds: list[float] = []
+
+    def _send(self, message: dict, n: int = 1) -> None:
+        payload = encode_message(message)
+        self.messages_out += n
+        self.bytes_out += len(payload) * n
+
+    def connect(self, conn: int) -> None:
+        player_id, _, messages = self.world.connect(None)
+        self._players[conn] = player_id
+        for message in messages:
+            self._send(message)
+
+    def message(self, conn: int, frame: str) -> None:
+        player_id = self._players.get(conn)
+        if player_id is None:
+            return  # Connected before the recording started
+        start = time.perf_counter()
+        self.messages_in += 1
+        try:
+            reply = self.world.handle(player_id, json.loads(frame))
+        except json.JSONDecodeError:
+            self.invalid_in += 1
+            reply = {"type": "error", "message": "invalid_json"}
+        except Exception as e:
+            reply = {"type": "error", "message": str(e)}
+        if reply is not None:
+            self._send(reply)
+        self.handle_seconds.append(time.perf_counter() - start)
+
+    def disconnect(self, conn: int) -> None:
+        player_id = self._players.pop(conn, None)
+        if player_id is not None:
+            self.world.disconnect(player_id)
+
+    def tick(self) -> None:
+        start = time.perf_counter()
+        self._send(self.world.tick(), len(self._players))
+        self.tick_seconds.append(time.perf_counter() - start)
+        self.ticks += 1
+
+
+def replay(path: str, speed: float, tick_rate: float) -> tuple[Replay, float, float]:
+    """Returns the replay state, the recorded duration and the wall time it took"""
+    r = Replay()
+    tick_interval = 1.0 / tick_rate
+    next_tick = tick_interval
+    t = 0.0
+    wall_start = time.perf_counter()
+    for t, conn, kind, data in read_recording(path):
+        while next_tick <= t:
+            r.now = next_tick
+            r.tick()
+            next_tick += tick_interval
+        if speed > 0:
+            delay = wall_start + t / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        r.now = t
+        if kind == CONNECT:
+            r.connect(conn)
+        elif kind == MESSAGE:
+            r.message(conn, data)
+        elif kind == DISCONNECT:
+            r.disconnect(conn)
+    return r, t, time.perf_counter() - wall_start
+
+
+def build_report(args: argparse.Namespace, r: Replay, recorded: float, elapsed: float) -> dict[str, Any]:
+    return {
+        "tool": "benchmarks.replay",
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "recording": args.recording,
+            "speed": args.speed,
+            "tick_rate_hz": args.tick_rate,
+        },
+        "recorded_s": round(recorded, 3),
+        "elapsed_s": round(elapsed, 3),
+        "messages_in": r.messages_in,
+        "invalid_in": r.invalid_in,
+        "ticks": r.ticks,
+        "messages_out": r.messages_out,
+        "bytes_out": r.bytes_out,
+        "throughput": {
+            "in_msgs_per_s": round(r.messages_in / elapsed, 1) if elapsed else None,
+            "ticks_per_s": round(r.ticks / elapsed, 1) if elapsed else None,
+            "out_bytes_per_s": round(r.bytes_out / elapsed) if elapsed else None,
+        },
+        "handle_us": summarize(r.handle_seconds, scale=1e6),
+        "tick_ms": summarize(r.tick_seconds),
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay a server.py --record trace without sockets")
+    parser.add_argument("recording", help="file written by server.py --record")
+    parser.add_argument("--speed", type=float, default=0.0, help="1 = real time, 0 = as fast as possible")
+    parser.add_argument("--tick-rate", type=float, default=TICK_RATE, help="players_update broadcasts per recorded second")
+    parser.add_argument("--out", default="-", help="report path, '-' for stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    r, recorded, elapsed = replay(args.recording, args.speed, args.tick_rate)
+    text = json.dumps(build_report(args, r, recorded, elapsed), indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+        print(f"[Replay] Report written to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
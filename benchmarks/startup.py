@@ -0,0 +1,150 @@
+'''
+Headless cold-start benchmark of the game client
+
+Starts the game in fresh interpreters with SDL's dummy video and audio
+drivers and drives the same loop as Engine.run until the menu scene has
+drawn its first frame. Each run reports, in ms since the child's
+interpreter started executing: imports done, Engine() built, first frame
+and first interactive (menu) frame; plus wall time from spawning the
+process and the child's peak RSS up to then. The loop then keeps
+running until the game scene has been warmed up and reports the longest
+menu frame (update + render), which is the frame that built it. Medians
+are taken over --runs.
+
+The import phase is worth auditing with
+`python -X importtime -c "import src.core.engine"` when it grows.
+
+Usage:
+- python -m benchmarks.startup
+- python -m benchmarks.startup --runs 10 --out startup.json
+'''
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+
+# Runs in the child; prints one JSON line
+CHILD = r'''
+import json, sys, time, resource
+start = time.perf_counter()
+from src.core.engine import Engine
+from src.core.services import scene_manager
+from src.utils import GameSettings
+imported = time.perf_counter()
+engine = Engine()
+built = time.perf_counter()
+first_frame = None
+frames = 0
+while scene_manager.current_name != "menu" and frames < MAX_FRAMES:
+    dt = engine.clock.tick(GameSettings.FPS) / 1000.0
+    engine.handle_events()
+    engine.update(dt)
+    engine.render()
+    frames += 1
+    if first_frame is None:
+        first_frame = time.perf_counter()
+interactive = time.perf_counter()
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform != "darwin":
+    rss *= 1024  # KiB on Linux
+# The game scene is built on one of the next menu frames; that frame blocks
+longest_menu_frame = 0.0
+menu_frames = 0
+while not scene_manager.is_loaded("game") and menu_frames < MAX_FRAMES:
+    dt = engine.clock.tick(GameSettings.FPS) / 1000.0
+    frame_start = time.perf_counter()
+    engine.handle_events()
+    engine.update(dt)
+    engine.render()
+    longest_menu_frame = max(longest_menu_frame, time.perf_counter() - frame_start)
+    menu_frames += 1
+ms = lambda t: round((t - start) * 1000, 1)
+print(json.dumps({
+    "imports_ms": ms(imported), "engine_ms": ms(built),
+    "first_frame_ms": ms(first_frame), "interactive_ms": ms(interactive),
+    "frames": frames, "reached_menu": scene_manager.current_name == "menu",
+    "warm_up_frame_ms": round(longest_menu_frame * 1000, 1), "warmed_up": scene_manager.is_loaded("game"),
+    "peak_rss_mb": round(rss / 2**20, 1),
+}))
+'''
+MAX_FRAMES = 600
+
+
+def run_once(python: str) -> dict[str, Any]:
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    spawned = time.perf_counter()
+    proc = subprocess.run(
+        [python, "-c", CHILD.replace("MAX_FRAMES", str(MAX_FRAMES))],
+        env=env, capture_output=True, text=True, timeout=120,
+    )
+    wall = time.perf_counter() - spawned
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(f"Child failed ({proc.returncode}):\n{proc.stderr[-2000:]}")
+    result = json.loads(lines[-1])
+    # Includes interpreter start-up and exit
+    result["process_wall_ms"] = round(wall * 1000, 1)
+    return result
+
+
+def summarize_runs(runs: list[dict[str, Any]]) -> dict[str, Any]:
+    keys = (
+        "imports_ms", "engine_ms", "first_frame_ms", "interactive_ms", "warm_up_frame_ms",
+        "process_wall_ms", "peak_rss_mb",
+    )
+    return {
+        k: {
+            "median": round(statistics.median(r[k] for r in runs), 1),
+            "min": min(r[k] for r in runs),
+            "max": max(r[k] for r in runs),
+        }
+        for k in keys
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Headless time-to-first-frame and peak RSS of the game")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes to start")
+    parser.add_argument("--python", default=sys.executable, help="interpreter to start the game with")
+    parser.add_argument("--out", default="-", help="report path, '-' for stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    runs = []
+    for i in range(args.runs):
+        runs.append(run_once(args.python))
+        r = runs[-1]
+        print(f"[Startup] run {i + 1}: first frame {r['first_frame_ms']} ms, "
+              f"interactive {r['interactive_ms']} ms, warm-up frame {r['warm_up_frame_ms']} ms, "
+              f"peak RSS {r['peak_rss_mb']} MB", file=sys.stderr)
+    report = {
+        "tool": "benchmarks.startup",
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "runs": args.runs,
+        "summary": summarize_runs(runs),
+        "samples": runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+        print(f"[Startup] Report written to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,200 +1,257 @@
+import argparse
 import asyncio
 import json
+import signal
 import time
-import threading
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
 from typing import Set, Any
 from server.playerHandler import PlayerHandler
+from server.chatStore import ChatStore
+from server.chatLog import ChatLog
+from server.world import World, TICK_RATE
+from server.worldSnapshot import WorldSnapshotter
+from server.recorder import TrafficRecorder
+from server.protocol import CompressionPolicy, encode_message
+from server.metrics import (
+    METRICS, Gauge, TICK_SECONDS, ENCODE_SECONDS,
+    MESSAGES_IN, BYTES_IN, MESSAGES_OUT, BYTES_OUT, SEND_QUEUE_MAX, SEND_QUEUE_TOTAL, RESUMES
+)
 
 from websockets.asyncio.server import serve
 
 PORT = 8989
+# Large messages are zlib-compressed binary frames, small ones plain text (see server/protocol.py)
+COMPRESSION = CompressionPolicy()
 
 PLAYER_HANDLER = PlayerHandler()
 PLAYER_HANDLER.start()
 
 # ------------------------------
-# Simple in-memory chat storage
+# Chat storage (recent messages in memory, full history on disk)
 # ------------------------------
-class ChatStore:
-    def __init__(self) -> None:
-        self._lock = threading.Lock()
-        self._next_id = 1
-        self._messages: list[dict] = []
-
-    def add(self, sender_id: int, text: str) -> dict:
-        # Sanitize
-        t = (text or "").strip()
-        if len(t) > 200:
-            t = t[:200]
-        if not t:
-            raise ValueError("empty")
-        with self._lock:
-            msg = {
-                "id": self._next_id,
-                "from": sender_id,
-                "text": t,
-                "ts": time.time(),
-            }
-            self._messages.append(msg)
-            self._next_id += 1
-            # Keep only the last N to avoid unbounded growth
-            if len(self._messages) > 1000:
-                self._messages = self._messages[-800:]
-            return msg
-
-    def list_since(self, since_id: int) -> list[dict]:
-        with self._lock:
-            if since_id <= 0:
-                return list(self._messages[-100:])  # cap response size
-            # Find first index with id > since_id
-            # Messages are appended in increasing id order
-            out: list[dict] = []
-            for m in self._messages:
-                if int(m.get("id", 0)) > since_id:
-                    out.append(m)
-            # Cap size
-            if len(out) > 200:
-                out = out[-200:]
-            return out
-
-CHAT = ChatStore()
+CHAT_LOG = ChatLog()
+CHAT_LOG.start()
+CHAT = ChatStore(log=CHAT_LOG)
+
+# Protocol logic; this module only moves its messages over WebSockets
+WORLD = World(PLAYER_HANDLER, CHAT)
+
+# Players, resume tokens and counters survive a restart; connected clients
+# resume into the restored world as if the connection had just dropped
+SNAPSHOTS = WorldSnapshotter(WORLD)
+SNAPSHOTS.restore()
+SNAPSHOTS.start()
 
 # Track connected clients
 CONNECTED_CLIENTS: Set[Any] = set()
 CLIENTS_LOCK = asyncio.Lock()
+# player id -> the connection currently driving it (a resume takes it over)
+SESSIONS: dict[int, Any] = {}
+
+# Set by --record: logs inbound traffic for benchmarks/replay.py
+RECORDER: TrafficRecorder | None = None
+
+# Inbound message types are client controlled, so only known ones get their own label
+KNOWN_MESSAGE_TYPES = {"player_update", "chat_send", "ping"}
+# Map names are client controlled too; anything but the game's own maps counts as "other"
+KNOWN_MAPS = {p.name for p in (Path(__file__).parent / "assets" / "maps").glob("*.tmx")}
+
+
+def players_by_known_map() -> dict[tuple[str], int]:
+    counts: dict[tuple[str], int] = {}
+    for (map_name,), n in PLAYER_HANDLER.count_by_map().items():
+        label = (map_name if map_name in KNOWN_MAPS else "other",)
+        counts[label] = counts.get(label, 0) + n
+    return counts
+
+METRICS.register(Gauge(
+    "server_connected_clients", "Open WebSocket connections",
+    callback=lambda: len(CONNECTED_CLIENTS)))
+METRICS.register(Gauge(
+    "server_players", "Registered players per map", ("map",),
+    callback=players_by_known_map))
+
+
+def encode(message: dict) -> str | bytes:
+    """Wire frame for `message`, with the encode time recorded per message type"""
+    start = time.perf_counter()
+    payload = encode_message(message, COMPRESSION)
+    ENCODE_SECONDS.observe(time.perf_counter() - start, (message["type"],))
+    return payload
+
+
+def count_out(msg_type: str, payload: str | bytes, n: int = 1) -> None:
+    MESSAGES_OUT.inc(n, (msg_type,))
+    BYTES_OUT.inc(len(payload) * n, (msg_type,))
+
+
+async def send_json(websocket: Any, message: dict) -> None:
+    payload = encode(message)
+    await websocket.send(payload)
+    count_out(message["type"], payload)
 
 
 async def broadcast_player_update():
-    """Broadcast player list to all connected clients periodically"""
+    """Broadcast player list (and any chat queued since the last tick) to all connected clients periodically"""
     while True:
-        await asyncio.sleep(0.0167)  # 60 updates per second
-        players = PLAYER_HANDLER.list_players()
-        message = {
-            "type": "players_update",
-            "players": players,
-            "timestamp": time.time()
-        }
-        msg_json = json.dumps(message)
-        # Broadcast to all connected clients
-        disconnected = set()
-        async with CLIENTS_LOCK:
-            for client in CONNECTED_CLIENTS:
-                try:
-                    await client.send(msg_json)
-                except Exception:
-                    disconnected.add(client)
-            # Remove disconnected clients
-            CONNECTED_CLIENTS.difference_update(disconnected)
+        await asyncio.sleep(1.0 / TICK_RATE)
+        try:
+            tick_start = time.perf_counter()
+            message = WORLD.tick()
+            msg_json = encode(message)
+            # Broadcast to all connected clients
+            disconnected = set()
+            queue_max = queue_total = 0
+            async with CLIENTS_LOCK:
+                for client in CONNECTED_CLIENTS:
+                    try:
+                        await client.send(msg_json)
+                        queued = client.transport.get_write_buffer_size()
+                        queue_total += queued
+                        queue_max = max(queue_max, queued)
+                    except Exception:
+                        disconnected.add(client)
+                count_out("players_update", msg_json, len(CONNECTED_CLIENTS) - len(disconnected))
+                # Remove disconnected clients
+                CONNECTED_CLIENTS.difference_update(disconnected)
+            SEND_QUEUE_MAX.set(queue_max)
+            SEND_QUEUE_TOTAL.set(queue_total)
+            TICK_SECONDS.observe(time.perf_counter() - tick_start)
+        except Exception as e:
+            # One bad tick must not stop the broadcasts for everyone
+            print(f"[Server] Broadcast tick failed: {e!r}")
 
 
 async def handle_client(websocket: Any):
     """Handle a WebSocket client connection"""
     player_id = -1
+    conn_id = -1
     
     async with CLIENTS_LOCK:
         CONNECTED_CLIENTS.add(websocket)
     
     try:
-        # Register player on connection - server assigns ID
-        player_id = PLAYER_HANDLER.register()
-        await websocket.send(json.dumps({
-            "type": "registered",
-            "id": player_id
-        }))
-        
-        # Send initial player list
-        players = PLAYER_HANDLER.list_players()
-        await websocket.send(json.dumps({
-            "type": "players_update",
-            "players": players,
-            "timestamp": time.time()
-        }))
-        
-        # Send recent chat messages
-        recent_chat = CHAT.list_since(0)
-        await websocket.send(json.dumps({
-            "type": "chat_update",
-            "messages": recent_chat
-        }))
+        # A reconnecting client presents ?resume=<token>&chat=<id>; positions need no
+        # catch-up, since every players_update is a full snapshot
+        resume = read_resume_params(websocket)
+        if RECORDER is not None:
+            conn_id = RECORDER.connect(resume)
+        player_id, resumed, messages = WORLD.connect(resume)
+        if resume:
+            RESUMES.inc(1, ("ok" if resumed else "expired",))
+
+        stale = SESSIONS.get(player_id)
+        SESSIONS[player_id] = websocket
+        if stale is not None:
+            # The old connection is most likely half-open, so don't wait for a close handshake
+            stale.transport.abort()
+
+        for message in messages:
+            await send_json(websocket, message)
+        if resumed:
+            print(f"[Server] Player {player_id} resumed")
         
         # Handle incoming messages
         async for message in websocket:
+            if RECORDER is not None:
+                RECORDER.message(conn_id, message)
             try:
                 data = json.loads(message)
                 msg_type = data.get("type")
-                
-                if msg_type == "player_update":
-                    if msg_type == "player_update":
-                        # Update player position
-                        x = float(data.get("x", 0))
-                        y = float(data.get("y", 0))
-                        map_name = str(data.get("map", ""))
-                        
-                        # [New] 讀取方向和怪獸
-                        direction = str(data.get("direction", "DOWN"))
-                        pokemon = data.get("pokemon", None)
-                        
-                        # 呼叫 PLAYER_HANDLER 更新
-                        # 如果你的 PlayerHandler.update 不支援這些參數，可能需要去改 playerHandler.py
-                        # 假設它只支援基本參數，那這裡傳了也沒用，但為了未來擴充先保留接收
-                        # [Fix] 補上 direction 和 pokemon 參數
-                        PLAYER_HANDLER.update(player_id, x, y, map_name, direction, pokemon)
-                    
-                elif msg_type == "chat_send":
-                    # Send chat message - use server-assigned ID
-                    text = str(data.get("text", ""))
-                    if text:
-                        try:
-                            msg = CHAT.add(player_id, text)  # Use server-assigned ID
-                            # Broadcast to all clients
-                            chat_msg = {
-                                "type": "chat_update",
-                                "messages": [msg]
-                            }
-                            chat_json = json.dumps(chat_msg)
-                            async with CLIENTS_LOCK:
-                                disconnected = set()
-                                for client in CONNECTED_CLIENTS:
-                                    try:
-                                        await client.send(chat_json)
-                                    except Exception:
-                                        disconnected.add(client)
-                                CONNECTED_CLIENTS.difference_update(disconnected)
-                        except ValueError:
-                            await websocket.send(json.dumps({
-                                "type": "error",
-                                "message": "empty_message"
-                            }))
+                label = (msg_type if msg_type in KNOWN_MESSAGE_TYPES else "other",)
+                MESSAGES_IN.inc(1, label)
+                BYTES_IN.inc(len(message), label)
+
+                reply = WORLD.handle(player_id, data)
+                if reply is not None:
+                    await send_json(websocket, reply)
                             
             except json.JSONDecodeError:
-                await websocket.send(json.dumps({
+                MESSAGES_IN.inc(1, ("invalid",))
+                BYTES_IN.inc(len(message), ("invalid",))
+                await send_json(websocket, {
                     "type": "error",
                     "message": "invalid_json"
-                }))
+                })
             except Exception as e:
-                await websocket.send(json.dumps({
+                await send_json(websocket, {
                     "type": "error",
                     "message": str(e)
-                }))
+                })
                 
-    except Exception:
+    except Exception as e:
         print(f"[Server] Client handler error: {e}")
     finally:
-        # Unregister player on disconnect
-        if player_id >= 0:
-            PLAYER_HANDLER.unregister(player_id)
+        if RECORDER is not None and conn_id >= 0:
+            RECORDER.disconnect(conn_id)
+        # Unless a newer connection has already taken the player over
+        if player_id >= 0 and SESSIONS.get(player_id) is websocket:
+            del SESSIONS[player_id]
+            WORLD.disconnect(player_id)
         async with CLIENTS_LOCK:
             CONNECTED_CLIENTS.discard(websocket)
 
 
-async def main():
+def read_resume_params(websocket: Any) -> dict | None:
+    """Resume token and last chat id from the handshake query string"""
+    query = parse_qs(urlsplit(websocket.request.path).query)
+    token = query.get("resume", [""])[0]
+    if not token:
+        return None
+    try:
+        chat_id = int(query.get("chat", ["0"])[0])
+    except ValueError:
+        chat_id = 0
+    return {"token": token, "chat": chat_id}
+
+
+def process_request(connection: Any, request: Any) -> Any:
+    """Serve GET /metrics over plain HTTP on the game port (local callers only)"""
+    if request.path != "/metrics":
+        return None  # Continue with the WebSocket handshake
+    host = connection.remote_address[0] if connection.remote_address else ""
+    if host not in ("127.0.0.1", "::1", "localhost"):
+        return connection.respond(HTTPStatus.FORBIDDEN, "metrics are only served locally\n")
+    return connection.respond(HTTPStatus.OK, METRICS.render())
+
+
+async def main(record_path: str | None = None):
+    global RECORDER
+    if record_path:
+        RECORDER = TrafficRecorder(record_path)
+        print(f"[Server] Recording inbound traffic to {record_path}")
     print(f"[Server] Running WebSocket server on ws://0.0.0.0:{PORT}")
+    print(f"[Server] Metrics on http://localhost:{PORT}/metrics")
     # Start broadcast task
     asyncio.create_task(broadcast_player_update())
     # Start server
-    async with serve(handle_client, "0.0.0.0", PORT):
-        await asyncio.Future()  # run forever
+    # compression=None: permessage-deflate is replaced by COMPRESSION
+    stop = asyncio.get_running_loop().create_future()
+    try:
+        # A deploy stops us with SIGTERM; shut down cleanly so the final snapshot gets written
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set_result, None)
+    except NotImplementedError:
+        pass  # Windows: Ctrl+C only
+    async with serve(handle_client, "0.0.0.0", PORT, process_request=process_request, compression=None):
+        await stop  # run until SIGTERM
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Monster Go online server")
+    parser.add_argument("--record", metavar="PATH",
+                        help="log inbound traffic for benchmarks/replay.py (.gz to compress)")
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    args = parse_args()
+    try:
+        asyncio.run(main(args.record))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        SNAPSHOTS.stop()
+        if RECORDER is not None:
+            RECORDER.close()
@@ -0,0 +1,229 @@
+import json
+import os
+import threading
+from array import array
+from bisect import bisect_right
+from typing import BinaryIO
+
+CHAT_LOG_DIR = os.path.join("server_data", "chat")
+SEGMENT_MAX_MESSAGES = 10_000   # Messages per segment file before rotating
+MAX_SEGMENTS = 20               # Older segments are dropped by the compactor
+COMPACT_INTERVAL_TIME = 60.0
+
+OFFSET_SIZE = array("Q").itemsize
+
+
+class ChatLogIdError(Exception):
+    """An appended message does not carry the id that continues the log"""
+
+
+class _Segment:
+    """
+    One `<first_id>.log` file of JSON lines plus its `<first_id>.idx` file,
+    which holds the byte offset of every message as a packed uint64.
+    """
+    first_id: int
+    offsets: array
+    size: int
+
+    def __init__(self, directory: str, first_id: int) -> None:
+        self.first_id = first_id
+        self.log_path = os.path.join(directory, f"{first_id:012d}.log")
+        self.idx_path = os.path.join(directory, f"{first_id:012d}.idx")
+        self.offsets = array("Q")
+        self.size = 0
+
+    @property
+    def end_id(self) -> int:
+        return self.first_id + len(self.offsets)
+
+
+class ChatLog:
+    """
+    Append-only, segmented chat log with an in-memory id -> offset index.
+
+    Ids are consecutive, so a message is located by bisecting the segment
+    start ids and indexing that segment's offset array. Writes are flushed to
+    the OS after every message, which survives a server restart or crash
+    (not a power loss). Old segments are removed by a background compactor.
+    """
+    _lock: threading.Lock
+    _stop_event: threading.Event
+    _thread: threading.Thread | None
+    _segments: list[_Segment]
+    _first_ids: list[int]
+    _log_file: BinaryIO | None
+    _idx_file: BinaryIO | None
+
+    def __init__(
+        self, directory: str = CHAT_LOG_DIR, *,
+        segment_max_messages: int = SEGMENT_MAX_MESSAGES,
+        max_segments: int = MAX_SEGMENTS
+    ) -> None:
+        self.directory = directory
+        self.segment_max_messages = segment_max_messages
+        self.max_segments = max(1, max_segments)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._segments = []
+        self._first_ids = []
+        self._log_file = None
+        self._idx_file = None
+        self._load()
+
+    # Threading
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._compactor, name="ChatLogCompactor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        with self._lock:
+            self._close_active()
+
+    def _compactor(self) -> None:
+        while not self._stop_event.wait(COMPACT_INTERVAL_TIME):
+            self.compact()
+
+    # API
+    @property
+    def first_id(self) -> int:
+        """Oldest id still on disk"""
+        with self._lock:
+            return self._segments[0].first_id if self._segments else 1
+
+    @property
+    def next_id(self) -> int:
+        with self._lock:
+            return self._segments[-1].end_id if self._segments else 1
+
+    def append(self, msg: dict) -> None:
+        line = (json.dumps(msg, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            expected = self._segments[-1].end_id if self._segments else 1
+            if msg["id"] != expected:
+                raise ChatLogIdError(f"chat log expected id {expected}, got {msg['id']}")
+            seg = self._segments[-1] if self._segments else None
+            if seg is None or len(seg.offsets) >= self.segment_max_messages or self._log_file is None:
+                seg = self._rotate(expected)
+
+            offset = seg.size
+            self._log_file.write(line)
+            self._log_file.flush()
+            self._idx_file.write(array("Q", [offset]).tobytes())
+            self._idx_file.flush()
+            seg.offsets.append(offset)
+            seg.size += len(line)
+
+    def read(self, start_id: int, end_id: int) -> list[dict]:
+        """Messages with start_id <= id < end_id that are still on disk, oldest first"""
+        # Byte ranges are looked up under the lock, the files are read outside
+        # it so appends never wait for disk reads
+        ranges: list[tuple[str, int, int]] = []
+        with self._lock:
+            if not self._segments:
+                return []
+            start_id = max(start_id, self._segments[0].first_id)
+            end_id = min(end_id, self._segments[-1].end_id)
+            i = bisect_right(self._first_ids, start_id) - 1
+            while start_id < end_id and i < len(self._segments):
+                seg = self._segments[i]
+                lo = start_id - seg.first_id
+                hi = min(end_id, seg.end_id) - seg.first_id
+                begin = seg.offsets[lo]
+                stop = seg.offsets[hi] if hi < len(seg.offsets) else seg.size
+                ranges.append((seg.log_path, begin, stop))
+                start_id = seg.first_id + hi
+                i += 1
+        out: list[dict] = []
+        for path, begin, stop in ranges:
+            try:
+                with open(path, "rb") as f:
+                    f.seek(begin)
+                    data = f.read(stop - begin)
+            except FileNotFoundError:
+                continue  # Compacted away in the meantime
+            out.extend(json.loads(line) for line in data.splitlines())
+        return out
+
+    def tail(self, n: int) -> list[dict]:
+        end = self.next_id
+        return self.read(end - n, end)
+
+    def compact(self) -> None:
+        """Drop the oldest segments beyond `max_segments` (never the active one)"""
+        with self._lock:
+            while len(self._segments) > self.max_segments:
+                seg = self._segments.pop(0)
+                self._first_ids.pop(0)
+                for path in (seg.log_path, seg.idx_path):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+    # Internals
+    def _load(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        first_ids = sorted(
+            int(name[:-4]) for name in os.listdir(self.directory)
+            if name.endswith(".log") and name[:-4].isdigit()
+        )
+        for first_id in first_ids:
+            seg = _Segment(self.directory, first_id)
+            if os.path.exists(seg.idx_path):
+                with open(seg.idx_path, "rb") as f:
+                    raw = f.read()
+                seg.offsets.frombytes(raw[:len(raw) - len(raw) % OFFSET_SIZE])
+            seg.size = os.path.getsize(seg.log_path)
+            self._segments.append(seg)
+            self._first_ids.append(first_id)
+
+        if self._segments:
+            self._repair(self._segments[-1])
+
+    def _repair(self, seg: _Segment) -> None:
+        """
+        A crash can leave a half-written line or an index shorter/longer than
+        the log in the active segment. Keep only fully written, indexed lines.
+        """
+        valid_end = 0
+        if seg.offsets:
+            with open(seg.log_path, "rb") as f:
+                f.seek(seg.offsets[-1])
+                last = f.readline()
+            if last.endswith(b"\n"):
+                valid_end = seg.offsets[-1] + len(last)
+            else:
+                valid_end = seg.offsets.pop()
+        with open(seg.log_path, "r+b") as f:
+            f.truncate(valid_end)
+        with open(seg.idx_path, "wb") as f:
+            f.write(seg.offsets.tobytes())
+        seg.size = valid_end
+
+    def _rotate(self, first_id: int) -> _Segment:
+        self._close_active()
+        seg = self._segments[-1] if self._segments else None
+        if seg is None or len(seg.offsets) >= self.segment_max_messages:
+            # Start a new segment once the last one is full; after a restart
+            # the last segment is reopened for appending
+            seg = _Segment(self.directory, first_id)
+            self._segments.append(seg)
+            self._first_ids.append(first_id)
+        self._log_file = open(seg.log_path, "ab")
+        self._idx_file = open(seg.idx_path, "ab")
+        return seg
+
+    def _close_active(self) -> None:
+        for f in (self._log_file, self._idx_file):
+            if f is not None:
+                f.close()
+        self._log_file = None
+        self._idx_file = None
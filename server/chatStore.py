@@ -0,0 +1,82 @@
+import time
+from server.chatLog import ChatLog, ChatLogIdError
+from server.metrics import TimedLock
+
+CHAT_CAPACITY = 1000    # Messages kept in memory
+RECENT_LIMIT = 100      # Messages returned to a client that has seen nothing yet
+SINCE_LIMIT = 200       # Max messages returned by one list_since call
+MAX_TEXT_LEN = 200
+
+
+class ChatStore:
+    """
+    In-memory chat storage backed by a fixed-capacity ring buffer.
+
+    Ids are assigned consecutively from 1, so message `id` always lives in
+    slot `(id - 1) % capacity` and lookups are plain offset arithmetic:
+    `add` is O(1) (the oldest message is simply overwritten) and
+    `list_since` is O(k) in the number of messages returned. A reply holds at
+    most SINCE_LIMIT messages, which the ring always covers.
+
+    With a `ChatLog` attached every message is also appended to disk and the
+    newest `capacity` messages are restored on startup. If writing fails the
+    log is detached and chat carries on from memory.
+    """
+    _lock: TimedLock
+    _ring: list[dict | None]
+    _capacity: int
+    _next_id: int
+    _log: ChatLog | None
+
+    def __init__(self, capacity: int = CHAT_CAPACITY, log: ChatLog | None = None) -> None:
+        if capacity < SINCE_LIMIT:
+            raise ValueError(f"capacity must be at least {SINCE_LIMIT}")
+        self._lock = TimedLock("chat_store")
+        self._capacity = capacity
+        self._ring = [None] * capacity
+        self._next_id = 1
+        self._log = log
+        if log is not None:
+            self._next_id = log.next_id
+            for msg in log.tail(capacity):
+                self._ring[(msg["id"] - 1) % capacity] = msg
+
+    def add(self, sender_id: int, text: str) -> dict:
+        # Sanitize
+        t = (text or "").strip()
+        if len(t) > MAX_TEXT_LEN:
+            t = t[:MAX_TEXT_LEN]
+        if not t:
+            raise ValueError("empty")
+        with self._lock:
+            msg = {
+                "id": self._next_id,
+                "from": sender_id,
+                "text": t,
+                "ts": time.time(),
+            }
+            if self._log is not None:
+                try:
+                    self._log.append(msg)
+                except (OSError, ChatLogIdError) as e:
+                    # The log now lags behind our ids and would reject every
+                    # later message, so keep chatting from memory only
+                    print(f"[ChatStore] Failed to write chat log, disabling it: {e}")
+                    self._log = None
+            # Overwrites the oldest message once the buffer is full
+            self._ring[(self._next_id - 1) % self._capacity] = msg
+            self._next_id += 1
+            return msg
+
+    def list_since(self, since_id: int) -> list[dict]:
+        """Messages with id > since_id (the last RECENT_LIMIT if since_id <= 0), oldest first."""
+        with self._lock:
+            end = self._next_id
+            if since_id <= 0:
+                start = end - RECENT_LIMIT  # cap response size
+            else:
+                start = max(since_id + 1, end - SINCE_LIMIT)
+            # capacity >= SINCE_LIMIT, so everything asked for is still in the ring
+            start = max(start, 1)
+            ring, cap = self._ring, self._capacity
+            return [ring[(i - 1) % cap] for i in range(start, end)]
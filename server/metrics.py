@@ -0,0 +1,178 @@
+"""
+Prometheus-style runtime metrics for server.py.
+
+Collectors are plain counters and fixed-bucket histograms updated inline on
+the hot path, so they are cheap enough to stay on in production. Updates are
+not locked: the event loop does almost all of them, and losing the odd
+increment from a background thread is fine for monitoring.
+
+Scrape with: curl http://localhost:8989/metrics
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Iterable, TypeVar
+
+Labels = tuple[str, ...]
+
+# Seconds. Covers sub-millisecond lock waits up to badly slipped ticks.
+DEFAULT_BUCKETS = (0.00001, 0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.0167, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+def _escape_label(value: str) -> str:
+    """Label value escaped as the text exposition format requires"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: Labels, extra: str = "") -> str:
+    parts = [f'{n}="{_escape_label(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Metric:
+    kind: str = "untyped"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+
+    def samples(self) -> Iterable[str]:
+        return ()
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, labels: Labels = ()) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in list(self._values.items()):
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {value}"
+
+
+class Gauge(Metric):
+    """A gauge is either set directly or read from `callback` at scrape time."""
+    kind = "gauge"
+
+    def __init__(
+        self, name: str, help: str, labels: tuple[str, ...] = (),
+        callback: Callable[[], float | dict[Labels, float]] | None = None
+    ):
+        super().__init__(name, help, labels)
+        self._values: dict[Labels, float] = {}
+        self._callback = callback
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        self._values[labels] = value
+
+    def samples(self) -> Iterable[str]:
+        values = self._values
+        if self._callback is not None:
+            result = self._callback()
+            values = result if isinstance(result, dict) else {(): result}
+        for labels, value in list(values.items()):
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {value}"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum]
+        self._series: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def samples(self) -> Iterable[str]:
+        for labels, (counts, total) in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = f'le="{bound}"'
+                yield f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}"
+            cumulative += counts[-1]
+            le = 'le="+Inf"'
+            yield f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.label_names, labels)} {total[0]}"
+            yield f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}"
+
+
+M = TypeVar("M", bound=Metric)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: list[Metric] = []
+
+    def register(self, metric: M) -> M:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics) + "\n"
+
+
+class TimedLock:
+    """
+    threading.Lock that records how long callers waited for it.
+    The uncontended path is a single non-blocking acquire.
+    """
+    def __init__(self, name: str) -> None:
+        self._lock = threading.Lock()
+        self._labels = (name,)
+
+    def __enter__(self) -> "TimedLock":
+        if self._lock.acquire(blocking=False):
+            LOCK_WAIT.observe(0.0, self._labels)
+            return self
+        start = time.perf_counter()
+        self._lock.acquire()
+        LOCK_WAIT.observe(time.perf_counter() - start, self._labels)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._lock.release()
+
+
+METRICS = MetricsRegistry()
+
+TICK_SECONDS = METRICS.register(Histogram(
+    "server_tick_seconds", "Time spent building and sending one players_update broadcast"))
+ENCODE_SECONDS = METRICS.register(Histogram(
+    "server_encode_seconds", "Time spent serialising and compressing per outbound message type", ("type",)))
+MESSAGES_IN = METRICS.register(Counter(
+    "server_messages_in_total", "Inbound WebSocket messages", ("type",)))
+BYTES_IN = METRICS.register(Counter(
+    "server_bytes_in_total", "Inbound WebSocket payload bytes", ("type",)))
+MESSAGES_OUT = METRICS.register(Counter(
+    "server_messages_out_total", "Outbound WebSocket messages", ("type",)))
+BYTES_OUT = METRICS.register(Counter(
+    "server_bytes_out_total", "Outbound WebSocket payload bytes", ("type",)))
+SEND_QUEUE_MAX = METRICS.register(Gauge(
+    "server_send_queue_bytes_max", "Largest per-client write buffer seen during the last tick"))
+SEND_QUEUE_TOTAL = METRICS.register(Gauge(
+    "server_send_queue_bytes_total", "Sum of all client write buffers during the last tick"))
+RESUMES = METRICS.register(Counter(
+    "server_resumes_total", "Reconnects that presented a resume token", ("result",)))
+LOCK_WAIT = METRICS.register(Histogram(
+    "server_lock_wait_seconds", "Time spent waiting to acquire a shared lock", ("lock",)))
@@ -1,11 +1,15 @@
 import threading
 import time
 import copy
+import secrets
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
+from server.metrics import TimedLock
 
 TIMEOUT_TIME = 60.0
 CHECK_INTERVAL_TIME = 10.0
+RESUME_GRACE_TIME = 30.0    # How long a dropped player can be resumed with its token
+MAX_EXTRAPOLATION_TIME = 1.0    # Clients resend at least every 0.5s while moving
 
 @dataclass
 class Player:
@@ -17,43 +21,65 @@ class Player:
     # [mine] 新增欄位：方向與怪獸
     direction: str = "DOWN"
     pokemon: dict = None
+    token: str = ""
+    # Velocity (px/s) reported by the client; positions are extrapolated from `received`
+    vx: float = 0.0
+    vy: float = 0.0
+    received: float = 0.0
+    # Clock time the connection dropped; detached players are hidden from everyone
+    detached_since: float | None = None
 
     # [mine] 更新方法加入 direction 和 pokemon
-    def update(self, x: float, y: float, map: str, direction: str, pokemon: dict) -> None:
+    def update(self, x: float, y: float, map: str, direction: str, pokemon: dict, vx: float = 0.0, vy: float = 0.0, *, now: float) -> None:
         # 只要有任何狀態改變，就更新活躍時間
-        if (x != self.x or y != self.y or map != self.map or direction != self.direction):
-            self.last_update = time.monotonic()
+        if (x != self.x or y != self.y or map != self.map or direction != self.direction or vx or vy):
+            self.last_update = now
         self.x = x
         self.y = y
+        self.vx = vx
+        self.vy = vy
+        self.received = now
         self.map = map
         self.direction = direction
         self.pokemon = pokemon
 
-    def is_inactive(self) -> bool:
-        now = time.monotonic()
+    def is_inactive(self, now: float) -> bool:
         return (now - self.last_update) >= TIMEOUT_TIME
 
+    def predicted_position(self, now: float) -> tuple[float, float]:
+        dt = min(now - self.received, MAX_EXTRAPOLATION_TIME)
+        return self.x + self.vx * dt, self.y + self.vy * dt
+
 
 class PlayerHandler:
-    _lock: threading.Lock
+    _lock: TimedLock
     _stop_event: threading.Event
     _thread: threading.Thread | None
     
     players: Dict[int, Player]
+    _tokens: Dict[str, int]
     _next_id: int
 
-    def __init__(self, *, timeout_seconds: float = 120.0, check_interval_seconds: float = 5.0):
-        self._lock = threading.Lock()
+    def __init__(
+        self, *, timeout_seconds: float = 120.0, check_interval_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        # Every timestamp (activity, extrapolation, detach) is read from `clock`,
+        # so a replay can run the handler on recorded time
+        self._clock = clock
+        self._lock = TimedLock("player_handler")
         self._stop_event = threading.Event()
         self._thread = None
         
         self.players = {}
+        self._tokens = {}
         self._next_id = 0
     # [Fix] 補上這個漏掉的方法
     def unregister(self, player_id: int) -> None:
         # 這裡假設你的儲存變數叫做 self.players (如果是 self._players 請自行調整)
         if hasattr(self, "players") and player_id in self.players:
-            del self.players[player_id]
+            p = self.players.pop(player_id)
+            self._tokens.pop(p.token, None)
             print(f"[PlayerHandler] Player {player_id} unregistered.")  
     # Threading
     def start(self) -> None:
@@ -70,14 +96,18 @@ class PlayerHandler:
 
     def _cleaner(self) -> None:
         while not self._stop_event.wait(CHECK_INTERVAL_TIME):
-            now = time.monotonic()
+            now = self._clock()
             to_remove: list[int] = []
             with self._lock:
                 for pid, p in list(self.players.items()):
                     if now - p.last_update >= TIMEOUT_TIME:
                         to_remove.append(pid)
+                    elif p.detached_since is not None and now - p.detached_since >= RESUME_GRACE_TIME:
+                        to_remove.append(pid)
                 for pid in to_remove:
-                    _ = self.players.pop(pid, None)
+                    p = self.players.pop(pid, None)
+                    if p:
+                        self._tokens.pop(p.token, None)
                     
     # API
     def register(self) -> int:
@@ -85,29 +115,118 @@ class PlayerHandler:
             pid = self._next_id
             self._next_id += 1
             # 初始化玩家
-            self.players[pid] = Player(pid, 0.0, 0.0, "", time.monotonic())
+            token = secrets.token_urlsafe(16)
+            self.players[pid] = Player(pid, 0.0, 0.0, "", self._clock(), token=token)
+            self._tokens[token] = pid
             return pid
 
+    def get_token(self, pid: int) -> str:
+        with self._lock:
+            p = self.players.get(pid)
+            return p.token if p else ""
+
+    def resume(self, token: str) -> int:
+        """Reattach the player owning `token`; -1 if it is unknown or already cleaned up."""
+        with self._lock:
+            pid = self._tokens.get(token, -1)
+            p = self.players.get(pid)
+            if not p:
+                return -1
+            p.detached_since = None
+            p.last_update = self._clock()
+            return pid
+
+    def detach(self, pid: int) -> None:
+        """Hide a disconnected player, keeping it resumable for RESUME_GRACE_TIME."""
+        with self._lock:
+            p = self.players.get(pid)
+            if p:
+                p.detached_since = self._clock()
+
     # [Modified] update 接收更多參數
-    def update(self, pid: int, x: float, y: float, map_name: str, direction: str, pokemon: dict) -> bool:
+    def update(self, pid: int, x: float, y: float, map_name: str, direction: str, pokemon: dict, vx: float = 0.0, vy: float = 0.0) -> bool:
         with self._lock:
             p = self.players.get(pid)
             if not p:
                 return False
             else:
-                p.update(float(x), float(y), str(map_name), str(direction), pokemon)
+                p.update(float(x), float(y), str(map_name), str(direction), pokemon, float(vx), float(vy), now=self._clock())
                 return True
 
     def list_players(self) -> dict:
+        now = self._clock()
         with self._lock:
             player_list = {}
             for p in self.players.values():
+                if p.detached_since is not None:
+                    continue
+                x, y = p.predicted_position(now) if p.vx or p.vy else (p.x, p.y)
                 player_list[p.id] = {
                     "id": p.id,
-                    "x": p.x,
-                    "y": p.y,
+                    "x": x,
+                    "y": y,
+                    "vx": p.vx,
+                    "vy": p.vy,
                     "map": p.map,
                     "direction": p.direction, # [New] 回傳方向
                     "pokemon": p.pokemon      # [New] 回傳怪獸
                 }
-            return player_list
\ No newline at end of file
+            return player_list
+
+    def dump_state(self) -> dict:
+        """
+        Everything needed to rebuild the handler after a restart, as JSON-safe
+        data. Clock timestamps don't survive a restart, so they are stored
+        as ages.
+        """
+        now = self._clock()
+        with self._lock:
+            players = []
+            for p in self.players.values():
+                players.append({
+                    "id": p.id, "x": p.x, "y": p.y, "vx": p.vx, "vy": p.vy,
+                    "map": p.map, "direction": p.direction, "pokemon": p.pokemon,
+                    "token": p.token,
+                    "idle": now - p.last_update,
+                    "received_ago": now - p.received,
+                    "detached_for": None if p.detached_since is None else now - p.detached_since,
+                })
+            return {"next_id": self._next_id, "players": players}
+
+    def load_state(self, state: dict) -> None:
+        """
+        Replace all players with a `dump_state` result. Players that were
+        connected when it was taken count as detached from now on, so they get
+        the full RESUME_GRACE_TIME to reconnect.
+        """
+        now = self._clock()
+        players: Dict[int, Player] = {}
+        for d in state["players"]:
+            detached_for = d["detached_for"]
+            p = Player(
+                int(d["id"]), float(d["x"]), float(d["y"]), str(d["map"]),
+                now - float(d["idle"]),
+                direction=str(d["direction"]),
+                pokemon=d["pokemon"],
+                token=str(d["token"]),
+                vx=float(d["vx"]),
+                vy=float(d["vy"]),
+                received=now - float(d["received_ago"]),
+                detached_since=now if detached_for is None else now - float(detached_for),
+            )
+            players[p.id] = p
+        next_id = max(int(state["next_id"]), max(players, default=-1) + 1)
+        with self._lock:
+            self.players = players
+            self._tokens = {p.token: p.id for p in players.values()}
+            self._next_id = next_id
+
+    def count_by_map(self) -> dict[tuple[str], int]:
+        """Number of players on each map, keyed for the `server_players` gauge."""
+        with self._lock:
+            counts: dict[tuple[str], int] = {}
+            for p in self.players.values():
+                if p.detached_since is not None:
+                    continue
+                counts[(p.map,)] = counts.get((p.map,), 0) + 1
+            return counts
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""
+Wire format helpers shared by server.py, the client transport and benchmarks.
+
+Positions in players_update are sent as fixed-point integers: map pixel
+coordinates times POSITION_SCALE (quarter pixels, i.e. 1/256 of a 64 px
+tile). The message carries "scale" so a client can tell them apart from
+plain floats.
+
+Permessage-deflate is turned off on both ends; instead the sender decides
+per message: payloads of at least COMPRESS_THRESHOLD bytes (the initial
+player list, chat history, busy snapshots) go out as binary frames holding
+zlib-compressed JSON, small position frames stay uncompressed text.
+"""
+import json
+import zlib
+from dataclasses import dataclass
+
+POSITION_SCALE = 4
+# Fixed-point values are clamped to a signed 32-bit range on the wire
+WIRE_MAX = 2**31 - 1
+# Largest coordinate or velocity (map pixels) that fits the wire range
+MAX_POSITION = WIRE_MAX // POSITION_SCALE
+COMPRESS_THRESHOLD = 1024   # Bytes of JSON below which compression is not worth the CPU
+COMPRESS_LEVEL = 1          # Fast; higher levels gain little on these payloads
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    threshold: int = COMPRESS_THRESHOLD
+    level: int = COMPRESS_LEVEL
+
+    def encode(self, payload: str) -> str | bytes:
+        """Text frame as-is, or a binary frame of zlib-compressed UTF-8 JSON"""
+        if self.threshold < 0 or len(payload) < self.threshold:
+            return payload
+        return zlib.compress(payload.encode("utf-8"), self.level)
+
+
+# threshold -1 disables compression entirely
+DEFAULT_POLICY = CompressionPolicy()
+
+
+def decode_frame(frame: str | bytes) -> dict:
+    """Inverse of CompressionPolicy.encode followed by json.loads"""
+    if isinstance(frame, bytes):
+        frame = zlib.decompress(frame)
+    return json.loads(frame)
+
+
+def quantise(value: float) -> int:
+    """`value` as POSITION_SCALE fixed point, clamped to the wire range (NaN -> 0)"""
+    if value != value:
+        return 0
+    return int(round(max(-MAX_POSITION, min(MAX_POSITION, value)) * POSITION_SCALE))
+
+
+def to_wire(message: dict) -> dict:
+    """players_update with positions and velocities as POSITION_SCALE fixed-point ints"""
+    if message.get("type") != "players_update":
+        return message
+    players = {}
+    for pid, p in message["players"].items():
+        players[pid] = dict(
+            p, x=quantise(p["x"]), y=quantise(p["y"]),
+            vx=quantise(p.get("vx", 0.0)), vy=quantise(p.get("vy", 0.0))
+        )
+    return dict(message, players=players, scale=POSITION_SCALE)
+
+
+def encode_message(message: dict, policy: CompressionPolicy = DEFAULT_POLICY) -> str | bytes:
+    """The frame server.py sends for `message`"""
+    return policy.encode(json.dumps(to_wire(message)))
@@ -0,0 +1,77 @@
+import gzip
+import json
+import time
+from typing import Iterator, TextIO
+
+FLUSH_INTERVAL_TIME = 1.0
+
+# Event kinds, one JSON array per line: [seconds, connection id, kind, data]
+CONNECT = "c"       # data: resume params dict or null
+MESSAGE = "m"       # data: the inbound frame exactly as received
+DISCONNECT = "d"    # data: null
+
+
+class TrafficRecorder:
+    """
+    Records every inbound connection event of server.py so the session can
+    be replayed offline (see benchmarks/replay.py). Timestamps are seconds
+    since recording started; connection ids are assigned in connect order.
+    A path ending in .gz is written gzip-compressed.
+
+    Called only from the server's event loop, so there is no locking.
+    Writes go to a buffered file flushed about once per second.
+    """
+    _file: TextIO | None
+    _next_conn: int
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        opener = gzip.open if path.endswith(".gz") else open
+        self._file = opener(path, "wt", encoding="utf-8")
+        self._start = time.monotonic()
+        self._flushed_at = self._start
+        self._next_conn = 0
+
+    def connect(self, resume: dict | None) -> int:
+        conn = self._next_conn
+        self._next_conn += 1
+        self._write(conn, CONNECT, resume)
+        return conn
+
+    def message(self, conn: int, frame: str | bytes) -> None:
+        if isinstance(frame, bytes):
+            frame = frame.decode("utf-8", "replace")
+        self._write(conn, MESSAGE, frame)
+
+    def disconnect(self, conn: int) -> None:
+        self._write(conn, DISCONNECT, None)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, conn: int, kind: str, data: object) -> None:
+        if self._file is None:
+            return
+        now = time.monotonic()
+        self._file.write(json.dumps([round(now - self._start, 4), conn, kind, data], separators=(",", ":")))
+        self._file.write("\n")
+        if now - self._flushed_at >= FLUSH_INTERVAL_TIME:
+            self._file.flush()
+            self._flushed_at = now
+
+
+def read_recording(path: str) -> Iterator[tuple[float, int, str, object]]:
+    """Events of a TrafficRecorder file in order; a truncated last line is skipped"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                try:
+                    t, conn, kind, data = json.loads(line)
+                except ValueError:
+                    continue  # Half-written line from a killed server
+                yield float(t), int(conn), kind, data
+        except EOFError:
+            return  # gzip stream cut off mid-block
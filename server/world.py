@@ -0,0 +1,135 @@
+import math
+import time
+from typing import Callable
+from server.playerHandler import PlayerHandler
+from server.chatStore import ChatStore
+from server.protocol import MAX_POSITION
+
+# players_update broadcasts per second; clients interpolate between them
+TICK_RATE = 20
+
+
+class World:
+    """
+    Server-side game state and protocol logic, independent of how messages
+    travel. server.py drives it from WebSocket connections; the client's
+    loopback transport drives it in-process with the same message dicts.
+    """
+    players: PlayerHandler
+    chat: ChatStore
+    # Chat accepted since the last tick, fanned out with the next players_update
+    pending_chat: list[dict]
+    # Sequence number of the last players_update broadcast
+    version: int
+
+    def __init__(self, players: PlayerHandler, chat: ChatStore, *, clock: Callable[[], float] = time.time) -> None:
+        self.players = players
+        self.chat = chat
+        self.pending_chat = []
+        self.version = 0
+        self._clock = clock
+
+    def connect(self, resume: dict | None = None) -> tuple[int, bool, list[dict]]:
+        """
+        Register a new player, or reattach the one owning `resume["token"]`.
+        Returns the player id, whether it was resumed, and the messages to send first.
+        """
+        player_id = self.players.resume(resume["token"]) if resume else -1
+        resumed = player_id >= 0
+        if not resumed:
+            # Register player on connection - server assigns ID
+            player_id = self.players.register()
+
+        messages = [{
+            "type": "registered",
+            "id": player_id,
+            "token": self.players.get_token(player_id),
+            "resumed": resumed,
+            "version": self.version
+        }]
+        if resumed:
+            # players_update frames are full snapshots, so the next tick already
+            # brings the client up to date; it only needs the chat it missed
+            missed_chat = self._delivered_chat(self.chat.list_since(resume["chat"]))
+            if missed_chat:
+                messages.append({"type": "chat_update", "messages": missed_chat})
+        else:
+            # Initial player list and recent chat messages
+            messages.append(self.snapshot())
+            messages.append({"type": "chat_update", "messages": self._delivered_chat(self.chat.list_since(0))})
+        return player_id, resumed, messages
+
+    def _delivered_chat(self, messages: list[dict]) -> list[dict]:
+        """`messages` without the ones still queued: the next tick brings those to every client"""
+        if not self.pending_chat:
+            return messages
+        first_pending = self.pending_chat[0]["id"]
+        return [m for m in messages if m["id"] < first_pending]
+
+    def disconnect(self, player_id: int) -> None:
+        """Keep the player resumable for a while instead of unregistering it"""
+        self.players.detach(player_id)
+
+    def handle(self, player_id: int, data: dict) -> dict | None:
+        """Apply one client message; returns a reply for the sender (error or pong), if any"""
+        msg_type = data.get("type")
+        if msg_type == "player_update":
+            # Update player position
+            x = float(data.get("x", 0))
+            y = float(data.get("y", 0))
+            map_name = str(data.get("map", ""))
+
+            # Velocity for dead reckoning (older clients don't send it)
+            vx = float(data.get("vx", 0))
+            vy = float(data.get("vy", 0))
+            # json.loads accepts NaN and Infinity; anything that cannot be
+            # quantised for the broadcast is dropped here
+            if not all(math.isfinite(v) and abs(v) <= MAX_POSITION for v in (x, y, vx, vy)):
+                return {"type": "error", "message": "invalid_position"}
+
+            # [New] 讀取方向和怪獸
+            direction = str(data.get("direction", "DOWN"))
+            pokemon = data.get("pokemon", None)
+            self.players.update(player_id, x, y, map_name, direction, pokemon, vx, vy)
+
+        elif msg_type == "chat_send":
+            # Send chat message - use server-assigned ID
+            text = str(data.get("text", ""))
+            if text:
+                try:
+                    msg = self.chat.add(player_id, text)
+                except ValueError:
+                    return {"type": "error", "message": "empty_message"}
+                # Broadcast to all clients on the next tick
+                self.pending_chat.append(msg)
+
+        elif msg_type == "ping":
+            # Echo the client's timestamp so it can measure the round trip
+            return {"type": "pong", "t": data.get("t")}
+        return None
+
+    def tick(self) -> dict:
+        """Next players_update broadcast, carrying the chat queued since the last one"""
+        self.version += 1
+        message = self.snapshot()
+        if self.pending_chat:
+            message["chat"] = self.pending_chat
+            self.pending_chat = []
+        return message
+
+    def dump_state(self) -> dict:
+        """Players and the broadcast version; chat state lives in the chat log"""
+        return {"version": self.version, "players": self.players.dump_state()}
+
+    def load_state(self, state: dict) -> None:
+        version = int(state["version"])
+        self.players.load_state(state["players"])
+        self.version = version
+
+    def snapshot(self) -> dict:
+        return {
+            "type": "players_update",
+            "players": self.players.list_players(),
+            "version": self.version,
+            "timestamp": self._clock()
+        }
@@ -0,0 +1,85 @@
+import json
+import os
+import threading
+import time
+from server.world import World
+
+SNAPSHOT_PATH = os.path.join("server_data", "world.json")
+SNAPSHOT_INTERVAL_TIME = 5.0
+SNAPSHOT_FORMAT = 1
+
+
+class WorldSnapshotter:
+    """
+    Periodically writes `World.dump_state` to disk so a restarted server can
+    pick up where the old one stopped: same ids, same resume tokens, same
+    broadcast version. Chat is not included, the chat log already has it.
+
+    Each snapshot is written to a temporary file and moved over the old one
+    with os.replace, so a crash mid-write leaves the previous snapshot intact.
+    """
+    _stop_event: threading.Event
+    _thread: threading.Thread | None
+
+    def __init__(self, world: World, path: str = SNAPSHOT_PATH, *, interval_seconds: float = SNAPSHOT_INTERVAL_TIME) -> None:
+        self.world = world
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    # Threading
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._writer, name="WorldSnapshotter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the writer and take one last snapshot"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        self.save()
+
+    def _writer(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            self.save()
+
+    # API
+    def save(self) -> bool:
+        state = {"format": SNAPSHOT_FORMAT, "saved_at": time.time(), "world": self.world.dump_state()}
+        tmp_path = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            print(f"[WorldSnapshotter] Failed to write snapshot: {e}")
+            return False
+
+    def restore(self) -> bool:
+        """Load the latest snapshot into the world, if there is a usable one"""
+        start = time.perf_counter()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("format") != SNAPSHOT_FORMAT:
+                print(f"[WorldSnapshotter] Ignoring snapshot with unknown format {state.get('format')}")
+                return False
+            self.world.load_state(state["world"])
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"[WorldSnapshotter] Ignoring unreadable snapshot: {e}")
+            return False
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        age = time.time() - float(state.get("saved_at", 0))
+        print(f"[WorldSnapshotter] Restored {len(self.world.players.players)} players, "
+              f"version {self.world.version}, from a {age:.0f}s old snapshot in {elapsed_ms:.1f} ms")
+        return True
@@ -1,6 +1,8 @@
 from .scene_manager import SceneManager
 from .input_manager import InputManager
 from .resource_manager import ResourceManager
+from .text_manager import TextManager
+from .asset_loader import AssetLoader
 from .sound_manager import SoundManager
 from .game_manager import GameManager
 from .online_manager import OnlineManager
\ No newline at end of file
@@ -0,0 +1,99 @@
+from __future__ import annotations
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+import pygame as pg
+from src.utils import AssetManifest, Logger
+from src.utils.loader import decode_img, convert_img, load_sound, parse_tmx, convert_tmx
+from .resource_manager import ResourceManager
+
+if TYPE_CHECKING:
+    from pytmx import TiledMap
+
+ASSET_LOADER_WORKERS = 4
+# Main-thread time `poll` may spend converting finished assets per frame
+FINISH_BUDGET_TIME = 0.008
+
+
+class AssetLoader:
+    """
+    Loads an AssetManifest in the background. Images are decoded, TMX maps
+    parsed and sounds decoded on worker threads; `poll`, called from the
+    game loop, converts finished images and map tiles to the display format
+    on the main thread (a few ms per frame) and puts them in the
+    ResourceManager, where the usual get_* calls then find them.
+    """
+    _pending: list[tuple[str, str, Future]]
+    _executor: ThreadPoolExecutor | None
+
+    def __init__(self, resources: ResourceManager, *, workers: int = ASSET_LOADER_WORKERS) -> None:
+        self.resources = resources
+        self.workers = workers
+        self._pending = []
+        self._executor = None
+        self.total = 0
+        self.done = 0
+        self.started_at = 0.0
+        self.finished_at: float | None = None
+
+    @property
+    def progress(self) -> float:
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    def start(self, manifest: AssetManifest) -> None:
+        """Queue everything in `manifest` that is not cached yet"""
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="AssetLoader")
+        jobs = (
+            [("map", p, parse_tmx) for p in manifest.maps]      # Largest first
+            + [("image", p, decode_img) for p in manifest.images]
+            + [("sound", p, load_sound) for p in manifest.sounds]
+        )
+        for kind, path, load in jobs:
+            if not self.resources.has(kind, path):
+                self._pending.append((kind, path, self._executor.submit(load, path)))
+        self.total = len(self._pending)
+        self.done = 0
+        self.poll(0)
+
+    def poll(self, budget: float = FINISH_BUDGET_TIME) -> float:
+        """Finish loaded assets for up to `budget` seconds (in order); returns progress"""
+        deadline = time.perf_counter() + budget
+        while self._pending:
+            kind, path, future = self._pending[0]
+            if not future.done():
+                break
+            self._pending.pop(0)
+            try:
+                self.resources.put(kind, path, self._finish(kind, future.result()))
+            except Exception as e:
+                # Loading it again on first use reports the error where it matters
+                Logger.warning(f"Background loading of {kind} {path} failed: {e}")
+            self.done += 1
+            if time.perf_counter() >= deadline:
+                break
+        if not self._pending and self.finished_at is None:
+            self.finished_at = time.perf_counter()
+            Logger.info(f"Loaded {self.total} assets in {(self.finished_at - self.started_at) * 1000:.0f} ms")
+            self.shutdown()
+        return self.progress
+
+    @staticmethod
+    def _finish(kind: str, asset: pg.Surface | pg.mixer.Sound | TiledMap):
+        """Main-thread half of loading: display conversion"""
+        if kind == "image":
+            return convert_img(asset)
+        if kind == "map":
+            return convert_tmx(asset)
+        return asset
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,93 @@
+import time
+from src.utils import Logger
+from .online_transport import Transport, TransportClient
+from server.chatStore import ChatStore
+from server.playerHandler import PlayerHandler
+from server.world import World, TICK_RATE
+
+
+class LoopbackServer:
+    """
+    In-process stand-in for server.py around the same World logic. Ticks are
+    driven by `poll` (from the game loop) or explicitly with `tick`, which
+    makes client/server runs in a single process deterministic.
+    """
+    world: World
+    _links: list["LoopbackTransport"]
+
+    def __init__(self, world: World | None = None, *, tick_rate: float = TICK_RATE) -> None:
+        # No cleaner thread: nobody times out of a local session
+        self.world = world or World(PlayerHandler(), ChatStore())
+        self.tick_interval = 1.0 / tick_rate
+        self._links = []
+        self._next_tick = 0.0
+
+    def attach(self, link: "LoopbackTransport") -> None:
+        if link not in self._links:
+            self._links.append(link)
+
+    def detach(self, link: "LoopbackTransport") -> None:
+        if link in self._links:
+            self._links.remove(link)
+
+    def tick(self) -> None:
+        message = self.world.tick()
+        for link in list(self._links):
+            link.deliver(message)
+
+    def poll(self) -> None:
+        now = time.monotonic()
+        if now >= self._next_tick:
+            self._next_tick = max(self._next_tick + self.tick_interval, now)
+            self.tick()
+
+
+class LoopbackTransport(Transport):
+    """
+    Runs the server logic in-process: no thread, no socket, no serialisation.
+    Messages are handed over as the very same dicts.
+    """
+    server: LoopbackServer
+    _client: TransportClient | None
+    _player_id: int
+
+    def __init__(self, server: LoopbackServer | None = None, *, auto_tick: bool = True) -> None:
+        self.server = server or LoopbackServer()
+        self.auto_tick = auto_tick
+        self._client = None
+        self._player_id = -1
+
+    def start(self, client: TransportClient) -> None:
+        if self._player_id >= 0:
+            return
+        self._client = client
+        player_id, _, messages = self.server.world.connect(client.resume_params())
+        self._player_id = player_id
+        self.server.attach(self)
+        for message in messages:
+            self.deliver(message)
+        Logger.info("Loopback transport connected")
+
+    def stop(self) -> None:
+        if self._player_id < 0:
+            return
+        self.server.detach(self)
+        self.server.world.disconnect(self._player_id)
+        self._player_id = -1
+
+    def poll(self) -> None:
+        """Hand queued messages to the world, then run a tick if one is due"""
+        if self._player_id < 0:
+            return
+        messages, _ = self._client.next_outbound()
+        for message in messages:
+            self._client.net_stats.record_out(0)  # Nothing is serialised
+            reply = self.server.world.handle(self._player_id, message)
+            if reply is not None:
+                self.deliver(reply)
+        if self.auto_tick:
+            self.server.poll()
+
+    def deliver(self, message: dict) -> None:
+        self._client.net_stats.record_in(0)
+        self._client.on_message(message)
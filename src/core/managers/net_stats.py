@@ -0,0 +1,77 @@
+import time
+
+RATE_WINDOW = 1.0   # Seconds between per-second rate recalculations
+RTT_SMOOTHING = 0.125
+
+
+class NetStats:
+    """
+    Client-side network counters. Totals are plain ints bumped from the
+    transport thread and read from the game thread; an occasionally stale
+    read is fine for a debug overlay.
+    """
+    msgs_in: int
+    bytes_in: int
+    msgs_out: int
+    bytes_out: int
+    update_drops: int
+    chat_drops: int
+    # Connections re-opened after an unintended drop; stop() and start()
+    # (e.g. leaving and re-entering the game scene) do not count
+    reconnects: int
+    rtt: float | None
+    rtt_smoothed: float | None
+    snapshot_at: float | None
+
+    def __init__(self) -> None:
+        self.msgs_in = self.bytes_in = 0
+        self.msgs_out = self.bytes_out = 0
+        self.update_drops = 0
+        self.chat_drops = 0
+        self.reconnects = 0
+        self.rtt = None
+        self.rtt_smoothed = None
+        self.snapshot_at = None
+        self._rate_at = time.monotonic()
+        self._rate_totals = (0, 0, 0, 0)
+        self._rates = (0.0, 0.0, 0.0, 0.0)
+
+    def record_in(self, n_bytes: int) -> None:
+        self.msgs_in += 1
+        self.bytes_in += n_bytes
+
+    def record_out(self, n_bytes: int) -> None:
+        self.msgs_out += 1
+        self.bytes_out += n_bytes
+
+    def record_rtt(self, seconds: float) -> None:
+        self.rtt = seconds
+        if self.rtt_smoothed is None:
+            self.rtt_smoothed = seconds
+        else:
+            self.rtt_smoothed += (seconds - self.rtt_smoothed) * RTT_SMOOTHING
+
+    def _update_rates(self, now: float) -> tuple[float, float, float, float]:
+        elapsed = now - self._rate_at
+        if elapsed >= RATE_WINDOW:
+            totals = (self.msgs_in, self.bytes_in, self.msgs_out, self.bytes_out)
+            self._rates = tuple((t - p) / elapsed for t, p in zip(totals, self._rate_totals))
+            self._rate_totals = totals
+            self._rate_at = now
+        return self._rates
+
+    def as_dict(self) -> dict:
+        now = time.monotonic()
+        in_msgs, in_bytes, out_msgs, out_bytes = self._update_rates(now)
+        return {
+            "rtt_ms": None if self.rtt is None else round(self.rtt * 1000, 1),
+            "rtt_smoothed_ms": None if self.rtt_smoothed is None else round(self.rtt_smoothed * 1000, 1),
+            "in_msgs_per_s": round(in_msgs, 1),
+            "in_bytes_per_s": round(in_bytes),
+            "out_msgs_per_s": round(out_msgs, 1),
+            "out_bytes_per_s": round(out_bytes),
+            "update_drops": self.update_drops,
+            "chat_drops": self.chat_drops,
+            "reconnects": self.reconnects,
+            "snapshot_age_ms": None if self.snapshot_at is None else round((now - self.snapshot_at) * 1000),
+        }
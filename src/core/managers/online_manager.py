@@ -1,61 +1,89 @@
-import asyncio
 import threading
 import time
 import queue
 import collections
-import json
 from collections import deque
-from typing import Optional
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping
 from src.utils import Logger, GameSettings
+from .net_stats import NetStats
+from .online_transport import Transport, make_transport
 
-try:
-    import websockets
-except ImportError:
-    Logger.error("websockets library not installed. Run: pip install websockets")
-    websockets = None
+# Dead reckoning: positions are only sent when the receivers' prediction would be off
+DRIFT_THRESHOLD = GameSettings.TILE_SIZE / 8  # px the predicted position may drift before we resend
+MOVING_HEARTBEAT = 0.5      # s between updates while moving, bounds how long others extrapolate
+MAX_SPEED = GameSettings.TILE_SIZE * 20       # px/s; anything faster is a teleport, not movement
+MAX_EXTRAPOLATION = 1.0     # s a remote player is moved along its velocity without news
+# Remote players are drawn this far behind the server clock, between two buffered snapshots
+INTERPOLATION_DELAY = 0.1   # 2 ticks at the server's 20 Hz
+SNAPSHOT_BUFFER = 32
+CLOCK_SAMPLES = 64
+PING_INTERVAL = 1.0         # s between RTT probes
 
-from typing import Any
+
+@dataclass(frozen=True)
+class PlayersSnapshot:
+    """Immutable remote player state; `players` is keyed by player id and read-only."""
+    version: int
+    players: Mapping[int, Mapping[str, Any]]
+
+
+_NO_PLAYERS: Mapping[int, Mapping[str, Any]] = MappingProxyType({})
+
+
+def _with_position(p: Mapping[str, Any], x: float, y: float) -> Mapping[str, Any]:
+    return MappingProxyType({**p, "x": x, "y": y})
 
 
 class OnlineManager:
-    list_players: list[dict]
     player_id: int
-    # WebSocket state
-    _ws: Optional[Any]
-    _ws_loop: Optional[asyncio.AbstractEventLoop]
-    _ws_thread: Optional[threading.Thread]
-    _stop_event: threading.Event
+    net_stats: NetStats
+    _transport: Transport
     _lock: threading.Lock
     _update_queue: queue.Queue
+    _last_update_sent: float
+    _last_ping: float
     _chat_out_queue: queue.Queue
     _chat_messages: collections.deque
     _last_chat_id: int
-
-    def __init__(self):
-        if websockets is None:
-            Logger.error("WebSockets library not available")
-            raise ImportError("websockets library required")
-
-        self.base: str = GameSettings.ONLINE_SERVER_URL
-        # Convert HTTP URL to WebSocket URL
-        if self.base.startswith("http://"):
-            self.ws_url = self.base.replace("http://", "ws://")
-        elif self.base.startswith("https://"):
-            self.ws_url = self.base.replace("https://", "wss://")
-        else:
-            self.ws_url = f"ws://{self.base}"
-
+    # Session resume
+    _resume_token: str
+    # Dead reckoning (game thread)
+    _last_sent: dict | None
+    _prev_sample: tuple[float, float, float] | None
+    _velocity: tuple[float, float]
+    # Snapshot interpolation: (server timestamp, {pid: player}) oldest first
+    _snapshots: collections.deque
+    _clock_samples: collections.deque
+    _clock_offset: float
+    # Rebuilt once per frame by advance() from the buffered snapshots
+    _view: PlayersSnapshot
+    _view_key: tuple[float | None, float | None] | None
+    _view_moving: bool
+
+    def __init__(self, transport: Transport | None = None):
         self.player_id = -1
-        self.list_players = []
-        self._ws = None
-        self._ws_loop = None
-        self._ws_thread = None
-        self._stop_event = threading.Event()
+        self.net_stats = NetStats()
+        # Transport selected by GameSettings.ONLINE_TRANSPORT unless one is given (e.g. loopback in tests)
+        self._transport = transport or make_transport()
         self._lock = threading.Lock()
         self._update_queue = queue.Queue(maxsize=10)
+        self._last_update_sent = 0.0
+        self._last_ping = 0.0
         self._chat_out_queue = queue.Queue(maxsize=50)
         self._chat_messages = deque(maxlen=200)
         self._last_chat_id = 0
+        self._resume_token = ""
+        self._last_sent = None
+        self._prev_sample = None
+        self._velocity = (0.0, 0.0)
+        self._snapshots = deque(maxlen=SNAPSHOT_BUFFER)
+        self._clock_samples = deque(maxlen=CLOCK_SAMPLES)
+        self._clock_offset = 0.0
+        self._view = PlayersSnapshot(0, _NO_PLAYERS)
+        self._view_key = None
+        self._view_moving = False
 
         Logger.info("OnlineManager initialized")
 
@@ -65,207 +93,288 @@ class OnlineManager:
     def exit(self):
         self.stop()
 
-    def get_list_players(self) -> list[dict]:
-        """Get list of players"""
+    def get_players_snapshot(self) -> PlayersSnapshot:
+        """Remote players for the current frame (see advance); immutable, safe to keep."""
+        return self._view
+
+    def get_list_players(self) -> Iterable[Mapping[str, Any]]:
+        """Remote players for the current frame, without copying"""
+        return self._view.players.values()
+
+    def advance(self) -> PlayersSnapshot:
+        """
+        Rebuild the view of remote players as they were INTERPOLATION_DELAY ago
+        on the server clock, interpolated between the two buffered snapshots
+        around that time. Call once per frame from the game thread; the version
+        only changes when the players actually moved or changed.
+        """
+        self._transport.poll()
         with self._lock:
-            return list(self.list_players)
+            render_t = time.monotonic() + self._clock_offset - INTERPOLATION_DELAY
+            older = newer = None
+            for snap in reversed(self._snapshots):
+                if snap[0] <= render_t:
+                    older = snap
+                    break
+                newer = snap
+
+        key = (older[0] if older else None, newer[0] if newer else None)
+        if key == self._view_key and not self._view_moving:
+            return self._view
+
+        moving = False
+        if older is None:
+            # Nothing old enough yet (just connected): show the oldest we have
+            players = newer[1] if newer else _NO_PLAYERS
+        elif newer is None:
+            # Snapshots are late: keep players moving along their last velocity
+            elapsed = render_t - older[0]
+            extrapolating = elapsed < MAX_EXTRAPOLATION
+            elapsed = min(elapsed, MAX_EXTRAPOLATION)
+            out = {}
+            for pid, p in older[1].items():
+                if p["vx"] or p["vy"]:
+                    p = _with_position(p, p["x"] + p["vx"] * elapsed, p["y"] + p["vy"] * elapsed)
+                    # Only a player with a velocity changes from frame to frame
+                    moving = extrapolating
+                out[pid] = p
+            players = MappingProxyType(out)
+        else:
+            alpha = (render_t - older[0]) / max(newer[0] - older[0], 1e-6)
+            out = {}
+            for pid, b in newer[1].items():
+                a = older[1].get(pid)
+                if a is not None and a["map"] == b["map"] and (a["x"] != b["x"] or a["y"] != b["y"]):
+                    b = _with_position(b, a["x"] + (b["x"] - a["x"]) * alpha, a["y"] + (b["y"] - a["y"]) * alpha)
+                    moving = True
+                out[pid] = b
+            players = MappingProxyType(out)
+
+        self._view = PlayersSnapshot(self._view.version + 1, players)
+        self._view_key = key
+        self._view_moving = moving
+        return self._view
 
     # [Fix] 增加 direction 和 pokemon 參數，解決 GameScene 呼叫時的參數錯誤
     def update(self, x: float, y: float, map_name: str, direction: str = "DOWN", pokemon: dict = None) -> bool:
-        """Queue position update (with direction & pokemon)."""
+        """
+        Queue position update (with direction & pokemon) if the state changed or
+        the position others predict from our last update drifted too far.
+        Safe to call every frame; unchanged states are not sent.
+        """
         if self.player_id == -1:
             return False
-        try:
-            self._update_queue.put_nowait({
-                "x": x,
-                "y": y,
-                "map": map_name,
-                "direction": direction, # [New] 傳送方向
-                "pokemon": pokemon      # [New] 傳送怪獸資料 (PvP用)
-            })
+        now = time.monotonic()
+        vx, vy = self._estimate_velocity(x, y, map_name, now)
+        if not self._needs_send(x, y, vx, vy, map_name, direction, pokemon, now):
             return True
+        state = {
+            "x": x,
+            "y": y,
+            "vx": vx,
+            "vy": vy,
+            "map": map_name,
+            "direction": direction, # [New] 傳送方向
+            "pokemon": pokemon      # [New] 傳送怪獸資料 (PvP用)
+        }
+        try:
+            self._update_queue.put_nowait(state)
         except queue.Full:
+            self.net_stats.update_drops += 1
             return False
+        self._last_sent = dict(state, t=now)
+        self._transport.wake()
+        return True
+
+    def _estimate_velocity(self, x: float, y: float, map_name: str, now: float) -> tuple[float, float]:
+        prev = self._prev_sample
+        sent = self._last_sent
+        if prev is None or (sent is not None and sent["map"] != map_name):
+            self._velocity = (0.0, 0.0)
+        elif now - prev[2] >= 0.001:  # Several calls in one frame keep the last estimate
+            dt = now - prev[2]
+            vx, vy = (x - prev[0]) / dt, (y - prev[1]) / dt
+            if vx * vx + vy * vy > MAX_SPEED * MAX_SPEED:
+                vx, vy = 0.0, 0.0
+            self._velocity = (vx, vy)
+        else:
+            return self._velocity
+        self._prev_sample = (x, y, now)
+        return self._velocity
+
+    def _needs_send(
+        self, x: float, y: float, vx: float, vy: float,
+        map_name: str, direction: str, pokemon: dict | None, now: float
+    ) -> bool:
+        last = self._last_sent
+        if last is None:
+            return True
+        if map_name != last["map"] or direction != last["direction"] or pokemon != last["pokemon"]:
+            return True
+        moving = bool(vx or vy)
+        if moving != bool(last["vx"] or last["vy"]):
+            return True  # Started or stopped
+        dt = now - last["t"]
+        if moving and dt >= MOVING_HEARTBEAT:
+            return True
+        dx = last["x"] + last["vx"] * dt - x
+        dy = last["y"] + last["vy"] * dt - y
+        return dx * dx + dy * dy > DRIFT_THRESHOLD * DRIFT_THRESHOLD
 
     def start(self) -> None:
-        if self._ws_thread and self._ws_thread.is_alive():
-            return
-
-        self._stop_event.clear()
-
-        self._ws_thread = threading.Thread(
-            target=self._ws_thread_func,
-            name="OnlineManagerWebSocket",
-            daemon=True
-        )
-        self._ws_thread.start()
+        self._transport.start(self)
 
     def stop(self) -> None:
-        self._stop_event.set()
-        if self._ws_loop and self._ws_loop.is_running():
-            # Schedule stop in the event loop
-            asyncio.run_coroutine_threadsafe(self._close_ws(), self._ws_loop)
-        if self._ws_thread and self._ws_thread.is_alive():
-            self._ws_thread.join(timeout=3)
-
-    def _ws_thread_func(self) -> None:
-        """Run WebSocket event loop in a separate thread"""
-        self._ws_loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self._ws_loop)
-        try:
-            self._ws_loop.run_until_complete(self._ws_main())
-        except Exception as e:
-            Logger.error(f"WebSocket thread error: {e}")
-        finally:
-            self._ws_loop.close()
-            self._ws_loop = None
-
-    async def _close_ws(self) -> None:
-        """Close WebSocket connection"""
-        if self._ws:
+        self._transport.stop()
+
+    # -----------------------------
+    # Transport callbacks
+    # -----------------------------
+    def resume_params(self) -> dict | None:
+        """Resume token and last seen chat id once we have been registered"""
+        if not self._resume_token:
+            return None
+        return {
+            "token": self._resume_token,
+            "chat": self._last_chat_id,
+        }
+
+    def next_outbound(self) -> tuple[list[dict], float]:
+        """
+        Messages due to be sent now. The second value is how long until this
+        should be called again: when a position update held back by
+        ONLINE_UPDATE_RATE may go, or the next RTT ping is due.
+        Called by the transport, from its own thread for WebSockets.
+        """
+        messages: list[dict] = []
+        if self.player_id < 0:
+            return messages, 0.0
+        now = time.monotonic()
+
+        # RTT probe; the server echoes `t` back in a pong
+        next_ping = self._last_ping + PING_INTERVAL - now
+        if next_ping <= 0:
+            messages.append({"type": "ping", "t": now})
+            self._last_ping = now
+            next_ping = PING_INTERVAL
+
+        # Chat messages
+        while True:
             try:
-                await self._ws.close()
-            except Exception:
-                pass
-            self._ws = None
+                chat_text = self._chat_out_queue.get_nowait()
+            except queue.Empty:
+                break
+            messages.append({
+                "type": "chat_send",
+                "text": chat_text
+            })
 
-    async def _ws_main(self) -> None:
-        """Main WebSocket connection and message handling"""
-        reconnect_delay = 1.0
-        max_reconnect_delay = 30.0
+        # Position updates, at most one per update interval
+        if self._update_queue.empty():
+            return messages, next_ping
+        delay = self._last_update_sent + 1.0 / GameSettings.ONLINE_UPDATE_RATE - now
+        if delay > 0:
+            return messages, min(delay, next_ping)
 
-        while not self._stop_event.is_set():
-            try:
-                # Connect to WebSocket server
-                async with websockets.connect(
-                    self.ws_url,
-                    ping_interval=20,
-                    ping_timeout=10
-                ) as websocket:
-                    self._ws = websocket
-                    Logger.info("WebSocket connected")
-                    reconnect_delay = 1.0  # Reset delay on successful connection
-
-                    # Start sender task
-                    sender_task = asyncio.create_task(self._ws_sender(websocket))
-
-                    # Handle incoming messages
-                    try:
-                        async for message in websocket:
-                            if self._stop_event.is_set():
-                                break
-                            await self._handle_message(message)
-                    except websockets.exceptions.ConnectionClosed:
-                        Logger.warning("WebSocket connection closed")
-                    finally:
-                        sender_task.cancel()
-                        try:
-                            await sender_task
-                        except asyncio.CancelledError:
-                            pass
-
-            except Exception as e:
-                Logger.warning(f"WebSocket connection error: {e}, reconnecting in {reconnect_delay}s")
-                await asyncio.sleep(reconnect_delay)
-                reconnect_delay = min(reconnect_delay * 2, max_reconnect_delay)
-            finally:
-                self._ws = None
-                if not self._stop_event.is_set():
-                    await asyncio.sleep(0.5)
-
-    async def _handle_message(self, message: str) -> None:
-        """Handle incoming WebSocket message"""
+        # Collapse queue to latest entry to avoid sending stale movement
+        latest_update = None
+        try:
+            while True:
+                latest_update = self._update_queue.get_nowait()
+        except queue.Empty:
+            pass
+
+        if latest_update:
+            # [Modified] 打包 direction 和 pokemon 送給伺服器
+            messages.append({
+                "type": "player_update",
+                "x": latest_update.get("x"),
+                "y": latest_update.get("y"),
+                "vx": latest_update.get("vx", 0.0),
+                "vy": latest_update.get("vy", 0.0),
+                "map": latest_update.get("map"),
+                "direction": latest_update.get("direction", "DOWN"),
+                "pokemon": latest_update.get("pokemon", None)
+            })
+            self._last_update_sent = now
+        return messages, next_ping
+
+    def on_message(self, data: dict) -> None:
+        """Handle an incoming server message"""
         try:
-            data = json.loads(message)
             msg_type = data.get("type")
 
             if msg_type == "registered":
                 self.player_id = int(data.get("id", -1))
-                Logger.info(f"OnlineManager registered with id={self.player_id}")
+                self._last_sent = None  # Make sure the (new) session gets our state right away
+                self._resume_token = str(data.get("token", ""))
+                if data.get("resumed"):
+                    Logger.info(f"OnlineManager resumed id={self.player_id}")
+                else:
+                    # New session: the server resends recent chat and its ids may have restarted
+                    with self._lock:
+                        self._chat_messages.clear()
+                        self._last_chat_id = 0
+                        self._snapshots.clear()
+                        self._clock_samples.clear()
+                    Logger.info(f"OnlineManager registered with id={self.player_id}")
 
             elif msg_type == "players_update":
                 players_data = data.get("players", {})
+                # Positions are fixed-point ints on the wire (see server/protocol.py)
+                unit = 1.0 / data.get("scale", 1)
+                received_at = time.monotonic()
+                self.net_stats.snapshot_at = received_at
+                server_ts = float(data.get("timestamp", 0.0))
+                players = {}
+                for pid_str, player_data in players_data.items():
+                    pid = int(pid_str)
+                    if pid != self.player_id:
+                        # [Modified] 讀取伺服器回傳的 direction 和 pokemon
+                        players[pid] = MappingProxyType({
+                            "id": pid,
+                            "x": float(player_data.get("x", 0)) * unit,
+                            "y": float(player_data.get("y", 0)) * unit,
+                            "vx": float(player_data.get("vx", 0)) * unit,
+                            "vy": float(player_data.get("vy", 0)) * unit,
+                            "map": str(player_data.get("map", "")),
+                            "direction": str(player_data.get("direction", "DOWN")), # 讀取方向
+                            "pokemon": player_data.get("pokemon", None)             # 讀取怪獸
+                        })
+                # Published as read-only; advance() shares these mappings instead of copying
+                published = MappingProxyType(players)
                 with self._lock:
-                    filtered = []
-                    for pid_str, player_data in players_data.items():
-                        pid = int(pid_str)
-                        if pid != self.player_id:
-                            # [Modified] 讀取伺服器回傳的 direction 和 pokemon
-                            filtered.append({
-                                "id": pid,
-                                "x": float(player_data.get("x", 0)),
-                                "y": float(player_data.get("y", 0)),
-                                "map": str(player_data.get("map", "")),
-                                "direction": str(player_data.get("direction", "DOWN")), # 讀取方向
-                                "pokemon": player_data.get("pokemon", None)             # 讀取怪獸
-                            })
-                    self.list_players = filtered
+                    # Latency only ever makes (server - local) smaller, so the largest
+                    # recent sample is the best estimate of the clock offset
+                    self._clock_samples.append(server_ts - received_at)
+                    self._clock_offset = max(self._clock_samples)
+                    if not self._snapshots or server_ts > self._snapshots[-1][0]:
+                        self._snapshots.append((server_ts, published))
+                # Chat sent since the previous tick rides along with the player list
+                self._append_chat(data.get("chat", []))
 
             elif msg_type == "chat_update":
-                messages = data.get("messages", [])
-                with self._lock:
-                    for m in messages:
-                        self._chat_messages.append(m)
-                        mid = int(m.get("id", self._last_chat_id))
-                        if mid > self._last_chat_id:
-                            self._last_chat_id = mid
+                self._append_chat(data.get("messages", []))
+
+            elif msg_type == "pong":
+                self.net_stats.record_rtt(time.monotonic() - float(data.get("t", 0.0)))
 
             elif msg_type == "error":
                 Logger.warning(f"Server error: {data.get('message', 'unknown')}")
 
-        except json.JSONDecodeError as e:
-            Logger.warning(f"Failed to parse WebSocket message: {e}")
         except Exception as e:
-            Logger.warning(f"Error handling WebSocket message: {e}")
-
-    async def _ws_sender(self, websocket: Any) -> None:
-        """Send updates to server via WebSocket"""
-        update_interval = 0.0167  # 60 updates per second
-        last_update = time.monotonic()
+            Logger.warning(f"Error handling server message: {e}")
 
-        while not self._stop_event.is_set():
-            try:
-                # Send position updates
-                now = time.monotonic()
-                if now - last_update >= update_interval:
-                    # Collapse queue to latest entry to avoid sending stale movement
-                    latest_update = None
-                    try:
-                        while True:
-                            latest_update = self._update_queue.get_nowait()
-                    except queue.Empty:
-                        pass
-
-                    if latest_update and self.player_id >= 0:
-                        # [Modified] 打包 direction 和 pokemon 送給伺服器
-                        message = {
-                            "type": "player_update",
-                            "x": latest_update.get("x"),
-                            "y": latest_update.get("y"),
-                            "map": latest_update.get("map"),
-                            "direction": latest_update.get("direction", "DOWN"),
-                            "pokemon": latest_update.get("pokemon", None)
-                        }
-                        await websocket.send(json.dumps(message))
-                        last_update = now
-
-                # Send chat messages
-                try:
-                    chat_text = self._chat_out_queue.get_nowait()
-                    if self.player_id >= 0:
-                        message = {
-                            "type": "chat_send",
-                            "text": chat_text
-                        }
-                        await websocket.send(json.dumps(message))
-                except queue.Empty:
-                    pass
-
-                await asyncio.sleep(0.01)  # Small sleep to prevent busy waiting
-
-            except Exception as e:
-                Logger.warning(f"WebSocket send error: {e}")
-                await asyncio.sleep(0.1)
+    def _append_chat(self, messages: list[dict]) -> None:
+        if not messages:
+            return
+        with self._lock:
+            for m in messages:
+                mid = int(m.get("id", 0))
+                if mid <= self._last_chat_id:
+                    continue  # Already seen, e.g. in both a resume reply and the next tick
+                self._chat_messages.append(m)
+                self._last_chat_id = mid
 
     # -----------------------------
     # Chat API
@@ -278,10 +387,16 @@ class OnlineManager:
             return False
         try:
             self._chat_out_queue.put_nowait(t)
+            self._transport.wake()
             return True
         except queue.Full:
+            self.net_stats.chat_drops += 1
             return False
 
+    def get_net_stats(self) -> dict:
+        """RTT, message/byte rates, queue drops, reconnects and snapshot age (see NetStats.as_dict)"""
+        return self.net_stats.as_dict()
+
     def get_recent_chat(self, limit: int = 50) -> list[dict]:
         with self._lock:
             return list(self._chat_messages)[-limit:]
\ No newline at end of file
@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+from typing import Protocol
+from src.utils import GameSettings
+from .net_stats import NetStats
+
+
+class TransportClient(Protocol):
+    """What a transport needs from OnlineManager. Messages are protocol dicts."""
+    net_stats: NetStats
+
+    def resume_params(self) -> dict | None: ...
+    def on_message(self, data: dict) -> None: ...
+    def next_outbound(self) -> tuple[list[dict], float]: ...
+
+
+class Transport(ABC):
+    """
+    Moves protocol messages between OnlineManager and a server.
+
+    `wake` is called from the game thread whenever something was queued for
+    sending; `poll` is called once per frame from the game thread.
+    """
+    @abstractmethod
+    def start(self, client: TransportClient) -> None:
+        """Connect and start delivering messages to `client`; no-op if already started"""
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Disconnect; no-op if not started"""
+
+    def wake(self) -> None:
+        pass
+
+    def poll(self) -> None:
+        pass
+
+
+def make_transport() -> Transport:
+    """Transport selected by GameSettings.ONLINE_TRANSPORT"""
+    if GameSettings.ONLINE_TRANSPORT == "loopback":
+        # The server modules are only imported for in-process sessions
+        from .loopback_transport import LoopbackTransport
+        return LoopbackTransport()
+    # asyncio and websockets are only imported once online play starts
+    from .websocket_transport import WebSocketTransport
+    return WebSocketTransport(GameSettings.ONLINE_SERVER_URL)
@@ -1,26 +1,142 @@
+from __future__ import annotations
 import pygame as pg
-from src.utils import load_img, load_font, load_sound
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+from src.utils import load_img, load_font, load_sound, load_tmx, Logger, GameSettings
+from src.utils.bundle import ImageBundle, open_bundle, BUNDLE_PATH
+
+if TYPE_CHECKING:
+    from pytmx import TiledMap
+
+# (sheet path, row names, keyframes per row, frame size)
+AnimationKey = tuple[str, tuple[str, ...], int, tuple[int, int]]
+# Scaled copies kept by get_image(path, size); least recently used go first
+SCALED_CACHE_SIZE = 256
 
 class ResourceManager:
     """
     Make sure you are not loading the resource twice
     If the resource is already loaded, you can use the loaded image instead of loading it again.
     """
-    def __init__(self) -> None:
+    # Baked images (see src/utils/bundle.py); False until first looked for
+    _bundle: ImageBundle | None | bool
+
+    def __init__(self, bundle_path: str = str(BUNDLE_PATH)) -> None:
+        self.bundle_path = bundle_path
+        self._bundle = False
         self._images: dict[str, pg.Surface] = {}
         self._sounds: dict[str, pg.mixer.Sound] = {}
+        self._maps: dict[str, TiledMap] = {}
         self._fonts: dict[tuple[str, int], pg.font.Font] = {}
+        self._scaled: OrderedDict[tuple[str, tuple[int, int]], pg.Surface] = OrderedDict()
+        self._animation_frames: dict[AnimationKey, dict[str, tuple[pg.Surface, ...]]] = {}
+        self._overlays: dict[tuple[tuple[int, int], tuple[int, int, int, int]], pg.Surface] = {}
 
-    def get_image(self, path: str) -> pg.Surface:
+    def get_image(self, path: str, size: tuple[int, int] | None = None) -> pg.Surface:
+        """
+        The image at `path`, or a copy scaled to `size`. Scaled copies are
+        cached (up to SCALED_CACHE_SIZE) and shared, so don't draw onto them.
+        """
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+        bundle = self.bundle
+        if bundle is not None:
+            img = bundle.get(path, size)
+            if img is not None:
+                return img
         if path not in self._images:
             self._images[path] = load_img(path)
-        return self._images[path]
+        if size is None:
+            return self._images[path]
+
+        key = (path, size)
+        img = self._scaled.get(key)
+        if img is not None:
+            self._scaled.move_to_end(key)
+            return img
+        if bundle is not None:
+            Logger.info(f"{path} at {size[0]}x{size[1]} is not in the image bundle; add it to assets/bundle_sizes.json")
+        img = self._images[path]
+        if img.get_size() != key[1]:
+            img = pg.transform.scale(img, key[1])
+        self._scaled[key] = img
+        if len(self._scaled) > SCALED_CACHE_SIZE:
+            self._scaled.popitem(last=False)
+        return img
+
+    @property
+    def bundle(self) -> ImageBundle | None:
+        """The image bundle, opened on first use; None when there is none"""
+        if self._bundle is False:
+            self._bundle = open_bundle(self.bundle_path)
+            if self._bundle is not None and GameSettings.DEBUG and self._bundle.is_stale():
+                Logger.warning("Images changed since the image bundle was built; run python -m src.utils.bundle")
+        return self._bundle
+
+    def get_animation_frames(
+        self, path: str, rows: tuple[str, ...], n_keyframes: int, size: tuple[int, int]
+    ) -> dict[str, tuple[pg.Surface, ...]]:
+        """
+        Sprite sheet sliced into `rows` x `n_keyframes` frames, each scaled to `size`.
+        Shared by every Animation using the same sheet, so treat it as read-only.
+        """
+        key = (path, rows, n_keyframes, size)
+        frames = self._animation_frames.get(key)
+        if frames is None:
+            frames = self._animation_frames[key] = self._slice_sheet(*key)
+        return frames
+
+    def _slice_sheet(
+        self, path: str, rows: tuple[str, ...], n_keyframes: int, size: tuple[int, int]
+    ) -> dict[str, tuple[pg.Surface, ...]]:
+        if len(rows) <= 0 or n_keyframes <= 0:
+            Logger.error("Invalid number of rows")
+        sheet = self.get_image(path)
+        sheet_w, sheet_h = sheet.get_size()
+        frame_w = sheet_w // n_keyframes
+        frame_h = sheet_h // len(rows)
+
+        frames: dict[str, tuple[pg.Surface, ...]] = {}
+        for r, name in enumerate(rows):
+            frames[name] = tuple(
+                pg.transform.smoothscale(sheet.subsurface(pg.Rect(c * frame_w, r * frame_h, frame_w, frame_h)), size)
+                for c in range(n_keyframes)
+            )
+        return frames
+
+    def get_overlay(self, size: tuple[int, int], rgba: tuple[int, int, int, int]) -> pg.Surface:
+        """
+        Translucent surface of one colour, e.g. the dim layer behind a menu.
+        Cached per size and colour instead of allocated every frame; don't draw onto it.
+        """
+        key = ((int(size[0]), int(size[1])), tuple(rgba))
+        overlay = self._overlays.get(key)
+        if overlay is None:
+            overlay = self._overlays[key] = pg.Surface(key[0], pg.SRCALPHA)
+            overlay.fill(key[1])
+        return overlay
 
     def get_sound(self, path: str) -> pg.mixer.Sound:
         if path not in self._sounds:
             self._sounds[path] = load_sound(path)
         return self._sounds[path]
 
+    def get_tmx(self, path: str) -> TiledMap:
+        """Parsed map with its tiles; shared by every Map built from `path`"""
+        if path not in self._maps:
+            self._maps[path] = load_tmx(path)
+        return self._maps[path]
+
+    def has(self, kind: str, path: str) -> bool:
+        """Whether an "image", "sound" or "map" is already cached"""
+        if kind == "image" and self.bundle is not None and path in self.bundle:
+            return True
+        return path in {"image": self._images, "sound": self._sounds, "map": self._maps}[kind]
+
+    def put(self, kind: str, path: str, asset: pg.Surface | pg.mixer.Sound | TiledMap) -> None:
+        """Cache an asset loaded elsewhere (see AssetLoader); images must be display-converted"""
+        {"image": self._images, "sound": self._sounds, "map": self._maps}[kind][path] = asset
+
     def get_font(self, path: str, size: int) -> pg.font.Font:
         key = (path, size)
         if key not in self._fonts:
@@ -29,6 +145,11 @@ class ResourceManager:
 
     def clear(self) -> None:
         """Clear all cached assets (useful when switching levels)."""
+        self._bundle = False    # Pages are mapped and converted again on next use
         self._images.clear()
         self._sounds.clear()
+        self._maps.clear()
         self._fonts.clear()
+        self._scaled.clear()
+        self._animation_frames.clear()
+        self._overlays.clear()
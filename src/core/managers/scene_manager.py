@@ -1,23 +1,73 @@
+import time
 import pygame as pg
+from typing import Callable
 
 from src.scenes.scene import Scene
 from src.utils import Logger
 
+SceneFactory = Callable[[], Scene]
+
 class SceneManager:
     
     _scenes: dict[str, Scene]
+    _factories: dict[str, SceneFactory]
+    _warm_up: list[str]
     _current_scene: Scene | None = None
+    _current_name: str | None = None
     _next_scene: str | None = None
     
     def __init__(self):
         Logger.info("Initializing SceneManager")
         self._scenes = {}
-        
-    def register_scene(self, name: str, scene: Scene) -> None:
-        self._scenes[name] = scene
+        self._factories = {}
+        self._warm_up = []
+
+    @property
+    def current_scene(self) -> Scene | None:
+        return self._current_scene
+
+    @property
+    def current_name(self) -> str | None:
+        return self._current_name
+
+    def register_scene(self, name: str, scene: Scene | SceneFactory) -> None:
+        """
+        Register a scene instance, or a factory (e.g. the Scene class) that
+        builds it on the first `change_scene` to it.
+        """
+        if isinstance(scene, Scene):
+            self._scenes[name] = scene
+            self._factories.pop(name, None)
+        else:
+            self._factories[name] = scene
+            self._scenes.pop(name, None)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._scenes
+
+    def warm_up(self, *names: str) -> None:
+        """
+        Build these scenes ahead of time, one per frame after the current
+        scene's update. A build runs on the game thread, so the frame it
+        happens on takes as long as the scene's constructor.
+        """
+        for name in names:
+            if name not in self._factories:
+                raise ValueError(f"Scene '{name}' has no factory")
+            if name not in self._warm_up:
+                self._warm_up.append(name)
+
+    def unload_scene(self, name: str) -> None:
+        """Drop a factory-built scene; it is built again on the next change to it"""
+        if name not in self._factories:
+            raise ValueError(f"Scene '{name}' has no factory")
+        if name in (self._current_name, self._next_scene):
+            raise ValueError(f"Scene '{name}' is in use")
+        if self._scenes.pop(name, None) is not None:
+            Logger.info(f"Unloaded {name} scene")
         
     def change_scene(self, scene_name: str) -> None:
-        if scene_name in self._scenes:
+        if scene_name in self._scenes or scene_name in self._factories:
             Logger.info(f"Changing scene to '{scene_name}'")
             self._next_scene = scene_name
         else:
@@ -25,16 +75,37 @@ class SceneManager:
             
     def update(self, dt: float) -> None:
         # Handle scene transition
-        if self._next_scene is not None:
+        switched = self._next_scene is not None
+        if switched:
             self._perform_scene_switch()
             
         # Update current scene
         if self._current_scene:
             self._current_scene.update(dt)
+
+        # Idle warm-up, skipped on frames that switch (or are about to switch) scenes
+        if not switched and self._next_scene is None:
+            self._warm_up_next()
             
     def draw(self, screen: pg.Surface) -> None:
         if self._current_scene:
             self._current_scene.draw(screen)
+
+    def _warm_up_next(self) -> None:
+        while self._warm_up:
+            name = self._warm_up.pop(0)
+            if name in self._factories and name not in self._scenes:
+                start = time.perf_counter()
+                self._build(name)
+                Logger.info(f"Warmed up {name} scene in {(time.perf_counter() - start) * 1000:.0f} ms")
+                return
+
+    def _build(self, name: str) -> Scene:
+        scene = self._scenes.get(name)
+        if scene is None:
+            Logger.info(f"Building {name} scene")
+            scene = self._scenes[name] = self._factories[name]()
+        return scene
             
     def _perform_scene_switch(self) -> None:
         if self._next_scene is None:
@@ -44,7 +115,8 @@ class SceneManager:
         if self._current_scene:
             self._current_scene.exit()
         
-        self._current_scene = self._scenes[self._next_scene]
+        self._current_scene = self._build(self._next_scene)
+        self._current_name = self._next_scene
         
         # Enter new scene
         if self._current_scene:
@@ -53,4 +125,3 @@ class SceneManager:
             
         # Clear the transition request
         self._next_scene = None
-        
\ No newline at end of file
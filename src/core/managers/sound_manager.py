@@ -1,21 +1,77 @@
 import pygame as pg
-from src.utils import load_sound, GameSettings
+from src.utils import load_music, GameSettings, Logger
+from .resource_manager import ResourceManager
+
+# BGM is streamed through pg.mixer.music, which has a single stream: switching
+# tracks fades the old one out, then fades the new one in
+BGM_FADE_OUT_TIME = 0.4
+BGM_FADE_IN_TIME = 0.6
+
+# Sound effect categories; when every channel is busy a new effect takes over
+# the oldest voice of the lowest priority, if that is not above its own
+SFX_PRIORITY = {"ui": 0, "world": 1, "battle": 2, "jingle": 3}
 
 class SoundManager:
-    def __init__(self):
+    # Path of the track playing (or about to play after the fade-out)
+    current_bgm: str | None
+    # Seconds left of the fade-out before `current_bgm` starts; None when not fading
+    _fade_left: float | None
+    # Channel pool; per channel the priority and start frame of its voice
+    _channels: list[pg.mixer.Channel]
+    _voice_priority: list[int]
+    _voice_frame: list[int]
+    # Effects started this frame, each plays at most once per frame
+    _played_this_frame: set[str]
+
+    def __init__(self, resources: ResourceManager | None = None):
         pg.mixer.init()
+        # Decoded effects come from the shared asset cache, which the loading
+        # scene fills with the sounds listed in the scene manifests
+        self._resources = resources or ResourceManager()
         pg.mixer.set_num_channels(GameSettings.MAX_CHANNELS)
         self.current_bgm = None
+        self._fade_left = None
+        self._channels = [pg.mixer.Channel(i) for i in range(GameSettings.MAX_CHANNELS)]
+        self._voice_priority = [0] * GameSettings.MAX_CHANNELS
+        self._voice_frame = [0] * GameSettings.MAX_CHANNELS
+        self._frame = 0
+        self._played_this_frame = set()
         #記錄目前的 BGM 音量（0~1）
         self.bgm_volume = GameSettings.AUDIO_VOLUME
-        
+
     def play_bgm(self, filepath: str):
-        if self.current_bgm:
-            self.current_bgm.stop()
-        audio = load_sound(filepath)
-        audio.set_volume(GameSettings.AUDIO_VOLUME)
-        audio.play(-1)
-        self.current_bgm = audio
+        """Switch to `filepath` without blocking; the stream is decoded as it plays"""
+        if filepath == self.current_bgm and (self._fade_left is not None or pg.mixer.music.get_busy()):
+            return
+        self.current_bgm = filepath
+        if pg.mixer.music.get_busy() and self._fade_left is None:
+            self._fade_left = BGM_FADE_OUT_TIME
+        elif self._fade_left is None:
+            self._start_bgm()
+
+    def update(self, dt: float):
+        """Advance a running crossfade and the effect throttle; called once per frame by the Engine"""
+        self._frame += 1
+        self._played_this_frame.clear()
+        if self._fade_left is None:
+            return
+        self._fade_left -= dt
+        if self._fade_left > 0:
+            pg.mixer.music.set_volume(self.bgm_volume * self._fade_left / BGM_FADE_OUT_TIME)
+            return
+        self._fade_left = None
+        pg.mixer.music.stop()
+        self._start_bgm()
+
+    def _start_bgm(self):
+        try:
+            load_music(self.current_bgm)
+        except pg.error as e:
+            Logger.warning(f"Failed to stream music {self.current_bgm}: {e}")
+            self.current_bgm = None
+            return
+        pg.mixer.music.set_volume(self.bgm_volume)
+        pg.mixer.music.play(-1, fade_ms=int(BGM_FADE_IN_TIME * 1000))
 ##[myself]
     def set_bgm_volume(self, volume: float):
         """
@@ -24,23 +80,61 @@ class SoundManager:
         # 先夾在 [0,1] 之間
         volume = max(0.0, min(1.0, volume))
         self.bgm_volume = volume
-        if self.current_bgm is not None:
-            self.current_bgm.set_volume(self.bgm_volume)  
+        if self._fade_left is None:
+            pg.mixer.music.set_volume(self.bgm_volume)
 
 ##
     def pause_all(self):
         pg.mixer.pause()
+        pg.mixer.music.pause()
 
     def resume_all(self):
         pg.mixer.unpause()
-        
+        pg.mixer.music.unpause()
+
+    def play_sfx(self, filepath: str, category: str = "world", volume: float = 0.7) -> pg.mixer.Channel | None:
+        """
+        Play a sound effect on a pooled channel. Returns None when the effect
+        was throttled (already started this frame) or lost to busier voices.
+        """
+        if filepath in self._played_this_frame:
+            return None
+        if not self._resources.has("sound", filepath):
+            # Cached from now on, so only the first play reads the file
+            Logger.warning(f"Sound effect {filepath} is in no scene manifest, loading it now")
+        sound = self._resources.get_sound(filepath)
+
+        priority = SFX_PRIORITY.get(category, 0)
+        index = self._pick_voice(priority)
+        if index < 0:
+            return None
+        channel = self._channels[index]
+        channel.stop()
+        channel.set_volume(volume)
+        channel.play(sound)
+        self._voice_priority[index] = priority
+        self._voice_frame[index] = self._frame
+        self._played_this_frame.add(filepath)
+        return channel
+
+    def _pick_voice(self, priority: int) -> int:
+        """A free channel, else the oldest voice of the lowest priority not above `priority`; -1 if none"""
+        victim = -1
+        for i, channel in enumerate(self._channels):
+            if not channel.get_busy():
+                return i
+            if self._voice_priority[i] > priority:
+                continue
+            if victim < 0 or (self._voice_priority[i], self._voice_frame[i]) < (self._voice_priority[victim], self._voice_frame[victim]):
+                victim = i
+        return victim
+
     def play_sound(self, filepath, volume=0.7):
-        sound = load_sound(filepath)
-        sound.set_volume(volume)
-        sound.play()
+        self.play_sfx(filepath, "world", volume)
 
     def stop_all_sounds(self):
         pg.mixer.stop()
+        pg.mixer.music.stop()
         self.current_bgm = None
-    
-    
\ No newline at end of file
+        self._fade_left = None
+
@@ -0,0 +1,71 @@
+import pygame as pg
+from collections import OrderedDict
+
+# Rendered text surfaces kept; least recently used go first
+TEXT_CACHE_SIZE = 512
+WRAP_CACHE_SIZE = 64
+
+Color = tuple[int, ...]
+
+
+class TextManager:
+    """
+    Rendering text is one of the most expensive calls a scene makes, and most
+    labels never change. Fonts are resolved once and rendered surfaces are
+    cached by (font, text, colour, antialias), so drawing the same label
+    every frame costs a dict lookup.
+
+    Cached surfaces are shared: blit them, don't draw onto them.
+    """
+    def __init__(self) -> None:
+        self._fonts: dict[tuple[str | None, int, bool, bool], pg.font.Font] = {}
+        self._surfaces: OrderedDict[tuple[pg.font.Font, str, Color, bool], pg.Surface] = OrderedDict()
+        self._wraps: OrderedDict[tuple[str, int], tuple[str, ...]] = OrderedDict()
+
+    def get_font(self, name: str | None, size: int, bold: bool = False, italic: bool = False) -> pg.font.Font:
+        """pg.font.SysFont, looked up once per (name, size, bold, italic)"""
+        key = (name, size, bold, italic)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = pg.font.SysFont(name, size, bold=bold, italic=italic)
+        return font
+
+    def render(self, font: pg.font.Font, text: str, color: Color, antialias: bool = True) -> pg.Surface:
+        """font.render(text, antialias, color), cached"""
+        key = (font, text, tuple(color), antialias)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            return surf
+        surf = self._surfaces[key] = font.render(text, antialias, color)
+        if len(self._surfaces) > TEXT_CACHE_SIZE:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def wrap(self, text: str, max_chars: int) -> tuple[str, ...]:
+        """Split `text` at spaces into lines shorter than `max_chars` characters, cached"""
+        key = (text, max_chars)
+        lines = self._wraps.get(key)
+        if lines is not None:
+            self._wraps.move_to_end(key)
+            return lines
+
+        wrapped: list[str] = []
+        current_line = ""
+        for word in text.split(' '):
+            if len(current_line + word) < max_chars:
+                current_line += word + " "
+            else:
+                wrapped.append(current_line)
+                current_line = word + " "
+        wrapped.append(current_line)
+
+        lines = self._wraps[key] = tuple(wrapped)
+        if len(self._wraps) > WRAP_CACHE_SIZE:
+            self._wraps.popitem(last=False)
+        return lines
+
+    def clear(self) -> None:
+        """Drop rendered text (fonts stay resolved)"""
+        self._surfaces.clear()
+        self._wraps.clear()
@@ -0,0 +1,206 @@
+import asyncio
+import json
+import threading
+import zlib
+from typing import Any, Optional
+from urllib.parse import urlencode
+from src.utils import Logger
+from .online_transport import Transport, TransportClient
+from server.protocol import decode_frame
+
+try:
+    import websockets
+except ImportError:
+    Logger.error("websockets library not installed. Run: pip install websockets")
+    websockets = None
+
+
+class WebSocketTransport(Transport):
+    """Talks to server.py from a background thread running its own event loop."""
+    _ws: Optional[Any]
+    _ws_loop: Optional[asyncio.AbstractEventLoop]
+    _ws_thread: Optional[threading.Thread]
+    _stop_event: threading.Event
+    # Set (via call_soon_threadsafe) whenever the game thread queues something to send
+    _send_event: Optional[asyncio.Event]
+    _client: TransportClient | None
+
+    def __init__(self, url: str) -> None:
+        if websockets is None:
+            Logger.error("WebSockets library not available")
+            raise ImportError("websockets library required")
+
+        # Convert HTTP URL to WebSocket URL
+        if url.startswith("http://"):
+            self.ws_url = url.replace("http://", "ws://")
+        elif url.startswith("https://"):
+            self.ws_url = url.replace("https://", "wss://")
+        else:
+            self.ws_url = f"ws://{url}"
+
+        self._ws = None
+        self._ws_loop = None
+        self._ws_thread = None
+        self._stop_event = threading.Event()
+        self._send_event = None
+        self._client = None
+
+    def start(self, client: TransportClient) -> None:
+        if self._ws_thread and self._ws_thread.is_alive():
+            return
+
+        self._client = client
+        self._stop_event.clear()
+
+        self._ws_thread = threading.Thread(
+            target=self._ws_thread_func,
+            name="OnlineManagerWebSocket",
+            daemon=True
+        )
+        self._ws_thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._ws_loop and self._ws_loop.is_running():
+            # Schedule stop in the event loop
+            asyncio.run_coroutine_threadsafe(self._close_ws(), self._ws_loop)
+        if self._ws_thread and self._ws_thread.is_alive():
+            self._ws_thread.join(timeout=3)
+
+    def wake(self) -> None:
+        """Wake the sender from the game thread; a no-op while disconnected"""
+        loop, event = self._ws_loop, self._send_event
+        if loop is None or event is None:
+            return
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            pass  # Loop is shutting down
+
+    def _ws_thread_func(self) -> None:
+        """Run WebSocket event loop in a separate thread"""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._send_event = asyncio.Event()
+        self._ws_loop = loop
+        try:
+            loop.run_until_complete(self._ws_main())
+        except Exception as e:
+            Logger.error(f"WebSocket thread error: {e}")
+        finally:
+            self._ws_loop = None
+            self._send_event = None
+            loop.close()
+
+    async def _close_ws(self) -> None:
+        """Close WebSocket connection"""
+        if self._ws:
+            try:
+                await self._ws.close()
+            except Exception:
+                pass
+            self._ws = None
+
+    async def _ws_main(self) -> None:
+        """Main WebSocket connection and message handling"""
+        reconnect_delay = 1.0
+        max_reconnect_delay = 30.0
+        # Any connection after the first one of this start() follows a drop
+        connected_before = False
+
+        while not self._stop_event.is_set():
+            try:
+                # Connect to WebSocket server
+                async with websockets.connect(
+                    self._connect_url(),
+                    ping_interval=20,
+                    ping_timeout=10,
+                    compression=None  # The server compresses large messages itself
+                ) as websocket:
+                    self._ws = websocket
+                    if connected_before:
+                        self._client.net_stats.reconnects += 1
+                    connected_before = True
+                    Logger.info("WebSocket connected")
+                    reconnect_delay = 1.0  # Reset delay on successful connection
+
+                    # Start sender task
+                    sender_task = asyncio.create_task(self._ws_sender(websocket))
+
+                    # Handle incoming messages
+                    try:
+                        async for message in websocket:
+                            if self._stop_event.is_set():
+                                break
+                            self._handle_message(message)
+                    except websockets.exceptions.ConnectionClosed:
+                        Logger.warning("WebSocket connection closed")
+                    finally:
+                        sender_task.cancel()
+                        try:
+                            await sender_task
+                        except asyncio.CancelledError:
+                            pass
+
+            except Exception as e:
+                Logger.warning(f"WebSocket connection error: {e}, reconnecting in {reconnect_delay}s")
+                await asyncio.sleep(reconnect_delay)
+                reconnect_delay = min(reconnect_delay * 2, max_reconnect_delay)
+            finally:
+                self._ws = None
+                if not self._stop_event.is_set():
+                    await asyncio.sleep(0.5)
+
+    def _connect_url(self) -> str:
+        """Server URL, with the resume token and last seen state once we have been registered"""
+        resume = self._client.resume_params()
+        if not resume:
+            return self.ws_url
+        query = urlencode({
+            "resume": resume["token"],
+            "chat": resume["chat"],
+        })
+        sep = "&" if "?" in self.ws_url else "?"
+        return f"{self.ws_url}{sep}{query}"
+
+    def _handle_message(self, message: str | bytes) -> None:
+        """Handle incoming WebSocket message (binary frames are compressed JSON)"""
+        self._client.net_stats.record_in(len(message))
+        try:
+            data = decode_frame(message)
+        except (ValueError, zlib.error) as e:
+            Logger.warning(f"Failed to parse WebSocket message: {e}")
+            return
+        self._client.on_message(data)
+
+    async def _ws_sender(self, websocket: Any) -> None:
+        """Send queued messages to server via WebSocket, waking only when something was queued"""
+        wake = self._send_event
+        loop = asyncio.get_running_loop()
+        flush_timer: asyncio.TimerHandle | None = None
+        wake.set()  # Flush anything queued while we were disconnected
+
+        try:
+            while not self._stop_event.is_set():
+                await wake.wait()
+                wake.clear()
+                try:
+                    messages, delay = self._client.next_outbound()
+                    for message in messages:
+                        payload = json.dumps(message)
+                        await websocket.send(payload)
+                        self._client.net_stats.record_out(len(payload))
+                    if delay > 0:
+                        # Come back when a rate-limited position update may go (by then
+                        # more updates may have coalesced) or the next ping is due
+                        now, due = loop.time(), loop.time() + delay
+                        if flush_timer is None or flush_timer.when() <= now or due < flush_timer.when():
+                            if flush_timer is not None:
+                                flush_timer.cancel()
+                            flush_timer = loop.call_later(delay, wake.set)
+                except Exception as e:
+                    Logger.warning(f"WebSocket send error: {e}")
+                    await asyncio.sleep(0.1)
+        finally:
+            if flush_timer is not None:
+                flush_timer.cancel()
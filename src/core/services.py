@@ -1,6 +1,8 @@
-from .managers import InputManager, ResourceManager, SceneManager, SoundManager
+from .managers import InputManager, ResourceManager, SceneManager, SoundManager, TextManager, AssetLoader
 
 input_manager = InputManager()
 resource_manager = ResourceManager()
+text_manager = TextManager()
+asset_loader = AssetLoader(resource_manager)
 scene_manager = SceneManager()
-sound_manager = SoundManager()
+sound_manager = SoundManager(resource_manager)
@@ -6,7 +6,7 @@ from dataclasses import dataclass, field
 from typing import override
 
 from .entity import Entity
-from src.sprites import Sprite, Animation
+from src.sprites import Sprite
 from src.core import GameManager
 from src.core.services import input_manager, scene_manager
 from src.utils import GameSettings, Direction, Position, PositionCamera
@@ -77,10 +77,9 @@ class EnemyTrainer(Entity):
         max_tiles: int | None = 2,
         sprite_path: str = "character/ow1.png",
     ) -> None:
-        super().__init__(x * GameSettings.TILE_SIZE, y * GameSettings.TILE_SIZE, game_manager)
+        super().__init__(x * GameSettings.TILE_SIZE, y * GameSettings.TILE_SIZE, game_manager, sprite_path)
         
         self.sprite_path = sprite_path
-        self.animation = Animation(sprite_path, ["down", "left", "right", "up"], 4, (GameSettings.TILE_SIZE, GameSettings.TILE_SIZE))
         
         self.classification = classification
         self.facing = facing
@@ -12,10 +12,10 @@ class Entity:
     position: Position
     game_manager: GameManager
     
-    def __init__(self, x: float, y: float, game_manager: GameManager) -> None:
+    def __init__(self, x: float, y: float, game_manager: GameManager, sprite_path: str = "character/ow1.png") -> None:
         # Sprite is only for debug, need to change into animations
         self.animation = Animation(
-            "character/ow1.png", ["down", "left", "right", "up"], 4,
+            sprite_path, ["down", "left", "right", "up"], 4,
             (GameSettings.TILE_SIZE, GameSettings.TILE_SIZE)
         )
         
@@ -2,7 +2,7 @@ from __future__ import annotations
 import pygame as pg
 from typing import Optional, Callable, List, Dict
 from .component import UIComponent
-from src.core.services import input_manager
+from src.core.services import input_manager, text_manager, resource_manager
 from src.utils import Logger
 from src.interface.components.button import Button
 from src.utils import GameSettings
@@ -52,8 +52,8 @@ class ChatOverlay(UIComponent):
             self._font_input = pg.font.Font(font_path, 20)
         except Exception:
             Logger.warning(f"Failed to load font {font_path}, using default system font.")
-            self._font_msg = pg.font.SysFont("Arial", 20)
-            self._font_input = pg.font.SysFont("Arial", 20)
+            self._font_msg = text_manager.get_font("Arial", 20)
+            self._font_input = text_manager.get_font("Arial", 20)
 
     def open(self) -> None:
         if not self.is_open:
@@ -154,10 +154,7 @@ class ChatOverlay(UIComponent):
         # --- 繪圖開始 ---
 
         # A. 畫訊息區背景
-        s = pg.Surface((msg_w, msg_h))
-        s.set_alpha(150)
-        s.fill((0, 0, 0))
-        screen.blit(s, (msg_x, msg_y))
+        screen.blit(resource_manager.get_overlay((msg_w, msg_h), (0, 0, 0, 150)), (msg_x, msg_y))
         
         # B. 畫歷史訊息
         if self._get_messages:
@@ -170,7 +167,7 @@ class ChatOverlay(UIComponent):
                 text_content = f"{msg.get('from', '?')}: {msg.get('text', '')}"
                 
                 # [Fix 1] 使用 self._font_msg 而不是 self.font
-                txt_surf = self._font_msg.render(text_content, True, (255, 255, 255))
+                txt_surf = text_manager.render(self._font_msg, text_content, (255, 255, 255))
                 screen.blit(txt_surf, (msg_x + 10, line_y))
 
         # C. 畫輸入框
@@ -181,7 +178,7 @@ class ChatOverlay(UIComponent):
         # [Fix 2] 使用 self._input_text 而不是 self.chat_input
         # [Fix 3] 使用 self._font_input 而不是 self.font
         display_text = self._input_text + ("|" if self._cursor_visible else "")
-        input_surf = self._font_input.render(display_text, True, (255, 255, 255))
+        input_surf = text_manager.render(self._font_input, display_text, (255, 255, 255))
         
         # 讓文字垂直置中
         text_y = input_y + (input_h - input_surf.get_height()) // 2
@@ -1,9 +1,14 @@
+from __future__ import annotations
 import pygame as pg
-import pytmx
 import heapq  # [New] A* 需要用到 Priority Queue
 import math   # [New] 計算距離
+from typing import TYPE_CHECKING, Iterator
 
-from src.utils import load_tmx, Position, GameSettings, PositionCamera, Teleport
+from src.utils import Position, GameSettings, PositionCamera, Teleport
+from src.core.services import resource_manager
+
+if TYPE_CHECKING:
+    import pytmx
 
 class Map:
     path_name: str
@@ -15,15 +20,19 @@ class Map:
 
     def __init__(self, path: str, tp: list[Teleport], spawn: Position):
         self.path_name = path
-        self.tmxdata = load_tmx(path)
+        self.tmxdata = resource_manager.get_tmx(path)
         self.spawn = spawn
         self.teleporters = tp
 
         pixel_w = self.tmxdata.width * GameSettings.TILE_SIZE
         pixel_h = self.tmxdata.height * GameSettings.TILE_SIZE
 
-        self._surface = pg.Surface((pixel_w, pixel_h), pg.SRCALPHA)
-        self._render_all_layers(self._surface)
+        # Maps whose ground leaves no hole need no alpha channel, which makes
+        # the full-screen blit in draw several times cheaper
+        scaled = self._scale_tiles()
+        flags = 0 if self._is_opaque(scaled) else pg.SRCALPHA
+        self._surface = pg.Surface((pixel_w, pixel_h), flags)
+        self._render_all_layers(self._surface, scaled)
         
         self._collision_map = self._create_collision_map()
         self._bush_rects = self._create_bush_rects()
@@ -141,23 +150,48 @@ class Map:
                 return tp
         return None
 
-    def _render_all_layers(self, target: pg.Surface) -> None:
+    def _scale_tiles(self) -> dict[int, pg.Surface | None]:
+        """Every tile image used, scaled to TILE_SIZE once, however often it is placed"""
+        scaled: dict[int, pg.Surface | None] = {}
+        for layer in self._tile_layers():
+            for _, _, gid in layer:
+                if gid != 0 and gid not in scaled:
+                    img = self.tmxdata.get_tile_image_by_gid(gid)
+                    scaled[gid] = pg.transform.scale(img, (GameSettings.TILE_SIZE, GameSettings.TILE_SIZE)) if img else None
+        return scaled
+
+    def _is_opaque(self, scaled: dict[int, pg.Surface | None]) -> bool:
+        """Whether every cell gets an opaque tile (pytmx converts fully opaque tiles without alpha or colour key)"""
+        opaque = {
+            gid for gid, img in scaled.items()
+            if img is not None and not img.get_flags() & pg.SRCALPHA and img.get_colorkey() is None
+        }
+        covered: set[tuple[int, int]] = set()
+        for layer in self._tile_layers():
+            covered.update((x, y) for x, y, gid in layer if gid in opaque)
+        return len(covered) == self.tmxdata.width * self.tmxdata.height
+
+    def _render_all_layers(self, target: pg.Surface, scaled: dict[int, pg.Surface | None]) -> None:
+        for layer in self._tile_layers():
+            self._render_tile_layer(target, layer, scaled)
+ 
+    def _tile_layers(self) -> Iterator[pytmx.TiledTileLayer]:
+        import pytmx  # Already loaded with the map; not needed at start-up
         for layer in self.tmxdata.visible_layers:
             if isinstance(layer, pytmx.TiledTileLayer):
-                self._render_tile_layer(target, layer)
- 
-    def _render_tile_layer(self, target: pg.Surface, layer: pytmx.TiledTileLayer) -> None:
+                yield layer
+
+    def _render_tile_layer(self, target: pg.Surface, layer: pytmx.TiledTileLayer, scaled: dict[int, pg.Surface | None]) -> None:
         for x, y, gid in layer:
             if gid == 0: continue
-            img = self.tmxdata.get_tile_image_by_gid(gid)
+            img = scaled[gid]
             if img:
-                img = pg.transform.scale(img, (GameSettings.TILE_SIZE, GameSettings.TILE_SIZE))
                 target.blit(img, (x * GameSettings.TILE_SIZE, y * GameSettings.TILE_SIZE))
 
     def _create_collision_map(self) -> list[pg.Rect]:
         rects = []
-        for layer in self.tmxdata.visible_layers:
-            if isinstance(layer, pytmx.TiledTileLayer) and ("collision" in layer.name.lower() or "house" in layer.name.lower()):
+        for layer in self._tile_layers():
+            if "collision" in layer.name.lower() or "house" in layer.name.lower():
                 for x, y, gid in layer:
                     if gid != 0:
                         rects.append(pg.Rect(x * GameSettings.TILE_SIZE, y * GameSettings.TILE_SIZE, GameSettings.TILE_SIZE, GameSettings.TILE_SIZE))
@@ -170,8 +204,8 @@ class Map:
 
     def _create_bush_rects(self) -> list[pg.Rect]:
         rects: list[pg.Rect] = []
-        for layer in self.tmxdata.visible_layers:
-            if isinstance(layer, pytmx.TiledTileLayer) and ("bush" in layer.name.lower()):
+        for layer in self._tile_layers():
+            if "bush" in layer.name.lower():
                 for x, y, gid in layer:
                     if gid != 0:
                         rects.append(pg.Rect(x * GameSettings.TILE_SIZE, y * GameSettings.TILE_SIZE, GameSettings.TILE_SIZE, GameSettings.TILE_SIZE))
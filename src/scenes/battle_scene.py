@@ -3,10 +3,10 @@ import random
 from typing import override
 
 from src.scenes.scene import Scene
-from src.utils import GameSettings, Logger
+from src.utils import GameSettings, Logger, AssetManifest
 from src.utils.definition import Element, ELEMENT_CHART
 from src.interface.components.button import Button
-from src.core.services import scene_manager, resource_manager, sound_manager
+from src.core.services import scene_manager, resource_manager, sound_manager, text_manager
 from src.core import GameManager
 
 # [New] 野生寶可夢池 (隨機出現用)
@@ -18,16 +18,30 @@ WILD_POOL = [
 ]
 
 class BattleScene(Scene):
+    assets = AssetManifest(
+        images=(
+            "backgrounds/background1.png",
+            "UI/button_back.png", "UI/button_back_hover.png",
+            "UI/button_backpack.png", "UI/button_backpack_hover.png",
+            "UI/button_play.png", "UI/button_play_hover.png",
+            "UI/button_save.png", "UI/button_save_hover.png",
+            "UI/button_setting.png", "UI/button_setting_hover.png",
+            "UI/button_x.png", "UI/button_x_hover.png",
+            "ingame_ui/coin.png",
+            "menu_sprites/menusprite1.png", "menu_sprites/menusprite2.png", "menu_sprites/menusprite3.png",
+            "menu_sprites/menusprite4.png", "menu_sprites/menusprite5.png",
+        ),
+    )
+
     def __init__(self) -> None:
         super().__init__()
-        self.font = pg.font.SysFont(None, 30)
-        self.font_small = pg.font.SysFont(None, 24)
+        self.font = text_manager.get_font(None, 30)
+        self.font_small = text_manager.get_font(None, 24)
         # [New] 復活特效計時器
         self.revive_timer = 0.0
         # [New] 載入背景圖 (如果沒有圖，程式會用 fallback 顏色)
         try:
-            self.bg_img = resource_manager.get_image("backgrounds/background1.png")
-            self.bg_img = pg.transform.scale(self.bg_img, (GameSettings.SCREEN_WIDTH, GameSettings.SCREEN_HEIGHT))
+            self.bg_img = resource_manager.get_image("backgrounds/background1.png", (GameSettings.SCREEN_WIDTH, GameSettings.SCREEN_HEIGHT))
         except:
             self.bg_img = None
 
@@ -450,7 +464,7 @@ class BattleScene(Scene):
         # 訊息框
         pg.draw.rect(screen, (255, 255, 255), (0, GameSettings.SCREEN_HEIGHT-150, GameSettings.SCREEN_WIDTH, 150))
         pg.draw.line(screen, (0,0,0), (0, GameSettings.SCREEN_HEIGHT-150), (GameSettings.SCREEN_WIDTH, GameSettings.SCREEN_HEIGHT-150), 3)
-        msg_surf = self.font.render(self.battle_msg, True, (0, 0, 0))
+        msg_surf = text_manager.render(self.font, self.battle_msg, (0, 0, 0))
         screen.blit(msg_surf, (50, GameSettings.SCREEN_HEIGHT - 100))
 
         if self.state == "PLAYER_TURN":
@@ -459,16 +473,16 @@ class BattleScene(Scene):
             self.btn_switch.draw(screen)
             self.btn_run.draw(screen)
             off_x, off_y = 10, 30
-            screen.blit(self.font_small.render("Attack", True, (0,0,0)), (self.btn_attack.hitbox.x+off_x, self.btn_attack.hitbox.y+off_y))
-            screen.blit(self.font_small.render("Bag", True, (0,0,0)), (self.btn_bag.hitbox.x+off_x+10, self.btn_bag.hitbox.y+off_y))
-            screen.blit(self.font_small.render("Poke", True, (0,0,0)), (self.btn_switch.hitbox.x+off_x+10, self.btn_switch.hitbox.y+off_y))
-            screen.blit(self.font_small.render("Run", True, (0,0,0)), (self.btn_run.hitbox.x+off_x+10, self.btn_run.hitbox.y+off_y))
+            screen.blit(text_manager.render(self.font_small, "Attack", (0,0,0)), (self.btn_attack.hitbox.x+off_x, self.btn_attack.hitbox.y+off_y))
+            screen.blit(text_manager.render(self.font_small, "Bag", (0,0,0)), (self.btn_bag.hitbox.x+off_x+10, self.btn_bag.hitbox.y+off_y))
+            screen.blit(text_manager.render(self.font_small, "Poke", (0,0,0)), (self.btn_switch.hitbox.x+off_x+10, self.btn_switch.hitbox.y+off_y))
+            screen.blit(text_manager.render(self.font_small, "Run", (0,0,0)), (self.btn_run.hitbox.x+off_x+10, self.btn_run.hitbox.y+off_y))
 
         elif self.state == "BAG_MENU":
             menu_bg = pg.Rect(200, GameSettings.SCREEN_HEIGHT - 450, 350, 350)
             pg.draw.rect(screen, (240, 240, 240), menu_bg)
             pg.draw.rect(screen, (0, 0, 0), menu_bg, 2)
-            screen.blit(self.font.render("Select Item", True, (0,0,0)), (menu_bg.x+20, menu_bg.y+20))
+            screen.blit(text_manager.render(self.font, "Select Item", (0,0,0)), (menu_bg.x+20, menu_bg.y+20))
             self.btn_back.hitbox.x = menu_bg.right - 60
             self.btn_back.hitbox.y = menu_bg.top + 10
             self.btn_back.draw(screen)
@@ -482,11 +496,10 @@ class BattleScene(Scene):
                     path = item.get("sprite_path", "")
                     if path:
                         try:
-                            img = resource_manager.get_image(path)
-                            img = pg.transform.scale(img, (40, 40))
+                            img = resource_manager.get_image(path, (40, 40))
                             screen.blit(img, (btn.hitbox.x + 10, btn.hitbox.y + 10))
                         except: pass
-                    txt = self.font_small.render(f"{name} x{count}", True, (0, 0, 0))
+                    txt = text_manager.render(self.font_small, f"{name} x{count}", (0, 0, 0))
                     screen.blit(txt, (btn.hitbox.right + 15, btn.hitbox.centery - 10))
 
         elif self.state == "POKEMON_MENU":
@@ -497,7 +510,7 @@ class BattleScene(Scene):
             pg.draw.rect(screen, (0,0,0), menu_bg, 2)
            
             
-            screen.blit(self.font.render("Switch Pokemon", True, (0,0,0)), (menu_bg.x+20, menu_bg.y+20))
+            screen.blit(text_manager.render(self.font, "Switch Pokemon", (0,0,0)), (menu_bg.x+20, menu_bg.y+20))
             self.btn_back.hitbox.x = menu_bg.right - 60
             self.btn_back.hitbox.y = menu_bg.top + 10
             self.btn_back.draw(screen)
@@ -510,8 +523,7 @@ class BattleScene(Scene):
                     path = mon.get("sprite_path", "")
                     if path:
                         try:
-                            img = resource_manager.get_image(path)
-                            img = pg.transform.scale(img, (40, 40))
+                            img = resource_manager.get_image(path, (40, 40))
                             icon_x = btn.hitbox.centerx - 20
                             icon_y = btn.hitbox.centery - 20
                             screen.blit(img, (icon_x, icon_y))
@@ -526,7 +538,7 @@ class BattleScene(Scene):
                     if elem == "Fire": text_color = (200, 0, 0)
                     elif elem == "Water": text_color = (0, 0, 200)
                     elif elem == "Grass": text_color = (0, 150, 0)
-                    txt = self.font_small.render(info_text, True, text_color)
+                    txt = text_manager.render(self.font_small, info_text, text_color)
                     screen.blit(txt, (btn.hitbox.right + 15, btn.hitbox.centery - 10))
 
         
@@ -534,7 +546,7 @@ class BattleScene(Scene):
         if self.state in ("WIN", "LOSE"):
             self.btn_exit.draw(screen)
             # 補個文字提示
-            txt = self.font.render("Return", True, (0, 0, 0))
+            txt = text_manager.render(self.font, "Return", (0, 0, 0))
             screen.blit(txt, (self.btn_exit.hitbox.centerx - txt.get_width() // 2, self.btn_exit.hitbox.bottom + 10))
 
         # 如果正在復活，畫一個閃光或文字
@@ -543,10 +555,10 @@ class BattleScene(Scene):
             self.revive_timer -= 0.016 # 假設 60fps
             
             # 畫出青色大字
-            font = pg.font.SysFont(None, 80)
-            text = font.render("REVIVED!", True, (0, 255, 255))
+            font = text_manager.get_font(None, 80)
+            text = text_manager.render(font, "REVIVED!", (0, 255, 255))
             # 加上黑色描邊
-            outline = font.render("REVIVED!", True, (0, 0, 0))
+            outline = text_manager.render(font, "REVIVED!", (0, 0, 0))
             
             center_x = screen.get_width() // 2 - text.get_width() // 2
             center_y = screen.get_height() // 2 - text.get_height() // 2
@@ -594,9 +606,8 @@ class BattleScene(Scene):
             offset_y = random.randint(-5, 5)
 
         try:
-            img = resource_manager.get_image(path)
             # [Modified] 這裡改成新的大尺寸
-            img = pg.transform.scale(img, (IMG_SIZE, IMG_SIZE))
+            img = resource_manager.get_image(path, (IMG_SIZE, IMG_SIZE))
             if is_player: img = pg.transform.flip(img, True, False)
             screen.blit(img, (x + offset_x, y + offset_y))
         except:
@@ -625,8 +636,8 @@ class BattleScene(Scene):
         pg.draw.rect(screen, (60, 60, 60), (hud_x, hud_y, hud_w, hud_h), 3, border_radius=10)
 
         # 文字資訊
-        screen.blit(self.font_small.render(f"{name}", True, (0, 0, 0)), (hud_x + 15, hud_y + 10))
-        screen.blit(self.font_small.render(f"Lv.{lvl} ({elem})", True, (80, 80, 80)), (hud_x + 15, hud_y + 35))
+        screen.blit(text_manager.render(self.font_small, f"{name}", (0, 0, 0)), (hud_x + 15, hud_y + 10))
+        screen.blit(text_manager.render(self.font_small, f"Lv.{lvl} ({elem})", (80, 80, 80)), (hud_x + 15, hud_y + 35))
 
         # 4. 血條
         bar_x = hud_x + 15
@@ -645,7 +656,7 @@ class BattleScene(Scene):
         
         # 血量數字
         hp_str = f"{hp}/{max_hp}"
-        hp_surf = self.font_small.render(hp_str, True, (50, 50, 50))
+        hp_surf = text_manager.render(self.font_small, hp_str, (50, 50, 50))
         screen.blit(hp_surf, (bar_x + bar_w - hp_surf.get_width(), bar_y + 20))
 
         # 5. 攻防數值
@@ -653,7 +664,7 @@ class BattleScene(Scene):
         text_color = (100, 100, 100)
         if is_player and (self.buffs["atk"] > 1.0 or self.buffs["def"] > 1.0):
             text_color = (0, 100, 255)
-        screen.blit(self.font_small.render(stats_text, True, text_color), (bar_x, bar_y + 20))
+        screen.blit(text_manager.render(self.font_small, stats_text, text_color), (bar_x, bar_y + 20))
 
         # 6. 經驗條 (僅玩家)
         if is_player:
@@ -4,9 +4,9 @@ import pygame as pg
 from typing import override
 
 from src.scenes.scene import Scene
-from src.utils import GameSettings
+from src.utils import GameSettings, AssetManifest
 from src.interface.components.button import Button
-from src.core.services import scene_manager
+from src.core.services import scene_manager, text_manager
 from src.core import GameManager   # 用來 load / save
 
 
@@ -17,6 +17,13 @@ class CatchScene(Scene):
       - 有 Catch / Run 兩個按鈕
       - 抓到就加到 bag.monsters，然後存檔，再按 SPACE 回到 game
     """
+    assets = AssetManifest(
+        images=(
+            "UI/button_play.png", "UI/button_play_hover.png",
+            "UI/button_x.png", "UI/button_x_hover.png",
+            "menu_sprites/menusprite1.png",
+        ),
+    )
 
     def __init__(self) -> None:
         super().__init__()
@@ -35,7 +42,7 @@ class CatchScene(Scene):
         self.caught: bool = False   # 有沒有抓到
         self.state: str = "CHOICE"  # CHOICE / CAUGHT / RUN
 
-        self.font = pg.font.SysFont(None, 30)
+        self.font = text_manager.get_font(None, 30)
 
         # Catch 按鈕
         self.btn_catch = Button(
@@ -123,7 +130,7 @@ class CatchScene(Scene):
         else:  # RUN
             msg = "You ran away... Press SPACE to go back."
 
-        text = self.font.render(msg, True, (0, 0, 0))
+        text = text_manager.render(self.font, msg, (0, 0, 0))
         screen.blit(text, (80, 40))
 
         # 只有在選擇階段顯示按鈕
@@ -137,5 +144,5 @@ class CatchScene(Scene):
         maxhp = int(mon.get("max_hp", 0))
         level = int(mon.get("level", 1))
 
-        screen.blit(self.font.render(f"{name} Lv.{level}", True, (0, 0, 0)), (x, y))
-        screen.blit(self.font.render(f"HP: {hp}/{maxhp}", True, (0, 0, 0)), (x, y + 30))
+        screen.blit(text_manager.render(self.font, f"{name} Lv.{level}", (0, 0, 0)), (x, y))
+        screen.blit(text_manager.render(self.font, f"HP: {hp}/{maxhp}", (0, 0, 0)), (x, y + 30))
@@ -2,20 +2,24 @@ import pygame as pg
 import threading
 import time
 import math
-import requests 
 
 from src.scenes.scene import Scene
 from src.core import GameManager, OnlineManager
-from src.utils import Logger, PositionCamera, GameSettings, Position
+from src.utils import Logger, PositionCamera, GameSettings, Position, AssetManifest
 from src.sprites import Sprite, Animation
 from typing import override
 
 ##[myself]
 from src.interface.components.button import Button
-from src.core.services import sound_manager, input_manager, scene_manager, resource_manager
+from src.core.services import sound_manager, input_manager, scene_manager, resource_manager, text_manager
 from src.interface.components.chat_overlay import ChatOverlay
 
 
+def _format_ms(value: float | None) -> str:
+    """Milliseconds for the F3 overlay, "-" before the first sample"""
+    return "-" if value is None else f"{value} ms"
+
+
 class VolumeSlider:
     def __init__(self, x: int, y: int, width: int,
                  min_value: float, max_value: float, value: float,
@@ -29,7 +33,7 @@ class VolumeSlider:
         self.on_change = on_change
 
         self.rect = pg.Rect(x, y - 8, width, 16)
-        self.font = pg.font.SysFont(None, 20)
+        self.font = text_manager.get_font(None, 20)
 
     def _value_to_x(self) -> int:
         t = (self.value - self.min_value) / (self.max_value - self.min_value)
@@ -57,11 +61,29 @@ class VolumeSlider:
         knob_rect.center = (knob_x, center_y)
         pg.draw.rect(screen, (255, 255, 255), knob_rect)
         # 顯示數值
-        txt = self.font.render(f"Volume: {int(self.value)}", True, (0, 0, 0))
+        txt = text_manager.render(self.font, f"Volume: {int(self.value)}", (0, 0, 0))
         screen.blit(txt, (self.x, center_y - 30))
 ##
 
 class GameScene(Scene):
+    # Maps and trainers come from saves/game0.json
+    assets = AssetManifest(
+        images=(
+            "character/ow1.png", "character/ow2.png", "character/ow3.png",
+            "character/ow4.png", "character/ow6.png", "character/ow10.png",
+            "exclamation.png",
+            "UI/button_back.png", "UI/button_back_hover.png",
+            "UI/button_backpack.png", "UI/button_backpack_hover.png",
+            "UI/button_load.png", "UI/button_load_hover.png",
+            "UI/button_play.png", "UI/button_play_hover.png",
+            "UI/button_save.png", "UI/button_save_hover.png",
+            "UI/button_setting.png", "UI/button_setting_hover.png",
+            "UI/button_shop.png", "UI/button_shop_hover.png",
+            "UI/button_x.png", "UI/button_x_hover.png",
+            "ingame_ui/ball.png", "ingame_ui/potion.png", "ingame_ui/coin.png",
+        ),
+        maps=("map.tmx", "gym.tmx", "secret_garden.tmx", "shop.tmx"),
+    )
     game_manager: GameManager
     online_manager: OnlineManager | None
     sprite_online: Sprite
@@ -98,8 +120,8 @@ class GameScene(Scene):
         self.particles = []
         super().__init__()
         # 顯示背包內容用的字型
-        self.font_small = pg.font.SysFont(None, 20)
-        self.font_quest = pg.font.SysFont(None, 30)
+        self.font_small = text_manager.get_font(None, 20)
+        self.font_quest = text_manager.get_font(None, 30)
         # [New] 畫面提示系統 (Notification)
         self.notif_text = ""
         self.notif_timer = 0.0
@@ -350,7 +372,7 @@ class GameScene(Scene):
         )
 
         # 設定 overlay 標題用字型（如果你之前沒有）
-        self.font_small = pg.font.SysFont(None, 24)
+        self.font_small = text_manager.get_font(None, 24)
 
     # [Modified] 聊天系統初始化 (WebSocket 版本)
         # 移除 import requests
@@ -374,6 +396,8 @@ class GameScene(Scene):
         )
         
         self.online_player_states = {}
+        self.online_players_version = -1  # PlayersSnapshot version the two dicts above were pruned for
+        self.show_net_stats = False  # F3 network debug overlay
      # [New] 定義關閉時的動作：清除歷史紀錄
         def on_close_chat():
             self.chat_history = [] # 清空列表
@@ -673,6 +697,12 @@ class GameScene(Scene):
 ##
     @override
     def update(self, dt: float):
+        # Rebuild the interpolated remote players once; draw/minimap/PvP read it without copying
+        if self.online_manager:
+            self.online_manager.advance()
+            if input_manager.key_down(pg.K_F3):
+                self.show_net_stats = not self.show_net_stats
+
         # [Fix] 從 OnlineManager 讀取新訊息 (使用正確的方法名 get_recent_chat)
         if self.online_manager:
             recent_chats = self.online_manager.get_recent_chat(50)
@@ -1100,16 +1130,18 @@ class GameScene(Scene):
 
        # [Modified] 繪製連線玩家 (含動畫邏輯)
         if self.online_manager:
-            players = self.online_manager.get_list_players()
+            snapshot = self.online_manager.get_players_snapshot()
+            players = snapshot.players.values()
             cur_map = self.game_manager.current_map.path_name
             cam = self.game_manager.player.camera if self.game_manager.player else PositionCamera(0,0)
 
-            # 清理離線玩家的狀態
-            active_ids = [int(p.get("id", -1)) for p in players]
-            for pid in list(self.online_animations.keys()):
-                if pid not in active_ids: del self.online_animations[pid]
-            for pid in list(self.online_player_states.keys()):
-                if pid not in active_ids: del self.online_player_states[pid]
+            # 清理離線玩家的狀態 (only when the remote players changed)
+            if snapshot.version != self.online_players_version:
+                self.online_players_version = snapshot.version
+                for pid in list(self.online_animations.keys()):
+                    if pid not in snapshot.players: del self.online_animations[pid]
+                for pid in list(self.online_player_states.keys()):
+                    if pid not in snapshot.players: del self.online_player_states[pid]
 
             for p in players:
                 if p.get("map") == cur_map:
@@ -1153,7 +1185,7 @@ class GameScene(Scene):
                         anim.draw(screen, cam)
                         
                         # ID 標籤
-                        txt = self.font_small.render(f"P{pid}", True, (255, 255, 255))
+                        txt = text_manager.render(self.font_small, f"P{pid}", (255, 255, 255))
                         screen.blit(txt, cam.transform_position(Position(px, py - 20)))
 
                     except Exception:
@@ -1185,15 +1217,14 @@ class GameScene(Scene):
         # [New] 繪製任務按鈕
             self.btn_quest.draw(screen)
             # 補個文字標籤
-            screen.blit(self.font_small.render("Quest", True, (0,0,0)), (self.btn_quest.hitbox.x+10, self.btn_quest.hitbox.y+20))
+            screen.blit(text_manager.render(self.font_small, "Quest", (0,0,0)), (self.btn_quest.hitbox.x+10, self.btn_quest.hitbox.y+20))
 
         # ... (原本的 Settings, Backpack, Shop 繪製代碼) ...
 
         # [New] 繪製任務視窗 (Quest Overlay)
         if self.is_quest_open:
             # 1. 半透明背景
-            dim = pg.Surface((GameSettings.SCREEN_WIDTH, GameSettings.SCREEN_HEIGHT), pg.SRCALPHA)
-            dim.fill((0, 0, 0, 150))
+            dim = resource_manager.get_overlay((GameSettings.SCREEN_WIDTH, GameSettings.SCREEN_HEIGHT), (0, 0, 0, 150))
             screen.blit(dim, (0, 0))
             
             # 2. 視窗面板
@@ -1207,7 +1238,7 @@ class GameScene(Scene):
             quest = self.game_manager.quest
             if quest:
                 # 標題
-                title = self.font_quest.render(f"Current Quest: {quest.get('name', 'None')}", True, (100, 50, 0))
+                title = text_manager.render(self.font_quest, f"Current Quest: {quest.get('name', 'None')}", (100, 50, 0))
                 screen.blit(title, (self.quest_rect.x + 30, self.quest_rect.y + 30))
                 
                 # 說明與進度
@@ -1222,25 +1253,25 @@ class GameScene(Scene):
                     status_text = "Status: COMPLETED!"
                     status_color = (0, 150, 0)
                 
-                screen.blit(self.font_quest.render(desc, True, (0,0,0)), (self.quest_rect.x + 30, self.quest_rect.y + 80))
-                screen.blit(self.font_quest.render(status_text, True, status_color), (self.quest_rect.x + 30, self.quest_rect.y + 120))
+                screen.blit(text_manager.render(self.font_quest, desc, (0,0,0)), (self.quest_rect.x + 30, self.quest_rect.y + 80))
+                screen.blit(text_manager.render(self.font_quest, status_text, status_color), (self.quest_rect.x + 30, self.quest_rect.y + 120))
                 
                 # 獎勵顯示
                 reward = quest.get("reward_coins", 0)
-                reward_txt = self.font_quest.render(f"Reward: ${reward} Coins", True, (200, 0, 0))
+                reward_txt = text_manager.render(self.font_quest, f"Reward: ${reward} Coins", (200, 0, 0))
                 screen.blit(reward_txt, (self.quest_rect.x + 30, self.quest_rect.y + 180))
             else:
-                screen.blit(self.font_quest.render("No Quest Data Found.", True, (0,0,0)), (self.quest_rect.x + 30, self.quest_rect.y + 80))
+                screen.blit(text_manager.render(self.font_quest, "No Quest Data Found.", (0,0,0)), (self.quest_rect.x + 30, self.quest_rect.y + 80))
 
         # [New] 繪製導航按鈕
         if not self.is_overlay_open and not self.is_shop_open:
             self.btn_nav.draw(screen)
-            screen.blit(self.font_small.render("NAV", True, (0,0,0)), (self.btn_nav.hitbox.x+15, self.btn_nav.hitbox.y+20))
+            screen.blit(text_manager.render(self.font_small, "NAV", (0,0,0)), (self.btn_nav.hitbox.x+15, self.btn_nav.hitbox.y+20))
             
             # [New] 如果正在導航，顯示 Stop 按鈕
             if self.game_manager.player and self.game_manager.player.path:
                 self.btn_stop_nav.draw(screen)
-                screen.blit(self.font_small.render("STOP", True, (255,0,0)), (self.btn_stop_nav.hitbox.x+10, self.btn_stop_nav.hitbox.y+20))
+                screen.blit(text_manager.render(self.font_small, "STOP", (255,0,0)), (self.btn_stop_nav.hitbox.x+10, self.btn_stop_nav.hitbox.y+20))
             
             # 繪製選單列表 (調整文字位置)
             if self.is_nav_open:
@@ -1255,7 +1286,7 @@ class GameScene(Scene):
                     
                     # [Modified] 文字畫在按鈕 "左邊"
                     # 1. 先 Render 文字算出寬度
-                    txt_surf = self.font_small.render(name, True, (0,0,0))
+                    txt_surf = text_manager.render(self.font_small, name, (0,0,0))
                     # 2. 計算座標：按鈕左邊界 - 文字寬度 - 間距(10)
                     txt_x = btn.hitbox.x - txt_surf.get_width() - 10
                     txt_y = btn.hitbox.centery - txt_surf.get_height() // 2
@@ -1267,8 +1298,7 @@ class GameScene(Scene):
 
         if self.is_setting_open:
             # 半透明背景
-            dim = pg.Surface((GameSettings.SCREEN_WIDTH, GameSettings.SCREEN_HEIGHT), pg.SRCALPHA)
-            dim.fill((0, 0, 0, 150))
+            dim = resource_manager.get_overlay((GameSettings.SCREEN_WIDTH, GameSettings.SCREEN_HEIGHT), (0, 0, 0, 150))
             screen.blit(dim, (0, 0))
 
             # 面板背景
@@ -1282,12 +1312,11 @@ class GameScene(Scene):
             self.button_load.draw(screen)
             
             # 標題
-            screen.blit(self.font_small.render("Settings", True, (0, 0, 0)), (self.setting_rect.x + 20, self.setting_rect.y + 20))
+            screen.blit(text_manager.render(self.font_small, "Settings", (0, 0, 0)), (self.setting_rect.x + 20, self.setting_rect.y + 20))
 
         # --- 背包介面 (Backpack Overlay) ---
         if self.is_overlay_open:
-            dim = pg.Surface((GameSettings.SCREEN_WIDTH, GameSettings.SCREEN_HEIGHT), pg.SRCALPHA)
-            dim.fill((0, 0, 0, 150))
+            dim = resource_manager.get_overlay((GameSettings.SCREEN_WIDTH, GameSettings.SCREEN_HEIGHT), (0, 0, 0, 150))
             screen.blit(dim, (0, 0))
 
             pg.draw.rect(screen, (240, 240, 240), self.overlay_rect)
@@ -1300,8 +1329,7 @@ class GameScene(Scene):
         # --- 商店介面 (Shop Overlay) [美化版] ---
         if self.is_shop_open:
             # 1. 全螢幕變暗 (更深一點更有質感)
-            dim = pg.Surface((GameSettings.SCREEN_WIDTH, GameSettings.SCREEN_HEIGHT), pg.SRCALPHA)
-            dim.fill((0, 0, 0, 180)) 
+            dim = resource_manager.get_overlay((GameSettings.SCREEN_WIDTH, GameSettings.SCREEN_HEIGHT), (0, 0, 0, 180))
             screen.blit(dim, (0, 0))
 
             # === 主面板樣式設定 ===
@@ -1315,7 +1343,7 @@ class GameScene(Scene):
             
             # 3. 標題與分隔線
             mode_str = "BUY ITEMS" if self.shop_mode == "BUY" else "SELL ITEMS"
-            title = self.font_quest.render(f"Poke Mart - {mode_str}", True, border_col)
+            title = text_manager.render(self.font_quest, f"Poke Mart - {mode_str}", border_col)
             screen.blit(title, (self.shop_rect.x + 40, self.shop_rect.y + 30))
             
             # 畫一條橫線分隔標題
@@ -1323,7 +1351,7 @@ class GameScene(Scene):
 
             # 4. 顯示金錢 (右上角金色區塊)
             coins = next((x.get("count", 0) for x in self.game_manager.bag._items_data if x["name"] == "Coins"), 0)
-            money_txt = self.font_small.render(f"$ {coins}", True, (255, 255, 255))
+            money_txt = text_manager.render(self.font_small, f"$ {coins}", (255, 255, 255))
             # 畫金色背景
             pg.draw.rect(screen, (218, 165, 32), (self.shop_rect.right - 150, self.shop_rect.y + 25, 120, 35), 0, border_radius=8)
             screen.blit(money_txt, (self.shop_rect.right - 140, self.shop_rect.y + 35))
@@ -1348,8 +1376,8 @@ class GameScene(Scene):
                     btn.draw(screen)
                     
                     # 畫文字 (名字 + 價格)
-                    name_txt = self.font_small.render(item["name"], True, (0, 0, 0))
-                    price_txt = self.font_small.render(f"${item['price']}", True, (0, 100, 0))
+                    name_txt = text_manager.render(self.font_small, item["name"], (0, 0, 0))
+                    price_txt = text_manager.render(self.font_small, f"${item['price']}", (0, 100, 0))
                     screen.blit(name_txt, (list_start_x, btn.hitbox.y + 15))
                     screen.blit(price_txt, (list_start_x + 200, btn.hitbox.y + 15))
 
@@ -1365,7 +1393,7 @@ class GameScene(Scene):
                          
                          btn.draw(screen)
                          # 顯示持有數量
-                         txt = self.font_small.render(f"{item['name']} x{item.get('count',0)}", True, (0,0,0))
+                         txt = text_manager.render(self.font_small, f"{item['name']} x{item.get('count',0)}", (0,0,0))
                          screen.blit(txt, (list_start_x, btn.hitbox.y + 15))
 
             # === [右區] 詳細資訊卡片 (Detail Panel) ===
@@ -1378,14 +1406,13 @@ class GameScene(Scene):
                 # 1. 顯示大圖示 (放大版)
                 if hovered_item_data.get("sprite_path"):
                     try:
-                        img = resource_manager.get_image(hovered_item_data["sprite_path"])
-                        img = pg.transform.scale(img, (64, 64)) 
+                        img = resource_manager.get_image(hovered_item_data["sprite_path"], (64, 64))
                         img_rect = img.get_rect(center=(info_rect.centerx, info_rect.y + 60))
                         screen.blit(img, img_rect)
                     except: pass
                 
                 # 2. 商品名稱
-                name_surf = self.font_quest.render(hovered_item_data["name"], True, border_col)
+                name_surf = text_manager.render(self.font_quest, hovered_item_data["name"], border_col)
                 name_rect = name_surf.get_rect(center=(info_rect.centerx, info_rect.y + 110))
                 screen.blit(name_surf, name_rect)
                 
@@ -1411,7 +1438,7 @@ class GameScene(Scene):
                     price_color = (0, 150, 0) # 綠色代表賺錢
 
                 # 畫出價格
-                price_surf = self.font_small.render(price_text, True, price_color)
+                price_surf = text_manager.render(self.font_small, price_text, price_color)
                 price_rect = price_surf.get_rect(center=(info_rect.centerx, info_rect.y + 140))
                 screen.blit(price_surf, price_rect)
 
@@ -1424,25 +1451,16 @@ class GameScene(Scene):
                 
                 if not desc: desc = "No description."
 
-                # 自動換行
-                words = desc.split(' ')
-                lines = []
-                current_line = ""
-                for word in words:
-                    if len(current_line + word) < 25:
-                        current_line += word + " "
-                    else:
-                        lines.append(current_line)
-                        current_line = word + " "
-                lines.append(current_line)
+                # 自動換行 (cached per description)
+                lines = text_manager.wrap(desc, 25)
                 
                 for idx, line in enumerate(lines):
-                    line_surf = self.font_small.render(line, True, (80, 80, 80))
+                    line_surf = text_manager.render(self.font_small, line, (80, 80, 80))
                     screen.blit(line_surf, (info_rect.x + 20, info_rect.y + 170 + idx * 20)) # y 改成 170
 
             else:
                 # 沒選中時的提示
-                hint = self.font_small.render("Hover over an item...", True, (150, 150, 150))
+                hint = text_manager.render(self.font_small, "Hover over an item...", (150, 150, 150))
                 screen.blit(hint, (info_rect.centerx - 60, info_rect.centery))
 
             # 5. 繪製底部按鈕 (Tab 和 Close)
@@ -1451,8 +1469,8 @@ class GameScene(Scene):
             self.button_shop_close.draw(screen)
             
             # Tab 文字
-            screen.blit(self.font_small.render("Buy", True, (0,0,0)), (self.btn_tab_buy.hitbox.x+15, self.btn_tab_buy.hitbox.y+20))
-            screen.blit(self.font_small.render("Sell", True, (0,0,0)), (self.btn_tab_sell.hitbox.x+15, self.btn_tab_sell.hitbox.y+20))
+            screen.blit(text_manager.render(self.font_small, "Buy", (0,0,0)), (self.btn_tab_buy.hitbox.x+15, self.btn_tab_buy.hitbox.y+20))
+            screen.blit(text_manager.render(self.font_small, "Sell", (0,0,0)), (self.btn_tab_sell.hitbox.x+15, self.btn_tab_sell.hitbox.y+20))
 
         if not self.is_overlay_open and not self.is_shop_open and not self.is_setting_open:
             self.draw_minimap(screen)
@@ -1460,7 +1478,7 @@ class GameScene(Scene):
         # [New] 繪製畫面提示 (Notification Toast)
         if self.notif_timer > 0:
             # 1. 準備文字
-            text_surf = self.font_small.render(self.notif_text, True, (255, 255, 255))
+            text_surf = text_manager.render(self.font_small, self.notif_text, (255, 255, 255))
             
             # 2. 計算置中位置 (螢幕上方 100px 處)
             padding = 10
@@ -1495,7 +1513,7 @@ class GameScene(Scene):
             
             # 3. 繪製文字 (一行一行畫)
             # 標題 (金色)
-            screen.blit(self.font_quest.render(title_txt, True, (255, 215, 0)), (self.dialogue_rect.x + 30, self.dialogue_rect.y + 20))
+            screen.blit(text_manager.render(self.font_quest, title_txt, (255, 215, 0)), (self.dialogue_rect.x + 30, self.dialogue_rect.y + 20))
             # 內容 (白色)
             # ... (標題畫完後) ...
 
@@ -1524,24 +1542,43 @@ class GameScene(Scene):
                     text_to_render = line # 警告那一行直接顯示
                 
                 # 渲染並畫到螢幕上 (每畫一行，Y 就往下移 25 pixel)
-                txt_surf = self.font_small.render(text_to_render, True, color)
+                txt_surf = text_manager.render(self.font_small, text_to_render, color)
                 screen.blit(txt_surf, (self.dialogue_rect.x + 30, start_y + i * 25))
 
             # ... (接著繼續畫 Reward 和 Confirm) ...
-            screen.blit(self.font_small.render(reward_txt, True, (0, 255, 0)), (self.dialogue_rect.x + 30, self.dialogue_rect.y + 110))
-            screen.blit(self.font_small.render(confirm_txt, True, (200, 200, 200)), (self.dialogue_rect.x + 30, self.dialogue_rect.y + 140))
+            screen.blit(text_manager.render(self.font_small, reward_txt, (0, 255, 0)), (self.dialogue_rect.x + 30, self.dialogue_rect.y + 110))
+            screen.blit(text_manager.render(self.font_small, confirm_txt, (200, 200, 200)), (self.dialogue_rect.x + 30, self.dialogue_rect.y + 140))
             
             # 4. 繪製按鈕
             self.btn_dialogue_yes.draw(screen)
             self.btn_dialogue_no.draw(screen)
             
             # 按鈕文字提示
-            screen.blit(self.font_small.render("Yes", True, (255, 255, 255)), (self.btn_dialogue_yes.hitbox.x+15, self.btn_dialogue_yes.hitbox.y+20))
-            screen.blit(self.font_small.render("No", True, (255, 255, 255)), (self.btn_dialogue_no.hitbox.x+20, self.btn_dialogue_no.hitbox.y+20))
+            screen.blit(text_manager.render(self.font_small, "Yes", (255, 255, 255)), (self.btn_dialogue_yes.hitbox.x+15, self.btn_dialogue_yes.hitbox.y+20))
+            screen.blit(text_manager.render(self.font_small, "No", (255, 255, 255)), (self.btn_dialogue_no.hitbox.x+20, self.btn_dialogue_no.hitbox.y+20))
        
         # [Fix] 補上這行：繪製聊天室 (放在最上層)
         if hasattr(self, 'chat_overlay'):
             self.chat_overlay.draw(screen)
+
+        if self.show_net_stats and self.online_manager:
+            self.draw_net_stats(screen)
+
+    def draw_net_stats(self, screen: pg.Surface) -> None:
+        """F3 overlay: network health, to tell network stutter from frame time stutter"""
+        stats = self.online_manager.get_net_stats()
+        lines = [
+            f"RTT {_format_ms(stats['rtt_ms'])} (avg {_format_ms(stats['rtt_smoothed_ms'])})",
+            f"In  {stats['in_msgs_per_s']} msg/s  {stats['in_bytes_per_s']} B/s",
+            f"Out {stats['out_msgs_per_s']} msg/s  {stats['out_bytes_per_s']} B/s",
+            f"Snapshot age {_format_ms(stats['snapshot_age_ms'])}",
+            f"Drops upd {stats['update_drops']} chat {stats['chat_drops']}  Reconnects {stats['reconnects']}",
+        ]
+        line_h = self.font_small.get_linesize()
+        screen.blit(resource_manager.get_overlay((360, line_h * len(lines) + 10), (0, 0, 0, 160)), (10, 10))
+        for i, line in enumerate(lines):
+            screen.blit(text_manager.render(self.font_small, line, (255, 255, 255)), (15, 15 + i * line_h))
+
     def draw_bag_overlay_contents(self, screen: pg.Surface) -> None:
         bag = self.game_manager.bag
 
@@ -1549,7 +1586,7 @@ class GameScene(Scene):
         y = self.overlay_rect.y + 20
 
         # --- Monsters ---
-        title = self.font_small.render("Monsters:", True, (0, 0, 0))
+        title = text_manager.render(self.font_small, "Monsters:", (0, 0, 0))
         screen.blit(title, (x, y))
         y += 25
 
@@ -1565,8 +1602,7 @@ class GameScene(Scene):
             # 先畫圖片
             if sprite_path is not None:
                 try:
-                    img = resource_manager.get_image(sprite_path)
-                    img = pg.transform.scale(img, (icon_size, icon_size))
+                    img = resource_manager.get_image(sprite_path, (icon_size, icon_size))
                     screen.blit(img, (x, y))
                 except Exception:
                     # 如果讀圖失敗就忽略，至少文字還在
@@ -1574,7 +1610,7 @@ class GameScene(Scene):
 
             # 再畫文字（往右偏移一點）
             text_str = f"{name} Lv.{level}  HP {hp}/{max_hp}"
-            line = self.font_small.render(text_str, True, (0, 0, 0))
+            line = text_manager.render(self.font_small, text_str, (0, 0, 0))
             screen.blit(line, (x + icon_size + 10, y + icon_size // 4))
 
             y += icon_size + 8  # 換到下一行
@@ -1582,7 +1618,7 @@ class GameScene(Scene):
         y += 12
 
         # --- Items ---
-        title = self.font_small.render("Items:", True, (0, 0, 0))
+        title = text_manager.render(self.font_small, "Items:", (0, 0, 0))
         screen.blit(title, (x, y))
         y += 25
 
@@ -1594,14 +1630,13 @@ class GameScene(Scene):
             # 物品 icon
             if sprite_path is not None:
                 try:
-                    img = resource_manager.get_image(sprite_path)
-                    img = pg.transform.scale(img, (icon_size, icon_size))
+                    img = resource_manager.get_image(sprite_path, (icon_size, icon_size))
                     screen.blit(img, (x, y))
                 except Exception:
                     pass
 
             # 物品文字
-            line = self.font_small.render(f"{name} x{count}", True, (0, 0, 0))
+            line = text_manager.render(self.font_small, f"{name} x{count}", (0, 0, 0))
             screen.blit(line, (x + icon_size + 10, y + icon_size // 4))
 
             y += icon_size + 8
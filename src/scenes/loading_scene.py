@@ -0,0 +1,59 @@
+import pygame as pg
+from typing import Callable, override
+
+from src.utils import GameSettings, AssetManifest
+from src.scenes.scene import Scene
+from src.core.services import asset_loader, text_manager
+
+BAR_WIDTH = 480
+BAR_HEIGHT = 24
+
+
+class LoadingScene(Scene):
+    """
+    Shown while the AssetLoader works through `manifest`; draws a progress
+    bar and calls `on_done` once, on the frame everything is loaded.
+    """
+    manifest: AssetManifest
+    on_done: Callable[[], None]
+
+    def __init__(self, manifest: AssetManifest, on_done: Callable[[], None]):
+        super().__init__()
+        self.manifest = manifest
+        self.on_done = on_done
+        self._done = False
+        self.title_font = text_manager.get_font(None, 48)
+        self.font = text_manager.get_font(None, 28)
+
+    @override
+    def enter(self) -> None:
+        self._done = False
+        asset_loader.start(self.manifest)
+
+    @override
+    def update(self, dt: float) -> None:
+        if self._done:
+            return
+        asset_loader.poll()
+        if asset_loader.finished:
+            self._done = True
+            self.on_done()
+
+    @override
+    def draw(self, screen: pg.Surface) -> None:
+        cx = GameSettings.SCREEN_WIDTH // 2
+        cy = GameSettings.SCREEN_HEIGHT // 2
+
+        title = text_manager.render(self.title_font, "Loading...", (255, 255, 255))
+        screen.blit(title, title.get_rect(center=(cx, cy - 60)))
+
+        bar = pg.Rect(0, 0, BAR_WIDTH, BAR_HEIGHT)
+        bar.center = (cx, cy)
+        fill = bar.inflate(-6, -6)
+        fill.width = int(fill.width * asset_loader.progress)
+        pg.draw.rect(screen, (80, 200, 120), fill)
+        pg.draw.rect(screen, (255, 255, 255), bar, 2)
+
+        # 101 distinct labels at most, so the text cache covers every frame
+        percent = text_manager.render(self.font, f"{int(asset_loader.progress * 100)}%", (255, 255, 255))
+        screen.blit(percent, percent.get_rect(center=(cx, cy + 40)))
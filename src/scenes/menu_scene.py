@@ -1,14 +1,19 @@
 import pygame as pg
 import math
 import random
-from src.utils import GameSettings
+from src.utils import GameSettings, AssetManifest
 from src.sprites import BackgroundSprite
 from src.scenes.scene import Scene
 from src.interface.components import Button
-from src.core.services import scene_manager, sound_manager, input_manager
+from src.core.services import scene_manager, sound_manager, input_manager, text_manager
 from typing import override
 
 class MenuScene(Scene):
+    assets = AssetManifest(images=(
+        "backgrounds/background1.png",
+        "UI/button_play.png", "UI/button_play_hover.png",
+        "UI/button_setting.png", "UI/button_setting_hover.png",
+    ))
     background: BackgroundSprite
     play_button: Button
     settings_button: Button
@@ -104,9 +109,9 @@ class MenuScene(Scene):
         # 3. 繪製木板標題 (Wood Panel Title)
         
         # (A) 準備文字 [顏色修改點]
-        title_font = pg.font.SysFont("Arial", 80, bold=True)
-        text_surf = title_font.render("POKEGAME", True, (255, 140, 0)) # [改] 橘黃色
-        text_shadow = title_font.render("POKEGAME", True, (60, 30, 0))  # 深色陰影
+        title_font = text_manager.get_font("Arial", 80, bold=True)
+        text_surf = text_manager.render(title_font, "POKEGAME", (255, 140, 0)) # [改] 橘黃色
+        text_shadow = text_manager.render(title_font, "POKEGAME", (60, 30, 0))  # 深色陰影
         
         # (B) 計算位置 [位置修改點]
         panel_w = text_surf.get_width() + 100
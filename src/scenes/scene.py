@@ -1,7 +1,12 @@
 from __future__ import annotations
 import pygame as pg
+from typing import ClassVar
+from src.utils import AssetManifest
 
 class Scene:
+    # Loaded in the background before the scene is built (see AssetLoader)
+    assets: ClassVar[AssetManifest] = AssetManifest()
+
     def __init__(self) -> None:
         ...
 
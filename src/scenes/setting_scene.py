@@ -6,8 +6,8 @@ import pygame as pg
 from typing import override
 
 from src.scenes.scene import Scene
-from src.utils import GameSettings
-from src.core.services import scene_manager, sound_manager, input_manager
+from src.utils import GameSettings, AssetManifest
+from src.core.services import scene_manager, sound_manager, input_manager, text_manager
 from src.interface.components.button import Button
 
 # ========= 簡易 Checkbox =========
@@ -20,8 +20,8 @@ class Checkbox:
         self.checked = checked
         self.on_change = on_change
 
-        self.font = pg.font.SysFont(None, 24)
-        self.label_surface = self.font.render(text, True, (255, 255, 255))
+        self.font = text_manager.get_font(None, 24)
+        self.label_surface = text_manager.render(self.font, text, (255, 255, 255))
 
     def update(self, dt: float) -> None:
         if input_manager.mouse_pressed(1) and self.rect.collidepoint(input_manager.mouse_pos):
@@ -84,12 +84,14 @@ class Slider:
         knob_rect.center = (knob_x, center_y)
         pg.draw.rect(screen, (255, 255, 255), knob_rect)
         # 顯示百分比
-        font = pg.font.SysFont(None, 20)
-        txt = font.render(f"{int(self.value * 100)}%", True, (255, 255, 255))
+        font = text_manager.get_font(None, 20)
+        txt = text_manager.render(font, f"{int(self.value * 100)}%", (255, 255, 255))
         screen.blit(txt, (self.x + self.width + 10, center_y - 10))
 
 
 class SettingScene(Scene):
+    assets = AssetManifest(images=("UI/button_back.png", "UI/button_back_hover.png"))
+
     def __init__(self):
         super().__init__()
 
@@ -1,12 +1,13 @@
 import pygame as pg
 
 from .sprite import Sprite
+from src.core.services import resource_manager
 from src.utils import GameSettings, Logger, PositionCamera
 from typing import Optional
 
 class Animation(Sprite):
-    # Animations
-    animations: dict[str, list[pg.Surface]]
+    # Frames per row, shared with every Animation of the same sheet and size
+    animations: dict[str, tuple[pg.Surface, ...]]
     cur_row: str
     # Time information for selections
     accumulator: float  # time elapsed
@@ -20,23 +21,11 @@ class Animation(Sprite):
         loop: float = 1                     # loop in second
     ):
         super().__init__(image_path)
-        sheet_w, sheet_h = self.image.get_size()
-        frame_w = sheet_w // n_keyframes
-        frame_h = sheet_h // len(rows)
-        
-        if (len(rows) <= 0 or n_keyframes <= 0):
-            Logger.error("Invalid number of rows")
-        
-        self.animations = {}
-        for r, name in enumerate(rows):
-            anim : list[pg.Surface] = []
-            for c in range(n_keyframes):
-                frame = self.image.subsurface(pg.Rect(
-                    c * frame_w, r * frame_h,
-                    frame_w, frame_h
-                ))
-                anim.append(pg.transform.smoothscale(frame, size))
-            self.animations[name] = anim
+        # Slicing and scaling happen once per (sheet, rows, n_keyframes, size);
+        # each instance only keeps its own row and time cursor
+        self.animations = resource_manager.get_animation_frames(
+            image_path, tuple(rows), n_keyframes, (int(size[0]), int(size[1]))
+        )
             
         self.accumulator = 0
         self.cur_row = rows[0]
@@ -2,7 +2,7 @@
 
 from .logger import Logger
 from .settings import GameSettings
-from .loader import load_tmx, load_img, load_font, load_sound
+from .loader import load_tmx, load_img, load_font, load_sound, load_music, AssetManifest
 from .definition import Position, PositionCamera, Direction, MouseBtn, Key, Teleport
 
 __all__ = [
@@ -12,6 +12,8 @@ __all__ = [
     "load_img",
     "load_font",
     "load_sound",
+    "load_music",
+    "AssetManifest",
     "Position",
     "PositionCamera",
     "Direction",
@@ -0,0 +1,238 @@
+'''
+Baked image bundle: every PNG in assets/images packed into texture atlas
+pages, plus pre-scaled copies for the sizes listed in
+assets/bundle_sizes.json, in a single file read through mmap.
+
+Layout: BUNDLE_MAGIC, a little-endian u32 index length, the JSON index,
+then the pages as raw BGRA rows, each aligned to PAGE_ALIGN. BGRA is
+what convert_alpha produces on little-endian ARGB8888 displays, so there
+a page is used straight from the mapping without decoding or copying. The index
+maps "path" (original size) or "path@WxH" (scaled) to
+[page, x, y, w, h, opaque]. Pages are only converted when used, so
+images share a page only with images of the same top-level directory,
+the same kind (original or pre-scaled) and the same opacity: a scene
+touching UI buttons at their drawn sizes does not pay for the full-size
+originals or the unused sprite sheets. Opaque images (alpha 255
+everywhere) are converted without per-pixel alpha.
+
+Build it after changing images or sizes (the file is not committed):
+- python -m src.utils.bundle
+'''
+from __future__ import annotations
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+import pygame as pg
+from pathlib import Path
+from .loader import ASSETS_DIR, is_opaque
+from .logger import Logger
+
+BUNDLE_PATH = ASSETS_DIR / "images.bundle"
+SIZES_PATH = ASSETS_DIR / "bundle_sizes.json"
+BUNDLE_MAGIC = b"IMGBNDL1"
+PAGE_SIZE = 2048
+PAGE_ALIGN = 4096
+
+# [page, x, y, w, h, opaque]
+Entry = list
+
+
+def bundle_key(path: str, size: tuple[int, int] | None = None) -> str:
+    return path if size is None else f"{path}@{size[0]}x{size[1]}"
+
+
+class ImageBundle:
+    """
+    Read side of the bundle. Opening it reads only the index; a page is
+    wrapped (or converted, if the display format differs or it is opaque)
+    the first time one of its images is asked for, and images are handed
+    out as subsurfaces of their page, so treat them as read-only like
+    every cached image. The mapping is copy-on-write: drawing onto an
+    image anyway changes only this process's copy.
+    """
+    _pages: list[pg.Surface | None]
+
+    def __init__(self, path: Path | str = BUNDLE_PATH) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        if self._mm[:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not an image bundle")
+        start = len(BUNDLE_MAGIC) + 4
+        (index_len,) = struct.unpack_from("<I", self._mm, len(BUNDLE_MAGIC))
+        index = json.loads(self._mm[start:start + index_len])
+        self.page_info: list[dict] = index["pages"]
+        self.entries: dict[str, Entry] = index["images"]
+        self.newest_source_ns: int = index["newest_source_ns"]
+        self._pages = [None] * len(self.page_info)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def get(self, path: str, size: tuple[int, int] | None = None) -> pg.Surface | None:
+        """Image (scaled to `size`) from the bundle, None when it was not baked"""
+        entry = self.entries.get(bundle_key(path, size))
+        if entry is None:
+            return None
+        page, x, y, w, h, _ = entry
+        return self._page(page).subsurface(pg.Rect(x, y, w, h))
+
+    def _page(self, i: int) -> pg.Surface:
+        page = self._pages[i]
+        if page is None:
+            info = self.page_info[i]
+            size = (info["width"], info["height"])
+            view = memoryview(self._mm)[info["offset"]:info["offset"] + size[0] * size[1] * 4]
+            # The surface keeps the mapping alive for as long as it is used
+            page = pg.image.frombuffer(view, size, "BGRA")
+            if info["opaque"]:
+                page = page.convert()
+            elif page.get_masks() != _display_alpha_masks():
+                page = page.convert_alpha()
+            self._pages[i] = page
+        return page
+
+    def is_stale(self, images_dir: Path = ASSETS_DIR / "images") -> bool:
+        """Whether any source image changed after the bundle was built (stats every PNG)"""
+        return _newest_mtime_ns(images_dir) > self.newest_source_ns
+
+def open_bundle(path: Path | str = BUNDLE_PATH) -> ImageBundle | None:
+    """The bundle at `path`, or None (after a log line) when there is none or it is unreadable"""
+    try:
+        bundle = ImageBundle(path)
+    except FileNotFoundError:
+        Logger.info(f"No image bundle at {path}, loading PNGs (build one with python -m src.utils.bundle)")
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        Logger.warning(f"Ignoring image bundle {path}: {e}")
+        return None
+    Logger.info(f"Opened image bundle {path} ({len(bundle.entries)} images, {len(bundle.page_info)} pages)")
+    return bundle
+
+
+def _display_alpha_masks() -> tuple[int, int, int, int]:
+    return pg.Surface((1, 1), pg.SRCALPHA, 32).convert_alpha().get_masks()
+
+
+# ---------------------------------------------------------------- build side
+
+def _newest_mtime_ns(images_dir: Path) -> int:
+    return max((p.stat().st_mtime_ns for p in images_dir.rglob("*.png")), default=0)
+
+
+def _pack(items: list[tuple[str, pg.Surface]]) -> list[tuple[tuple[int, int], list[tuple[str, pg.Surface, int, int]]]]:
+    """Shelf-pack surfaces (tallest first) into pages at most PAGE_SIZE wide and high"""
+    pages: list[tuple[tuple[int, int], list]] = []
+    placed: list = []
+    x = y = shelf_h = used_w = 0
+    for key, surf in sorted(items, key=lambda item: (-item[1].get_height(), item[0])):
+        w, h = surf.get_size()
+        if x + w > PAGE_SIZE:
+            x, y, shelf_h = 0, y + shelf_h, 0
+        if placed and y + h > PAGE_SIZE:
+            pages.append(((used_w, y + shelf_h), placed))
+            placed, x, y, shelf_h, used_w = [], 0, 0, 0, 0
+        placed.append((key, surf, x, y))
+        x += w
+        shelf_h = max(shelf_h, h)
+        used_w = max(used_w, x)
+    if placed:
+        pages.append(((used_w, y + shelf_h), placed))
+    return pages
+
+
+def build_bundle(out: Path | str = BUNDLE_PATH, sizes_path: Path | str = SIZES_PATH,
+                 images_dir: Path = ASSETS_DIR / "images") -> dict:
+    """Bake every PNG under `images_dir` (and its listed scaled sizes) into `out`; returns stats"""
+    # Images are converted exactly as load_img does, so baked pixels match the PNG path
+    if pg.display.get_surface() is None:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pg.display.init()
+        pg.display.set_mode((1, 1))
+    with open(sizes_path, encoding="utf-8") as f:
+        sizes: dict[str, list[list[int]]] = json.load(f)
+
+    # (directory, scaled, opaque) -> images
+    groups: dict[tuple[str, bool, bool], list[tuple[str, pg.Surface]]] = {}
+    def add(key: str, surf: pg.Surface, directory: str, scaled: bool) -> None:
+        opaque = is_opaque(surf)
+        groups.setdefault((directory, scaled, opaque), []).append((key, surf))
+
+    found: set[str] = set()
+    for file in sorted(images_dir.rglob("*.png")):
+        path = file.relative_to(images_dir).as_posix()
+        directory = path.split("/")[0] if "/" in path else ""
+        found.add(path)
+        img = pg.image.load(str(file)).convert_alpha()
+        add(bundle_key(path), img, directory, False)
+        for w, h in sizes.get(path, ()):
+            scaled = img if img.get_size() == (w, h) else pg.transform.scale(img, (w, h))
+            add(bundle_key(path, (w, h)), scaled, directory, True)
+    for path in sorted(set(sizes) - found):
+        Logger.warning(f"{sizes_path} lists {path}, which is not an image")
+
+    pages = [
+        (size, placed, opaque)
+        for (_, _, opaque), items in sorted(groups.items())
+        for size, placed in _pack(items)
+    ]
+
+    page_info: list[dict] = []
+    entries: dict[str, Entry] = {}
+    blobs: list[bytes] = []
+    for i, (size, placed, opaque) in enumerate(pages):
+        page = pg.Surface(size, pg.SRCALPHA, 32)
+        for key, surf, x, y in placed:
+            # Added onto zeroed pixels: an exact copy, alpha included
+            page.blit(surf, (x, y), special_flags=pg.BLEND_RGBA_ADD)
+            entries[key] = [i, x, y, surf.get_width(), surf.get_height(), opaque]
+        page_info.append({"width": size[0], "height": size[1], "opaque": opaque, "offset": 0})
+        blobs.append(pg.image.tobytes(page, "BGRA"))
+
+    def encode_index() -> bytes:
+        return json.dumps({
+            "pages": page_info, "images": entries, "newest_source_ns": _newest_mtime_ns(images_dir),
+        }, separators=(",", ":")).encode("utf-8")
+
+    # Offsets depend on the index length, which depends on the offsets' digits:
+    # lay out once with a generous guess, then fix up
+    header_len = len(BUNDLE_MAGIC) + 4 + len(encode_index()) + 16 * len(page_info)
+    offset = -(-header_len // PAGE_ALIGN) * PAGE_ALIGN
+    for info, blob in zip(page_info, blobs):
+        info["offset"] = offset
+        offset += -(-len(blob) // PAGE_ALIGN) * PAGE_ALIGN
+    index = encode_index()
+
+    out = Path(out)
+    tmp = out.with_suffix(out.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(BUNDLE_MAGIC + struct.pack("<I", len(index)) + index)
+        for info, blob in zip(page_info, blobs):
+            f.write(b"\0" * (info["offset"] - f.tell()))
+            f.write(blob)
+    os.replace(tmp, out)
+    return {
+        "images": len(entries),
+        "pages": len(page_info),
+        "opaque_images": sum(1 for e in entries.values() if e[5]),
+        "bytes": out.stat().st_size,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Bake assets/images into an image bundle")
+    parser.add_argument("--out", default=str(BUNDLE_PATH), help="bundle path")
+    parser.add_argument("--sizes", default=str(SIZES_PATH), help="JSON of image path -> [[w, h], ...] to pre-scale")
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    stats = build_bundle(args.out, args.sizes)
+    print(f"[Bundle] {stats['images']} images ({stats['opaque_images']} opaque) in {stats['pages']} pages, "
+          f"{stats['bytes'] / 2**20:.1f} MB -> {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,84 @@
+from __future__ import annotations
 import pygame as pg
-from pytmx import load_pygame, TiledMap
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 from .logger import Logger
 
+# pytmx is imported by the functions using it: maps are first parsed on an
+# AssetLoader thread, which keeps the import out of start-up
+if TYPE_CHECKING:
+    from pytmx import TiledMap
+
 ASSETS_DIR = Path("assets")
+# Key colours tried for the transparent pixels of colour-keyed images; the
+# first one no opaque pixel uses wins
+COLORKEY_CANDIDATES = ((255, 0, 255), (0, 255, 255), (1, 254, 3))
 
-def load_img(path: str) -> pg.Surface:
+
+@dataclass(frozen=True)
+class AssetManifest:
+    """Assets a scene needs, paths relative to assets/images, assets/sounds and assets/maps"""
+    images: tuple[str, ...] = ()
+    sounds: tuple[str, ...] = ()
+    maps: tuple[str, ...] = ()
+
+    def __or__(self, other: "AssetManifest") -> "AssetManifest":
+        return AssetManifest(
+            tuple(dict.fromkeys(self.images + other.images)),
+            tuple(dict.fromkeys(self.sounds + other.sounds)),
+            tuple(dict.fromkeys(self.maps + other.maps)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.images) + len(self.sounds) + len(self.maps)
+
+
+def decode_img(path: str) -> pg.Surface:
+    """Decode an image without converting it to the display format (safe off the main thread)"""
     Logger.info(f"Loading image: {path}")
     img = pg.image.load(str(ASSETS_DIR / "images" / path))
     if not img:
         Logger.error(f"Failed to load image: {path}")
-    return img.convert_alpha()
+    return img
+
+def is_opaque(surface: pg.Surface) -> bool:
+    """Whether every pixel is fully opaque (alpha 255 and not colour-keyed)"""
+    w, h = surface.get_size()
+    return pg.mask.from_surface(surface, 254).count() == w * h
+
+def convert_img(img: pg.Surface) -> pg.Surface:
+    """
+    Display-format copy of a decoded image, in the cheapest format to blit
+    that looks the same: opaque images drop their alpha channel, colour-keyed
+    ones (palette PNGs) keep a colour key with RLE acceleration, the rest get
+    per-pixel alpha. Main thread only.
+    """
+    if is_opaque(img):
+        return img.convert()
+    converted = img.convert_alpha()
+    if img.get_colorkey() is not None:
+        return _rle_colorkeyed(converted) or converted
+    return converted
+
+def _rle_colorkeyed(converted: pg.Surface) -> pg.Surface | None:
+    """`converted` (alpha only 0 or 255) as an RLE colour-keyed surface, None if no key colour is free"""
+    transparent = pg.mask.from_surface(converted, 0)
+    transparent.invert()
+    w, h = converted.get_size()
+    if transparent.count() + pg.mask.from_surface(converted, 254).count() != w * h:
+        return None  # Partly transparent pixels need per-pixel alpha
+    keyed = converted.convert()
+    for key in COLORKEY_CANDIDATES:
+        # The file's own key colour may also be used by opaque pixels; pick one that is not
+        if pg.mask.from_threshold(keyed, key, (1, 1, 1, 255)).count() == 0:
+            transparent.to_surface(keyed, setcolor=key, unsetcolor=None)
+            keyed.set_colorkey(key, pg.RLEACCEL)
+            return keyed
+    return None
+
+def load_img(path: str) -> pg.Surface:
+    return convert_img(decode_img(path))
 
 def load_sound(path: str) -> pg.mixer.Sound:
     Logger.info(f"Loading sound: {path}")
@@ -19,6 +87,11 @@ def load_sound(path: str) -> pg.mixer.Sound:
         Logger.error(f"Failed to load sound: {path}")
     return sound
 
+def load_music(path: str) -> None:
+    """Open `path` on the pg.mixer.music stream; it is decoded while it plays"""
+    Logger.info(f"Streaming music: {path}")
+    pg.mixer.music.load(str(ASSETS_DIR / "sounds" / path))
+
 def load_font(path: str, size: int) -> pg.font.Font:
     Logger.info(f"Loading font: {path}")
     font = pg.font.Font(str(ASSETS_DIR / "fonts" / path), size)
@@ -27,7 +100,48 @@ def load_font(path: str, size: int) -> pg.font.Font:
     return font
 
 def load_tmx(path: str) -> TiledMap:
+    from pytmx import load_pygame
     tmxdata = load_pygame(str(ASSETS_DIR / "maps" / path))
     if tmxdata is None:
         Logger.error(f"Failed to load map: {path}")
     return tmxdata
+
+
+@dataclass
+class _PendingTile:
+    surface: pg.Surface
+    colorkey: pg.Color | None
+    pixelalpha: bool
+
+def _deferred_image_loader(filename: str, colorkey, **kwargs):
+    """pytmx image loader that decodes and slices tiles but leaves display conversion for later"""
+    from pytmx.util_pygame import handle_transformation
+    if colorkey:
+        colorkey = pg.Color("#{0}".format(colorkey))
+    pixelalpha = kwargs.get("pixelalpha", True)
+    image = pg.image.load(filename)
+
+    def load_image(rect=None, flags=None):
+        tile = image.subsurface(rect) if rect else image.copy()
+        if flags:
+            tile = handle_transformation(tile, flags)
+        return _PendingTile(tile, colorkey, pixelalpha)
+
+    return load_image
+
+def parse_tmx(path: str) -> TiledMap:
+    """First half of load_tmx, safe off the main thread; finish it with convert_tmx"""
+    from pytmx import TiledMap
+    Logger.info(f"Parsing map: {path}")
+    tmxdata = TiledMap(str(ASSETS_DIR / "maps" / path), image_loader=_deferred_image_loader)
+    if tmxdata is None:
+        Logger.error(f"Failed to load map: {path}")
+    return tmxdata
+
+def convert_tmx(tmxdata: TiledMap) -> TiledMap:
+    """Convert the tiles of a parse_tmx map to the display format, as load_pygame would"""
+    from pytmx.util_pygame import smart_convert
+    for i, tile in enumerate(tmxdata.images):
+        if isinstance(tile, _PendingTile):
+            tmxdata.images[i] = smart_convert(tile.surface, tile.colorkey, tile.pixelalpha)
+    return tmxdata
@@ -29,7 +29,8 @@ def create_logger() -> logging.Logger:
 
     if GameSettings.DEBUG:
         log_file = "log.txt"
-        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        # Opened by the first record, not at import
+        file_handler = logging.FileHandler(log_file, encoding="utf-8", delay=True)
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
         
@@ -16,5 +16,7 @@ class Settings:
     # Online
     IS_ONLINE: bool = True
     ONLINE_SERVER_URL: str = "http://localhost:8989"
+    ONLINE_UPDATE_RATE: int = 60    # Max position updates sent to the server per second
+    ONLINE_TRANSPORT: str = "websocket"  # "websocket" (server.py) or "loopback" (in-process, single player)
     
 GameSettings = Settings()
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+ChatStore's ring buffer against the list implementation it replaced, over
+seeded random sequences of add and list_since calls.
+"""
+import random
+import tempfile
+import unittest
+
+from server.chatLog import ChatLog
+from server.chatStore import ChatStore, SINCE_LIMIT
+
+SEEDS = range(8)
+OPERATIONS = 3000
+
+
+class ListChatStore:
+    """The original list-backed ChatStore from server.py, minus locking"""
+    def __init__(self) -> None:
+        self._next_id = 1
+        self._messages: list[dict] = []
+
+    def add(self, msg: dict) -> None:
+        assert msg["id"] == self._next_id
+        self._messages.append(msg)
+        self._next_id += 1
+        if len(self._messages) > 1000:
+            self._messages = self._messages[-800:]
+
+    def list_since(self, since_id: int) -> list[dict]:
+        if since_id <= 0:
+            return list(self._messages[-100:])
+        out = [m for m in self._messages if int(m.get("id", 0)) > since_id]
+        if len(out) > 200:
+            out = out[-200:]
+        return out
+
+
+def random_text(rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.05:
+        return rng.choice(["", "   ", "\n\t"])
+    if roll < 0.1:
+        return "x" * rng.randint(190, 260)
+    return f"  msg {rng.randint(0, 10**6)} "
+
+
+class ChatStoreModelTest(unittest.TestCase):
+    def run_model(self, store: ChatStore, rng: random.Random, model: ListChatStore | None = None) -> None:
+        model = model or ListChatStore()
+        for _ in range(OPERATIONS):
+            if rng.random() < 0.6:
+                text = random_text(rng)
+                if not text.strip():
+                    with self.assertRaises(ValueError):
+                        store.add(1, text)
+                    continue
+                msg = store.add(rng.randint(0, 9), text)
+                self.assertEqual(msg["text"], text.strip()[:200])
+                model.add(msg)
+            else:
+                since = rng.randint(-3, model._next_id + 3)
+                self.assertEqual(store.list_since(since), model.list_since(since), f"list_since({since})")
+
+    def test_matches_list_store(self) -> None:
+        for seed in SEEDS:
+            with self.subTest(seed=seed):
+                self.run_model(ChatStore(), random.Random(seed))
+
+    def test_matches_list_store_smallest_ring(self) -> None:
+        # Wraps around every SINCE_LIMIT messages
+        for seed in SEEDS:
+            with self.subTest(seed=seed):
+                self.run_model(ChatStore(capacity=SINCE_LIMIT), random.Random(seed))
+
+    def test_matches_list_store_across_restart(self) -> None:
+        rng = random.Random(0)
+        with tempfile.TemporaryDirectory() as directory:
+            log = ChatLog(directory, segment_max_messages=97)
+            model = ListChatStore()
+            self.run_model(ChatStore(log=log), rng, model)
+            log.stop()
+            # The restored store carries on where the old one stopped
+            log = ChatLog(directory, segment_max_messages=97)
+            self.run_model(ChatStore(log=log), rng, model)
+            log.stop()
+
+    def test_rejects_small_capacity(self) -> None:
+        with self.assertRaises(ValueError):
+            ChatStore(capacity=SINCE_LIMIT - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Client and server in one process: OnlineManagers talking to a World over
+LoopbackTransport, with ticks and the clock driven by hand.
+"""
+import unittest
+from unittest import mock
+
+from server.chatStore import ChatStore
+from server.playerHandler import PlayerHandler
+from server.world import World
+from src.core.managers import online_manager
+from src.core.managers.online_manager import OnlineManager, INTERPOLATION_DELAY
+from src.core.managers.loopback_transport import LoopbackServer, LoopbackTransport
+from src.core.managers.online_transport import Transport
+
+TICK = 0.05
+
+
+class FakeClock:
+    """The server's clock, and time.monotonic for the client"""
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class LoopbackTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        patcher = mock.patch.object(online_manager, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.server = LoopbackServer(World(PlayerHandler(clock=self.clock), ChatStore(), clock=self.clock))
+        self.alice = self.join()
+        self.bob = self.join()
+        # Ticks must be newer than the snapshot sent on connect
+        self.clock.now += TICK
+
+    def join(self) -> OnlineManager:
+        client = OnlineManager(LoopbackTransport(self.server, auto_tick=False))
+        client.start()
+        self.addCleanup(client.stop)
+        return client
+
+    def step(self, seconds: float = TICK) -> None:
+        """Let the clients send, then run one server tick and let time pass"""
+        for client in (self.alice, self.bob):
+            client.advance()
+        self.server.tick()
+        self.clock.now += seconds
+
+    def remote(self, client: OnlineManager) -> dict[int, dict]:
+        return {pid: dict(p) for pid, p in client.advance().players.items()}
+
+    def test_transport_is_abstract(self) -> None:
+        with self.assertRaises(TypeError):
+            Transport()
+
+    def test_players_get_distinct_ids(self) -> None:
+        self.assertGreaterEqual(self.alice.player_id, 0)
+        self.assertGreaterEqual(self.bob.player_id, 0)
+        self.assertNotEqual(self.alice.player_id, self.bob.player_id)
+
+    def test_position_reaches_other_client(self) -> None:
+        self.alice.update(100.0, 200.0, "map.tmx", "LEFT")
+        for _ in range(4):
+            self.step()
+        players = self.remote(self.bob)
+        self.assertEqual(list(players), [self.alice.player_id])
+        p = players[self.alice.player_id]
+        self.assertEqual((p["x"], p["y"], p["map"], p["direction"]), (100.0, 200.0, "map.tmx", "LEFT"))
+        # A client never sees itself
+        self.assertNotIn(self.alice.player_id, self.remote(self.alice))
+
+    def test_movement_is_interpolated_between_ticks(self) -> None:
+        self.alice.update(100.0, 100.0, "map.tmx")
+        self.step(0.1)
+        self.alice.update(110.0, 100.0, "map.tmx")
+        self.step(0.0)
+        # Halfway between the two snapshots on the delayed server clock
+        self.clock.now += INTERPOLATION_DELAY - 0.05
+        p = self.remote(self.bob)[self.alice.player_id]
+        self.assertAlmostEqual(p["x"], 105.0)
+        self.assertEqual(p["y"], 100.0)
+
+    def test_idle_view_is_not_rebuilt(self) -> None:
+        self.alice.update(100.0, 100.0, "map.tmx")
+        self.step()
+        self.clock.now += 0.5  # Snapshots are late, but nobody moves
+        version = self.bob.advance().version
+        self.clock.now += 0.1
+        self.assertEqual(self.bob.advance().version, version)
+
+    def test_chat_reaches_everyone_once(self) -> None:
+        self.assertTrue(self.alice.send_chat("  hello  "))
+        self.step()
+        self.step()
+        for client in (self.alice, self.bob):
+            chat = client.get_recent_chat()
+            self.assertEqual([(m["from"], m["text"]) for m in chat], [(self.alice.player_id, "hello")])
+
+    def test_late_joiner_gets_history_once(self) -> None:
+        self.alice.send_chat("first")
+        self.step()
+        self.bob.send_chat("second")
+        self.bob.advance()  # Queued on the server, not broadcast yet
+        carol = self.join()
+        self.server.tick()
+        self.assertEqual([m["text"] for m in carol.get_recent_chat()], ["first", "second"])
+
+    def test_restart_is_not_a_reconnect(self) -> None:
+        # OnlineManager stops and starts the transport whenever GameScene is left and re-entered
+        player_id = self.alice.player_id
+        for _ in range(3):
+            self.alice.stop()
+            self.step()
+            self.alice.start()
+            self.step()
+        self.assertEqual(self.alice.player_id, player_id)
+        self.assertEqual(self.alice.net_stats.as_dict()["reconnects"], 0)
+
+    def test_stopped_player_disappears(self) -> None:
+        self.alice.update(100.0, 100.0, "map.tmx")
+        self.step()
+        self.alice.stop()
+        for _ in range(4):
+            self.step()
+        self.assertEqual(self.remote(self.bob), {})
+
+
+if __name__ == "__main__":
+    unittest.main()